@@ -0,0 +1,213 @@
+"""
+Scraper benchmarks replayed from HTML fixtures
+
+Every fixture is served by a local HTTP stand-in. An adapter mounted on
+http_client's session sends louslist.org and thecourseforum.com requests
+to it, so production code needs no hook. For each scenario the harness
+records the parse time, the memory the parse allocates (tracemalloc) and
+the end-to-end latency of the scraper through the pooled client.
+
+    python bench_scrapers.py                  # print results
+    python bench_scrapers.py --save           # also write baseline_scrapers.json
+    python bench_scrapers.py --compare        # print the change from the baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+from requests.adapters import HTTPAdapter
+
+import http_client
+import main
+from fixtures import FIXTURES, fixture_source, load_fixture, request_key
+from louslist_parser import default_backend, parse_louslist_page
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_scrapers.json')
+CS_COURSES = [('1110', None), ('2100', None), ('2120', None), ('3100', None), ('3140', None)]
+
+
+def egmt_topic():
+    """The EGMT fixture's first named topic, so the filter keeps some sections"""
+    sections = parse_louslist_page(load_fixture('louslist_egmt_1510'))['EGMT 1510']['sections']
+    return next(section['topic'] for section in sections if section['topic'] and section['topic'] != 'TBD')
+
+
+def scenarios():
+    """
+    Scenario name -> (fixture, parse function, end-to-end function)
+    """
+    topic = egmt_topic()
+    return {
+        'louslist_department': (
+            'louslist_department_cs',
+            lambda html: parse_louslist_page(html),
+            lambda: main.scrape_department('CS', CS_COURSES),
+        ),
+        'louslist_course': (
+            'louslist_course_cs_2100',
+            lambda html: parse_louslist_page(html),
+            lambda: main.scrape_louslist('CS', '2100'),
+        ),
+        'louslist_egmt_topic': (
+            'louslist_egmt_1510',
+            lambda html: parse_louslist_page(html, topic),
+            lambda: main.scrape_louslist('EGMT', '1510', topic_name=topic),
+        ),
+        'courseforum_missing_gpa': (
+            'courseforum_cs_2100',
+            main.parse_courseforum_page,
+            lambda: main.scrape_courseforum('CS', '2100'),
+        ),
+        'courseforum_large': (
+            'courseforum_cs_3100',
+            main.parse_courseforum_page,
+            lambda: main.scrape_courseforum('CS', '3100'),
+        ),
+    }
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Serves each fixture at the path and query of the URL it was recorded from"""
+    pages = {}
+
+    def do_GET(self):
+        page = self.pages.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInAdapter(HTTPAdapter):
+    """Sends every request it is mounted for to the stand-in server instead"""
+
+    def __init__(self, base_url):
+        super().__init__(max_retries=0)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request_key(request.url)
+        return super().send(request, **kwargs)
+
+
+def start_stand_in():
+    StandIn.pages = {request_key(url): load_fixture(name) for name, url in FIXTURES.items()}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    adapter = StandInAdapter(f"http://127.0.0.1:{server.server_port}")
+    session = http_client.get_session()
+    for host in ('louslist.org', 'thecourseforum.com'):
+        session.mount(f"https://{host}/", adapter)
+    return server
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def allocations(function):
+    """
+    Peak memory allocated during one call, and the number of blocks still
+    allocated right after it while its result is alive
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return round((peak - start) / 1024, 1), blocks
+
+
+def run(repeat=5):
+    results = {
+        'backend': default_backend(),
+        'fixtures': {name: fixture_source(name) for name in FIXTURES},
+        'scenarios': {}
+    }
+    server = start_stand_in()
+    try:
+        for name, (fixture, parse, end_to_end) in scenarios().items():
+            html = load_fixture(fixture)
+            if end_to_end() is None:
+                raise RuntimeError(f"{name} returned no data from the stand-in")
+            peak_kb, blocks = allocations(lambda: parse(html))
+            results['scenarios'][name] = {
+                'fixture_kb': round(len(html.encode('utf-8')) / 1024, 1),
+                'parse_ms': timed(lambda: parse(html), repeat),
+                'parse_peak_kb': peak_kb,
+                'parse_blocks': blocks,
+                'end_to_end_ms': timed(end_to_end, repeat),
+            }
+    finally:
+        server.shutdown()
+        # Drops the session and the stand-in adapters mounted on it
+        http_client.configure()
+    return results
+
+
+def compare(results, baseline):
+    if results['backend'] != baseline['backend']:
+        print(f"Parser backend {results['backend']} differs from the baseline's {baseline['backend']}")
+    for name, source in results['fixtures'].items():
+        if source != baseline.get('fixtures', {}).get(name):
+            print(f"Fixture {name} is {source}, the baseline's was {baseline.get('fixtures', {}).get(name)}")
+    for name, metrics in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            print(f"{name}: not in baseline")
+            continue
+        changes = ', '.join(
+            f"{metric} {value} ({(value - base[metric]) / base[metric] * 100:+.0f}%)" if base.get(metric) else f"{metric} {value}"
+            for metric, value in metrics.items() if metric != 'fixture_kb'
+        )
+        print(f"{name}: {changes}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against recorded fixtures")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', action='store_true', help=f"Write results to {os.path.basename(BASELINE_PATH)}")
+    parser.add_argument('--compare', action='store_true', help="Compare against the saved baseline")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.compare and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            compare(results, json.load(f))
+    else:
+        print(json.dumps(results, indent=2))
+    if args.save:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main_cli()
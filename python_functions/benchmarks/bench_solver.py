@@ -0,0 +1,154 @@
+"""
+Solver scalability benchmark on synthetic domains
+
+Each series varies one generator parameter and runs every solver mode on
+the resulting domains, recording nodes expanded, wall time and peak
+memory. The growth between consecutive points is reported as an
+empirical exponent (log of the change in nodes or time over the log of the
+change in the parameter), so super-linear blowups stand out.
+
+    python bench_solver.py                    # print the scaling report
+    python bench_solver.py --save             # also write baseline_solver.json
+    python bench_solver.py --compare          # print the change from the baseline
+"""
+import argparse
+import copy
+import itertools
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+from main import CSP
+from synthetic import generate_domains, pigeonhole_domains, time_window
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_solver.json')
+ENUMERATE_LIMIT = 1000
+
+# Solver mode -> function of a CSP
+MODES = {
+    'backtracking': lambda csp: csp.solve(),
+    'branch_and_bound': lambda csp: csp.solve(optimize_ratings=True),
+    'top_5': lambda csp: csp.solve_top_k(5) or None,
+    f'enumerate_{ENUMERATE_LIMIT}': lambda csp: list(itertools.islice(csp.iter_solutions(), ENUMERATE_LIMIT)) or None,
+}
+
+# Series name -> (parameter, values, function of a value returning (variables, domains, time_constraints))
+SERIES = {
+    'courses': ('courses', [2, 4, 6, 8, 10], lambda n: (*generate_domains(courses=n), None)),
+    'sections_per_course': ('sections', [4, 8, 16, 32], lambda n: (*generate_domains(sections_per_course=n), None)),
+    'meeting_density': ('days', [1, 2, 3, 5], lambda n: (*generate_domains(meeting_density=n), None)),
+    'window_tightness': ('hours', [10, 8, 6, 4], lambda n: (*generate_domains(window_hours=n), None)),
+    'time_constraints': ('hours', [10, 8, 6, 4], lambda n: (*generate_domains(), time_window(8, 8 + n))),
+    'pigeonhole_infeasible': ('slots', [3, 4, 5, 6], lambda n: (*pigeonhole_domains(slots=n), None)),
+}
+
+
+def run_mode(mode, variables, domains, time_constraints):
+    """
+    Build a CSP and solve it once, measuring time and peak memory
+    """
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        csp = CSP(list(variables), copy.deepcopy(domains), time_constraints)
+        built = time.perf_counter()
+        result = MODES[mode](csp)
+        solved = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'feasible': result is not None,
+        'build_ms': round((built - start) * 1000, 3),
+        'solve_ms': round((solved - built) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+        **csp.search_stats,
+    }
+
+
+def exponent(x1, x2, y1, y2):
+    if min(x1, x2, y1, y2) <= 0 or x1 == x2:
+        return None
+    return round(math.log(y2 / y1) / math.log(x2 / x1), 2)
+
+
+def run(series_names=None, modes=None):
+    results = {}
+    for name in series_names or SERIES:
+        parameter, values, make = SERIES[name]
+        results[name] = {'parameter': parameter, 'points': []}
+        for value in values:
+            variables, domains, time_constraints = make(value)
+            results[name]['points'].append({
+                parameter: value,
+                'modes': {mode: run_mode(mode, variables, domains, time_constraints) for mode in modes or MODES},
+            })
+    return results
+
+
+def report(results):
+    for name, series in results.items():
+        parameter = series['parameter']
+        print(f"\n{name}")
+        for mode in series['points'][0]['modes']:
+            print(f"  {mode}")
+            previous = None
+            for point in series['points']:
+                stats = point['modes'][mode]
+                growth = ''
+                if previous is not None:
+                    nodes_exp = exponent(previous[0], point[parameter], previous[1]['nodes_expanded'], stats['nodes_expanded'])
+                    time_exp = exponent(previous[0], point[parameter], previous[1]['solve_ms'], stats['solve_ms'])
+                    growth = f"  growth nodes^{nodes_exp} time^{time_exp}"
+                print(
+                    f"    {parameter}={point[parameter]:<4} {'feasible' if stats['feasible'] else 'infeasible':<10} "
+                    f"nodes={stats['nodes_expanded']:<8} solve={stats['solve_ms']:>10.2f}ms "
+                    f"build={stats['build_ms']:>8.2f}ms peak={stats['peak_kb']:>8.1f}KB{growth}"
+                )
+                previous = (point[parameter], stats)
+
+
+def compare(results, baseline):
+    for name, series in results.items():
+        if name not in baseline:
+            continue
+        parameter = series['parameter']
+        for point, base_point in zip(series['points'], baseline[name]['points']):
+            for mode, stats in point['modes'].items():
+                base = base_point['modes'].get(mode)
+                if base is None:
+                    continue
+                changes = ', '.join(
+                    f"{metric} {stats[metric]} ({(stats[metric] - base[metric]) / base[metric] * 100:+.0f}%)"
+                    if base[metric] else f"{metric} {stats[metric]}"
+                    for metric in ('nodes_expanded', 'solve_ms', 'peak_kb')
+                )
+                print(f"{name} {parameter}={point[parameter]} {mode}: {changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark how the CSP solver scales on synthetic domains")
+    parser.add_argument('--series', nargs='*', choices=list(SERIES), help="Series to run (default: all)")
+    parser.add_argument('--modes', nargs='*', choices=list(MODES), help="Solver modes to run (default: all)")
+    parser.add_argument('--save', action='store_true', help=f"Write results to {os.path.basename(BASELINE_PATH)}")
+    parser.add_argument('--compare', action='store_true', help="Compare against the saved baseline")
+    args = parser.parse_args()
+
+    results = run(args.series, args.modes)
+    if args.compare and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            compare(results, json.load(f))
+    else:
+        report(results)
+    if args.save:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+HTML fixtures for the scraper benchmarks
+
+Each fixture is the page one scraper URL returns. `python fixtures.py record`
+saves the live pages under fixtures/recorded/, which is committed so runs
+compare like for like. `python fixtures.py generate` renders equivalent
+pages from the Lou's List CSV export under fixtures/generated/ (ignored by
+git); a fixture that was never recorded is generated on first use, and
+benchmark results note which kind each scenario ran on.
+"""
+import argparse
+import csv
+import html
+import os
+import sys
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'functions'))
+import http_client
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RECORDED_DIR = os.path.join(FIXTURES_DIR, 'recorded')
+GENERATED_DIR = os.path.join(FIXTURES_DIR, 'generated')
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+CATALOG_CSV = os.path.join(SCRIPTS_DIR, 'searchDataFall2025.csv')
+# Fall 2025 has no EGMT topics yet, so EGMT pages come from the earlier export
+EGMT_CSV = os.path.join(SCRIPTS_DIR, 'searchData.csv')
+SEMESTER = "1258"
+
+
+def louslist_url(mnemonic, number=""):
+    # Same URL main.louslist_url builds
+    query = f"Type=Search&Semester={SEMESTER}&iMnemonic={mnemonic}"
+    if number:
+        query += f"&iNumber={number}"
+    return f"https://louslist.org/pagex.php?{query}&Submit=Search+for+Classes"
+
+
+def courseforum_url(mnemonic, number):
+    return f"https://thecourseforum.com/course/{mnemonic}/{number}/"
+
+
+# thecourseforum lists everyone who has taught a course, so generated pages
+# are padded with other instructors from the department up to these counts
+COURSEFORUM_INSTRUCTORS = {'courseforum_cs_2100': 12, 'courseforum_cs_3100': 40}
+
+# Fixture name -> URL it was recorded from
+FIXTURES = {
+    'louslist_department_cs': louslist_url('CS'),
+    'louslist_course_cs_2100': louslist_url('CS', '2100'),
+    'louslist_egmt_1510': louslist_url('EGMT', '1510'),
+    'courseforum_cs_2100': courseforum_url('CS', '2100'),
+    'courseforum_cs_3100': courseforum_url('CS', '3100'),
+}
+
+
+def fixture_path(name, source='recorded'):
+    return os.path.join(RECORDED_DIR if source == 'recorded' else GENERATED_DIR, f"{name}.html")
+
+
+def fixture_source(name):
+    """
+    'recorded' when a live page was saved for the fixture, else 'generated'
+    """
+    return 'recorded' if os.path.exists(fixture_path(name)) else 'generated'
+
+
+def request_key(url):
+    """
+    Path and query of a URL, which is all the stand-in server sees
+    """
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def load_fixture(name):
+    source = fixture_source(name)
+    if source == 'generated' and not os.path.exists(fixture_path(name, source)):
+        generate([name])
+    with open(fixture_path(name, source), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def read_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def louslist_page(rows):
+    """
+    Render export rows as a Lou's List result page: a header row per course,
+    a topic row whenever the topic changes, and a row per section
+    """
+    out = ['<html><head><title>Lou\'s List</title></head><body><div id="Results"><table class="Courses">\n']
+    course = None
+    topic = None
+    for i, row in enumerate(rows):
+        if (row['Mnemonic'], row['Number']) != course:
+            course = (row['Mnemonic'], row['Number'])
+            topic = None
+            out.append(
+                f'<tr class="CourseRow"><td class="CourseNum"><span>{row["Mnemonic"]} {row["Number"]}</span></td>'
+                f'<td class="CourseName" colspan="7">{html.escape(row["Title"])}</td></tr>\n'
+            )
+        if row['Topic'] and row['Topic'] != topic:
+            topic = row['Topic']
+            parity = 'Odd' if i % 2 else 'Even'
+            out.append(f'<tr class="SectionTopic{parity}"><td></td><td colspan="8">{html.escape(topic)}</td></tr>\n')
+        instructors = ', '.join(
+            f'<span onclick="InstructorTip(\'{html.escape(name.strip())}\');">{html.escape(name.strip())}</span>'
+            for name in row['Instructor(s)'].split(',')
+        )
+        out.append(
+            f'<tr class="S{"Odd" if i % 2 else "Even"}"><td class="ClassNumber"><a href="#">{row["ClassNumber"]}</a></td>'
+            f'<td>{row["Section"]}</td><td>{row["Type"]}</td><td><span class="Status">{row["Status"]}</span></td>'
+            f'<td><a href="#" onclick="Enrollment({row["ClassNumber"]})">{row["Enrollment"]}/{row["EnrollmentLimit"]}</a></td>'
+            f'<td>{instructors}</td><td>{row["Days"]}</td><td>{html.escape(row["Room"])}</td></tr>\n'
+        )
+    out.append('</table></div></body></html>\n')
+    return ''.join(out)
+
+
+def instructor_names(rows):
+    return sorted({name.strip() for row in rows for name in row['Instructor(s)'].split(',')})
+
+
+def courseforum_page(rows, mnemonic, number, instructor_count):
+    """
+    Render a thecourseforum course page with a rating card per instructor;
+    every third instructor has no gpa and every fifth has no ratings at all
+    """
+    sections = [row for row in rows if (row['Mnemonic'], row['Number']) == (mnemonic, number)]
+    title = html.escape(sections[0]['Title']) if sections else ''
+    instructors = instructor_names(sections)
+    department = [name for name in instructor_names([row for row in rows if row['Mnemonic'] == mnemonic])
+                  if name not in instructors]
+    instructors += department[:max(instructor_count - len(instructors), 0)]
+    out = [
+        '<html><body><div class="container">',
+        f'<div class="d-md-flex align-items-baseline"><h1>{mnemonic} {number}</h1><h2>{title}</h2></div>',
+        '<div class="card"><div class="card-body">',
+        f'<p class="card-text">{html.escape(sections[0]["Description"]) if sections else ""}</p>',
+        '<div>Pre-Requisite(s): CS 1110 or equivalent</div></div></div>',
+    ]
+    for i, name in enumerate(instructors):
+        gpa = '' if i % 3 == 2 else f'{3.0 + (i % 10) / 10:.2f}'
+        rating, difficulty = ('—', '—') if i % 5 == 4 else (f'{3.5 + (i % 4) / 4:.2f}', f'{2.5 + (i % 6) / 4:.2f}')
+        out.append(
+            '<div class="rating-card"><div class="card-body">'
+            f'<h5 id="title">{html.escape(name)}</h5>'
+            f'<p id="rating">{rating}</p><p id="difficulty">{difficulty}</p>'
+            + (f'<p id="gpa">{gpa}</p>' if gpa else '') +
+            f'<p id="times">{i % 7 + 1}</p><p id="recency">Fall 2025</p></div></div>'
+        )
+    out.append('</div></body></html>\n')
+    return ''.join(out)
+
+
+def render(name):
+    if name == 'louslist_department_cs':
+        return louslist_page([row for row in read_rows(CATALOG_CSV) if row['Mnemonic'] == 'CS'])
+    kind = name.split('_')[0]
+    mnemonic, number = name.split('_')[-2:]
+    mnemonic = mnemonic.upper()
+    rows = read_rows(EGMT_CSV if mnemonic == 'EGMT' else CATALOG_CSV)
+    if kind == 'louslist':
+        return louslist_page([row for row in rows if (row['Mnemonic'], row['Number']) == (mnemonic, number)])
+    return courseforum_page(rows, mnemonic, number, COURSEFORUM_INSTRUCTORS.get(name, 0))
+
+
+def generate(names=None):
+    """
+    Render fixtures from the CSV exports
+    """
+    os.makedirs(GENERATED_DIR, exist_ok=True)
+    for name in names or FIXTURES:
+        with open(fixture_path(name, 'generated'), 'w', encoding='utf-8') as f:
+            f.write(render(name))
+
+
+def record(names=None):
+    """
+    Save the live pages behind each fixture
+    """
+    os.makedirs(RECORDED_DIR, exist_ok=True)
+    for name in names or FIXTURES:
+        response = http_client.get(FIXTURES[name])
+        response.raise_for_status()
+        with open(fixture_path(name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Recorded {name} ({len(response.text) // 1024} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or generate the scraper benchmark fixtures")
+    parser.add_argument('mode', choices=['record', 'generate'])
+    parser.add_argument('names', nargs='*', help=f"Fixtures to refresh (default: all of {', '.join(FIXTURES)})")
+    args = parser.parse_args()
+    (record if args.mode == 'record' else generate)(args.names or None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Synthetic CSP domains in the shape csp_build_schedule builds
+
+A domain maps each course to its sections, keyed by section number:
+
+    {'CS 2100': {'001': {'schedule': ['MoWeFr 10:00am - 10:50am'],
+                         'rating': 4.1, 'difficulty': 3.2, 'gpa': 3.4,
+                         'instructor': 'Instructor 3', 'location': 'Room 12'},
+                 '101': {'schedule': ['Tu 2:00pm - 3:50pm']}}}
+
+Sections numbered 1xx are split into a "<course>_lab" variable by the CSP,
+as for real lab courses. Every generator is deterministic for a seed.
+"""
+import random
+from datetime import time
+
+# Day patterns by the number of days a section meets each week, and the
+# usual meeting length for each
+DAY_PATTERNS = {
+    1: ['Mo', 'Tu', 'We', 'Th', 'Fr'],
+    2: ['MoWe', 'TuTh', 'WeFr', 'MoFr'],
+    3: ['MoWeFr'],
+    4: ['MoTuWeTh', 'TuWeThFr'],
+    5: ['MoTuWeThFr'],
+}
+MEETING_MINUTES = {1: 150, 2: 75, 3: 50, 4: 50, 5: 50}
+LAB_MINUTES = 110
+DAY_START_MINUTES = 8 * 60
+
+
+def format_minutes(minutes):
+    hour, minute = divmod(minutes, 60)
+    suffix = 'am' if hour < 12 else 'pm'
+    return f"{(hour - 1) % 12 + 1}:{minute:02d}{suffix}"
+
+
+def meeting(days, start, length):
+    return f"{days} {format_minutes(start)} - {format_minutes(start + length)}"
+
+
+def random_start(rng, window_hours, length):
+    # Starts on the hour or half hour so the meeting ends inside the window
+    latest = max(DAY_START_MINUTES, DAY_START_MINUTES + int(window_hours * 60) - length)
+    return DAY_START_MINUTES + 30 * rng.randint(0, (latest - DAY_START_MINUTES) // 30)
+
+
+def generate_domains(courses=6, sections_per_course=8, meeting_density=2, window_hours=10.0,
+                     lab_fraction=0.3, labs_per_course=4, stats_fraction=0.8, seed=0):
+    """
+    Random course domains
+
+    Args:
+        courses (int): Number of courses requested
+        sections_per_course (int): Lecture sections of each course
+        meeting_density (int): Days per week each lecture meets (1-5)
+        window_hours (float): Length of the daily window, from 8:00am, that
+            meetings fall in; smaller windows mean more conflicts
+        lab_fraction (float): Share of courses that also have lab sections
+        labs_per_course (int): Lab sections of a course with labs
+        stats_fraction (float): Share of sections with rating, difficulty and gpa
+        seed (int): Random seed
+
+    Returns:
+        Tuple of (variables, domains) as passed to CSP
+    """
+    rng = random.Random(seed)
+    variables = []
+    domains = {}
+    for c in range(courses):
+        course = f"SYN {1000 + c * 10}"
+        variables.append(course)
+        sections = {}
+        for s in range(sections_per_course):
+            days = rng.choice(DAY_PATTERNS[meeting_density])
+            length = MEETING_MINUTES[meeting_density]
+            section = {'schedule': [meeting(days, random_start(rng, window_hours, length), length)]}
+            if rng.random() < stats_fraction:
+                section.update({
+                    'rating': round(rng.uniform(2.0, 5.0), 2),
+                    'difficulty': round(rng.uniform(1.0, 5.0), 2),
+                    'gpa': round(rng.uniform(2.5, 4.0), 2),
+                    'instructor': f"Instructor {rng.randint(1, sections_per_course * courses)}",
+                    'location': f"Room {rng.randint(1, 200)}",
+                })
+            # 001-099, then 200 onwards; 1xx numbers are reserved for labs
+            sections[f"{s + 1:03d}" if s < 99 else f"{s + 101}"] = section
+        if rng.random() < lab_fraction:
+            for s in range(labs_per_course):
+                days = rng.choice(DAY_PATTERNS[1])
+                sections[f"{100 + s + 1}"] = {
+                    'schedule': [meeting(days, random_start(rng, window_hours, LAB_MINUTES), LAB_MINUTES)]
+                }
+        domains[course] = sections
+    return variables, domains
+
+
+def pigeonhole_domains(slots=4, courses=None):
+    """
+    Infeasible domains that forward checking cannot refute early
+
+    Every course offers the same `slots` non-overlapping meeting times, and
+    there is one more course than there are times, so the solver has to
+    exhaust every partial assignment before giving up.
+    """
+    courses = slots + 1 if courses is None else courses
+    times = [meeting('MoWeFr', DAY_START_MINUTES + 60 * i, 50) for i in range(slots)]
+    variables = [f"PIG {1000 + c * 10}" for c in range(courses)]
+    domains = {
+        course: {
+            f"{i + 1:03d}": {'schedule': [times[i]], 'rating': 3.0 + i / 10, 'difficulty': 3.0, 'gpa': 3.0}
+            for i in range(slots)
+        }
+        for course in variables
+    }
+    return variables, domains
+
+
+def time_window(start_hour, end_hour, days=('Mo', 'Tu', 'We', 'Th', 'Fr')):
+    """
+    Time constraints allowing only start_hour-end_hour on each day, as
+    csp_build_schedule passes them to CSP
+    """
+    return {day: (time(start_hour, 0), time(end_hour, 0)) for day in days}
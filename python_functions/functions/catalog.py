@@ -0,0 +1,273 @@
+import csv
+import os
+import re
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from schedule_parser import parse_many, schedule_to_mask, split_meetings
+
+# Lou's List CSV export for the semester being scheduled. The default points
+# at the export kept in scripts/ so the emulator works from a checkout; set
+# CATALOG_PATH to ship a catalog with the deployed function.
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts', 'searchDataFall2025.csv'
+)
+# Binary snapshot built from the CSV by `python catalog_snapshot.py`, which
+# the predeploy step in firebase.json runs so every deploy ships one. When
+# present it is memory-mapped instead of parsing the CSV on cold start; set
+# CATALOG_SNAPSHOT_PATH to load one from elsewhere.
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog.snap')
+
+_catalog = None
+_catalog_loaded = False
+_catalog_lock = Lock()
+
+
+class Catalog:
+    """
+    In-memory index of every section in a semester export
+
+    Sections are stored in the same shape scrape_louslist produces, keyed by
+    (mnemonic, number), with a second index from topic to course keys. Every
+    schedule string is parsed when the catalog is built, so the shared parse
+    cache is warm before the first CSP is constructed.
+
+    The export rows (minus descriptions) are kept by ClassNumber so a newer
+    export can be diffed against the catalog and applied in place. The first
+    description of each course is kept for its prerequisite text.
+    """
+
+    def __init__(self):
+        self.courses = {}
+        self.titles = {}
+        self.by_topic = {}
+        self.rows = {}
+        self.descriptions = {}
+
+    def add_section(self, mnemonic: str, number: str, title: str, section: Dict):
+        key = (mnemonic, number)
+        self.courses.setdefault(key, []).append(section)
+        self.titles.setdefault(key, title)
+        if section['topic']:
+            topic_courses = self.by_topic.setdefault(section['topic'].lower(), [])
+            if key not in topic_courses:
+                topic_courses.append(key)
+
+    def add_row(self, row: Dict):
+        """
+        Add a section from a row of a Lou's List CSV export
+        """
+        self.rows[row['ClassNumber']] = {field: value for field, value in row.items() if field != 'Description'}
+        self.add_section(row['Mnemonic'], row['Number'], row['Title'], section_from_row(row))
+        if row.get('Description'):
+            self.descriptions.setdefault((row['Mnemonic'], row['Number']), row['Description'])
+
+    def remove_row(self, class_number: str):
+        """
+        Remove the section with this ClassNumber, dropping its course and
+        topic entries once nothing references them
+        """
+        row = self.rows.pop(class_number, None)
+        if row is None:
+            return
+        key = (row['Mnemonic'], row['Number'])
+        sections = [section for section in self.courses.get(key, []) if section['class_number'] != class_number]
+        if sections:
+            self.courses[key] = sections
+        else:
+            self.courses.pop(key, None)
+            self.titles.pop(key, None)
+            self.descriptions.pop(key, None)
+        topic = row['Topic'].lower() if row['Topic'] else None
+        if topic and not any(section['topic'] and section['topic'].lower() == topic for section in sections):
+            topic_courses = self.by_topic.get(topic, [])
+            if key in topic_courses:
+                topic_courses.remove(key)
+            if not topic_courses:
+                self.by_topic.pop(topic, None)
+
+    def update_enrollment(self, row: Dict):
+        """
+        Copy the enrollment fields of a row onto its existing section
+
+        The row and section dicts are replaced rather than changed, since
+        a copy() of the catalog may share them.
+        """
+        self.rows[row['ClassNumber']] = {
+            **self.rows[row['ClassNumber']],
+            **{field: value for field, value in row.items() if field != 'Description'}
+        }
+        updated = section_from_row(row)
+        sections = self.courses.get((row['Mnemonic'], row['Number']), [])
+        for i, section in enumerate(sections):
+            if section['class_number'] == row['ClassNumber']:
+                sections[i] = {
+                    **section,
+                    **{field: updated[field] for field in ('status', 'enrollment_current', 'enrollment_max')}
+                }
+
+    def set_descriptions(self, rows: Iterable[Dict]) -> bool:
+        """
+        Take each course's first description from export rows, for the
+        prerequisites of a refreshed catalog
+
+        Returns:
+            bool: Whether any description changed
+        """
+        descriptions = {}
+        for row in rows:
+            key = (row['Mnemonic'], row['Number'])
+            if row.get('Description') and key in self.courses:
+                descriptions.setdefault(key, row['Description'])
+        changed = descriptions != self.descriptions
+        self.descriptions = descriptions
+        return changed
+
+    def copy(self) -> 'Catalog':
+        """
+        A catalog with its own indexes over the same section and row dicts,
+        so a diff can be applied to it while readers keep using this one
+        """
+        other = Catalog()
+        other.courses = {key: list(sections) for key, sections in self.courses.items()}
+        other.titles = dict(self.titles)
+        other.by_topic = {topic: list(keys) for topic, keys in self.by_topic.items()}
+        other.rows = dict(self.rows)
+        other.descriptions = dict(self.descriptions)
+        return other
+
+    def sections(self, mnemonic: str, number: str, topic: Optional[str] = None) -> List[Dict]:
+        """
+        Sections of a course, optionally filtered by topic like scrape_louslist
+
+        The topic filter is a case-insensitive substring match.
+        """
+        sections = self.courses.get((mnemonic, number), [])
+        if topic is None:
+            return sections
+        topic = topic.lower()
+        return [section for section in sections if section['topic'] and topic in section['topic'].lower()]
+
+    def courses_with_topic(self, topic: str) -> List[tuple]:
+        """
+        Course keys offering sections with exactly this topic
+        """
+        return self.by_topic.get(topic.lower(), [])
+
+    def prerequisites(self) -> Dict[str, str]:
+        """
+        Description of every course that has one, by course code, for
+        PrerequisiteGraph.add to parse
+        """
+        return {f"{mnemonic} {number}": text for (mnemonic, number), text in self.descriptions.items()}
+
+    def units(self) -> Dict[str, float]:
+        """
+        Credits of every course, from its largest section (lectures carry
+        the credits, labs and discussions 0)
+        """
+        units = {}
+        for (mnemonic, number), sections in self.courses.items():
+            values = [value for value in (parse_units(section['units']) for section in sections) if value is not None]
+            if values:
+                units[f"{mnemonic} {number}"] = max(values)
+        return units
+
+    def louslist_data(self, mnemonic: str, number: str, topic: Optional[str] = None) -> Optional[Dict]:
+        """
+        Course data in the shape returned by scrape_louslist, or None if the
+        course is not in the catalog
+        """
+        if (mnemonic, number) not in self.courses:
+            return None
+        return {
+            'course_info': {
+                'number': f"{mnemonic} {number}",
+                'name': self.titles[(mnemonic, number)],
+            },
+            'sections': self.sections(mnemonic, number, topic)
+        }
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_units(value: str) -> Optional[float]:
+    """'4' -> 4, '1 - 3' -> 1 (the least a variable-credit course counts for)"""
+    match = re.match(r'\s*(\d+(?:\.\d+)?)', value or '')
+    return float(match.group(1)) if match else None
+
+
+def section_from_row(row: Dict) -> Dict:
+    """
+    Section dict in the shape scrape_louslist produces from an export row,
+    plus the weekly meeting_mask of its schedule
+    """
+    return {
+        'section_number': row['Section'],
+        'type': row['Type'],
+        'status': row['Status'],
+        'enrollment_current': to_int(row['Enrollment']),
+        'enrollment_max': to_int(row['EnrollmentLimit']),
+        'instructor': row['Instructor(s)'],
+        'schedule': row['Days'],
+        'location': row['Room'],
+        'topic': row['Topic'] or None,
+        'units': row['Units'],
+        'class_number': row['ClassNumber'],
+        # Weekly bitmask of the meetings, so the CSP does not parse them again
+        'meeting_mask': schedule_to_mask(split_meetings(row['Days'])),
+    }
+
+
+def load_catalog_csv(path: str) -> Catalog:
+    """
+    Build a Catalog from a Lou's List CSV export (e.g. searchDataFall2025.csv)
+    """
+    catalog = Catalog()
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            catalog.add_row(row)
+
+    # Parse every distinct schedule string once up front
+    parse_many([
+        section['schedule']
+        for sections in catalog.courses.values()
+        for section in sections
+    ])
+    return catalog
+
+
+def set_catalog(catalog):
+    """
+    Replace the process-wide catalog, e.g. with a rebuilt snapshot
+    """
+    global _catalog, _catalog_loaded
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_loaded = True
+
+
+def get_catalog() -> Optional[Catalog]:
+    """
+    Return the process-wide catalog, loading it on first use
+
+    A catalog snapshot is preferred over the CSV export. Returns None when
+    neither file is available, in which case callers fall back to scraping.
+    """
+    global _catalog, _catalog_loaded
+    with _catalog_lock:
+        if not _catalog_loaded:
+            snapshot_path = os.environ.get('CATALOG_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+            path = os.environ.get('CATALOG_PATH', DEFAULT_CATALOG_PATH)
+            if os.path.exists(snapshot_path):
+                from catalog_snapshot import SnapshotCatalog
+                _catalog = SnapshotCatalog(snapshot_path)
+            elif os.path.exists(path):
+                _catalog = load_catalog_csv(path)
+            _catalog_loaded = True
+        return _catalog
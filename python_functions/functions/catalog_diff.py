@@ -0,0 +1,199 @@
+import argparse
+import csv
+import hashlib
+import json
+from typing import Dict, Set
+
+# Fields that change minute to minute during enrollment. A row that differs
+# only in these keeps its meeting times, so solver domains are unaffected.
+ENROLLMENT_FIELDS = ('Enrollment', 'EnrollmentLimit', 'Waitlist', 'Status')
+# Descriptions do not change sections; refresh_catalog takes them over
+# separately for prerequisites, and upload_classes picks up description
+# edits through its content hash.
+IGNORED_FIELDS = ('Description',)
+# Firestore rejects batches with more than 500 writes
+MAX_BATCH_SIZE = 500
+HASH_FIELD = 'content_hash'
+
+
+def content_hash(row: Dict) -> str:
+    """
+    Hash of an export row, stored on its Firestore document by upload_classes
+    """
+    return hashlib.sha256(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def read_export(path: str) -> Dict[str, Dict]:
+    """
+    Rows of a Lou's List CSV export keyed by ClassNumber
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return {row['ClassNumber']: row for row in csv.DictReader(f)}
+
+
+class CatalogDiff:
+    """
+    Sections added, removed or changed between two exports, keyed by ClassNumber
+
+    schedule_changed holds rows where anything beyond ENROLLMENT_FIELDS
+    changed (meeting times, room, instructor, ...); enrollment_changed holds
+    rows where only enrollment fields changed. Each maps to the new row;
+    removed maps to the old one.
+    """
+
+    def __init__(self):
+        self.added = {}
+        self.removed = {}
+        self.schedule_changed = {}
+        self.enrollment_changed = {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.schedule_changed or self.enrollment_changed)
+
+    def course_keys(self) -> Set[tuple]:
+        """
+        (mnemonic, number) of every course with a changed section
+        """
+        return {
+            (row['Mnemonic'], row['Number'])
+            for rows in (self.added, self.removed, self.schedule_changed, self.enrollment_changed)
+            for row in rows.values()
+        }
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed),
+            'schedule_changed': len(self.schedule_changed),
+            'enrollment_changed': len(self.enrollment_changed),
+            'courses': len(self.course_keys()),
+        }
+
+
+def diff_exports(old_rows: Dict[str, Dict], new_rows: Dict[str, Dict]) -> CatalogDiff:
+    """
+    Classify every section of two exports keyed by ClassNumber
+
+    A section whose course moved to a different mnemonic or number is
+    reported as removed and added so both course keys are refreshed.
+    """
+    diff = CatalogDiff()
+    for class_number, old in old_rows.items():
+        if class_number not in new_rows:
+            diff.removed[class_number] = old
+
+    for class_number, new in new_rows.items():
+        old = old_rows.get(class_number)
+        if old is None:
+            diff.added[class_number] = new
+            continue
+        if (old['Mnemonic'], old['Number']) != (new['Mnemonic'], new['Number']):
+            diff.removed[class_number] = old
+            diff.added[class_number] = new
+            continue
+        changed = {
+            field for field in set(old) | set(new)
+            if field not in IGNORED_FIELDS and old.get(field) != new.get(field)
+        }
+        if not changed:
+            continue
+        if changed <= set(ENROLLMENT_FIELDS):
+            diff.enrollment_changed[class_number] = new
+        else:
+            diff.schedule_changed[class_number] = new
+    return diff
+
+
+def apply_to_catalog(catalog, diff: CatalogDiff):
+    """
+    Apply a diff to a Catalog in place; refresh_catalog applies it to a
+    copy() and swaps that in
+
+    Enrollment-only changes replace the enrollment fields of the existing
+    sections; everything else removes and re-adds the affected sections.
+    """
+    if not hasattr(catalog, 'remove_row'):
+        raise TypeError("Catalog snapshots are read-only; rebuild the snapshot instead")
+    for class_number in diff.removed:
+        catalog.remove_row(class_number)
+    for class_number, row in diff.schedule_changed.items():
+        catalog.remove_row(class_number)
+        catalog.add_row(row)
+    for row in diff.added.values():
+        catalog.add_row(row)
+    for row in diff.enrollment_changed.values():
+        catalog.update_enrollment(row)
+
+
+def invalidate_course_cache(cache, diff: CatalogDiff) -> int:
+    """
+    Drop the cached Lou's List sections of every changed course
+
+    Cache keys start with (mnemonic, number); ratings do not depend on
+    sections and are kept. Returns the number of cache keys affected.
+    """
+    course_keys = diff.course_keys()
+    return cache.invalidate_where(lambda key: key[:2] in course_keys, half='sections')
+
+
+def apply_to_firestore(db, diff: CatalogDiff, collection_name: str = 'classes') -> int:
+    """
+    Write a diff to the Firestore collection upload_classes maintains
+
+    Enrollment-only changes are merged into the document, which recreates
+    it if it went missing instead of failing the whole batch the way an
+    update would; other changes overwrite the document and removed
+    sections are deleted.
+    Returns the number of writes.
+    """
+    collection = db.collection(collection_name)
+    writes = []
+    for class_number in diff.removed:
+        if class_number not in diff.added:
+            writes.append(('delete', class_number, None))
+    for rows in (diff.added, diff.schedule_changed):
+        for class_number, row in rows.items():
+            writes.append(('set', class_number, {**row, HASH_FIELD: content_hash(row)}))
+    for class_number, row in diff.enrollment_changed.items():
+        writes.append(('merge', class_number, {**row, HASH_FIELD: content_hash(row)}))
+
+    for start in range(0, len(writes), MAX_BATCH_SIZE):
+        batch = db.batch()
+        for operation, class_number, data in writes[start:start + MAX_BATCH_SIZE]:
+            document = collection.document(class_number)
+            if operation == 'delete':
+                batch.delete(document)
+            elif operation == 'set':
+                batch.set(document, data)
+            else:
+                batch.set(document, data, merge=True)
+        batch.commit()
+    return len(writes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two Lou's List CSV exports by ClassNumber")
+    parser.add_argument('old_csv')
+    parser.add_argument('new_csv')
+    parser.add_argument('--firestore', action='store_true', help="Apply the diff to the classes collection")
+    parser.add_argument('--collection', default='classes')
+    parser.add_argument('--emulator', metavar='HOST:PORT', help="Write to the Firestore emulator")
+    args = parser.parse_args()
+
+    diff = diff_exports(read_export(args.old_csv), read_export(args.new_csv))
+    print(json.dumps(diff.summary()))
+
+    if args.firestore and diff:
+        import os
+        import firebase_admin
+        from firebase_admin import firestore
+
+        if args.emulator:
+            os.environ['FIRESTORE_EMULATOR_HOST'] = args.emulator
+        firebase_admin.initialize_app(options={'projectId': 'gpt-advisor'})
+        writes = apply_to_firestore(firestore.client(), diff, args.collection)
+        print(f"Applied {writes} writes to {args.collection}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, List, Optional
+
+from catalog import load_catalog_csv, to_int
+from prerequisites import compile_requirement, format_clauses, parse_clauses
+from schedule_parser import WEEK_MASK_BYTES, schedule_to_mask, split_meetings
+
+# Snapshot layout (all integers little-endian, every region 8-byte aligned):
+#   header        MAGIC, version, counts, then the offset of each region
+#   string table  uint32 offsets[n_strings + 1] followed by the UTF-8 data
+#   courses       one uint32 column per COURSE_COLUMNS entry, sorted by
+#                 (mnemonic, number); sections of a course are contiguous.
+#                 prerequisites holds the course's compiled requirement
+#                 (prerequisites.format_clauses) and units its credits
+#   sections      one uint32 column per SECTION_COLUMNS entry and one int32
+#                 column per ENROLLMENT_COLUMNS entry (-1 when unknown)
+#   masks         WEEK_MASK_BYTES per section, the weekly meeting bitmask
+#   topics        (lowercase topic, course) uint32 pairs sorted by topic
+# Strings are referenced by index into the string table; NO_STRING is None.
+MAGIC = b'CATSNAP1'
+VERSION = 2
+NO_STRING = 0xFFFFFFFF
+COURSE_COLUMNS = ['mnemonic', 'number', 'title', 'first_section', 'section_count', 'prerequisites', 'units']
+SECTION_COLUMNS = ['section_number', 'type', 'status', 'instructor', 'schedule', 'location', 'topic', 'units', 'class_number']
+ENROLLMENT_COLUMNS = ['enrollment_current', 'enrollment_max']
+REGIONS = ['string_offsets', 'string_data', 'courses', 'sections', 'enrollment', 'masks', 'topics']
+# Export columns the snapshot keeps, by section column
+EXPORT_FIELDS = {
+    'class_number': 'ClassNumber', 'section_number': 'Section', 'type': 'Type', 'units': 'Units',
+    'instructor': 'Instructor(s)', 'schedule': 'Days', 'location': 'Room', 'topic': 'Topic',
+    'status': 'Status', 'enrollment_current': 'Enrollment', 'enrollment_max': 'EnrollmentLimit',
+}
+HEADER = struct.Struct('<8sIIIIII' + 'Q' * len(REGIONS))
+
+
+def align(buffer: bytearray):
+    buffer.extend(b'\0' * (-len(buffer) % 8))
+
+
+def little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def build_snapshot(catalog, path: str):
+    """
+    Compile a Catalog into a columnar binary snapshot at path
+
+    Only the columns the solver, scrapers and degree planner use are kept;
+    descriptions are compiled to their prerequisite clauses and other free
+    text from the export is dropped.
+    """
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        if value is None:
+            return NO_STRING
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    course_keys = sorted(catalog.courses)
+    prerequisites = catalog.prerequisites()
+    units = catalog.units()
+    course_index = {key: i for i, key in enumerate(course_keys)}
+    course_columns = {column: array('I') for column in COURSE_COLUMNS}
+    section_columns = {column: array('I') for column in SECTION_COLUMNS}
+    enrollment_columns = {column: array('i') for column in ENROLLMENT_COLUMNS}
+    masks = bytearray()
+    topics = set()
+
+    for mnemonic, number in course_keys:
+        sections = catalog.courses[(mnemonic, number)]
+        course_columns['mnemonic'].append(intern(mnemonic))
+        course_columns['number'].append(intern(number))
+        course_columns['title'].append(intern(catalog.titles[(mnemonic, number)]))
+        course_columns['first_section'].append(len(section_columns['section_number']))
+        course_columns['section_count'].append(len(sections))
+        course = f"{mnemonic} {number}"
+        course_columns['prerequisites'].append(intern(format_clauses(compile_requirement(course, prerequisites.get(course)))))
+        course_columns['units'].append(intern(f"{units[course]:g}" if course in units else None))
+        for section in sections:
+            for column in SECTION_COLUMNS:
+                section_columns[column].append(intern(section.get(column)))
+            for column in ENROLLMENT_COLUMNS:
+                value = section.get(column)
+                enrollment_columns[column].append(-1 if value is None else value)
+            masks.extend(schedule_to_mask(split_meetings(section['schedule'])).to_bytes(WEEK_MASK_BYTES, 'little'))
+            if section['topic']:
+                topics.add((section['topic'].lower(), course_index[(mnemonic, number)]))
+
+    topic_pairs = array('I')
+    for topic, course in sorted(topics):
+        topic_pairs.extend([intern(topic), course])
+
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets = array('I', [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    regions = {
+        'string_offsets': little_endian(string_offsets),
+        'string_data': b''.join(encoded),
+        'courses': b''.join(little_endian(course_columns[column]) for column in COURSE_COLUMNS),
+        'sections': b''.join(little_endian(section_columns[column]) for column in SECTION_COLUMNS),
+        'enrollment': b''.join(little_endian(enrollment_columns[column]) for column in ENROLLMENT_COLUMNS),
+        'masks': bytes(masks),
+        'topics': little_endian(topic_pairs),
+    }
+
+    body = bytearray(b'\0' * HEADER.size)
+    align(body)
+    offsets = []
+    for name in REGIONS:
+        offsets.append(len(body))
+        body.extend(regions[name])
+        align(body)
+
+    HEADER.pack_into(
+        body, 0, MAGIC, VERSION, WEEK_MASK_BYTES, len(strings), len(course_keys),
+        len(section_columns['section_number']), len(topic_pairs) // 2, *offsets
+    )
+    with open(path, 'wb') as f:
+        f.write(body)
+
+
+def snapshot_row(row: Dict) -> Dict:
+    """
+    An export row cut down to the columns a snapshot keeps, normalized the
+    way SnapshotCatalog.rows returns them, so the two can be diffed
+    """
+    projected = {field: row.get(field) or '' for field in ('Mnemonic', 'Number', 'Title', *EXPORT_FIELDS.values())}
+    for field in ('Enrollment', 'EnrollmentLimit'):
+        value = to_int(row.get(field))
+        projected[field] = '' if value is None else str(value)
+    return projected
+
+
+def rebuild_snapshot(csv_path: str) -> 'SnapshotCatalog':
+    """
+    Compile an export into a new snapshot in the temporary directory
+
+    The deployed source directory is read-only, so a refreshed snapshot is
+    written beside it instead of over it. The result is marked temporary so
+    it can be deleted once replaced.
+    """
+    fd, path = tempfile.mkstemp(prefix='catalog-', suffix='.snap')
+    os.close(fd)
+    build_snapshot(load_catalog_csv(csv_path), path)
+    snapshot = SnapshotCatalog(path)
+    snapshot.temporary = True
+    return snapshot
+
+
+class SnapshotCatalog:
+    """
+    Read-only catalog backed by a memory-mapped snapshot
+
+    Loading only maps the file and creates memoryview casts over its
+    regions, so it costs the same for any catalog size and every worker
+    process shares the same pages. Course and topic lookups binary-search
+    the sorted columns; section dicts are built only for looked-up courses.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temporary = False
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        (magic, version, mask_bytes, n_strings, n_courses, n_sections, n_topics,
+         *offsets) = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a catalog snapshot: {path}")
+        if mask_bytes != WEEK_MASK_BYTES:
+            raise ValueError(f"Snapshot mask width {mask_bytes} does not match {WEEK_MASK_BYTES}")
+        if sys.byteorder != 'little':
+            raise ValueError("Catalog snapshots can only be memory-mapped on little-endian hosts")
+        regions = dict(zip(REGIONS, offsets))
+
+        self.n_courses = n_courses
+        self.n_sections = n_sections
+        self._string_offsets = self._uint32(view, regions['string_offsets'], n_strings + 1)
+        self._string_data = view[regions['string_data']:regions['string_data'] + self._string_offsets[-1]]
+        self._courses = {
+            column: self._uint32(view, regions['courses'] + i * 4 * n_courses, n_courses)
+            for i, column in enumerate(COURSE_COLUMNS)
+        }
+        self._sections = {
+            column: self._uint32(view, regions['sections'] + i * 4 * n_sections, n_sections)
+            for i, column in enumerate(SECTION_COLUMNS)
+        }
+        self._enrollment = {
+            column: view[regions['enrollment'] + i * 4 * n_sections:][:4 * n_sections].cast('i')
+            for i, column in enumerate(ENROLLMENT_COLUMNS)
+        }
+        self._masks = view[regions['masks']:regions['masks'] + mask_bytes * n_sections]
+        self._topics = self._uint32(view, regions['topics'], n_topics * 2)
+        self.n_topics = n_topics
+
+    @staticmethod
+    def _uint32(view, offset, count):
+        return view[offset:offset + 4 * count].cast('I')
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        return str(self._string_data[self._string_offsets[string_id]:self._string_offsets[string_id + 1]], 'utf-8')
+
+    def find_course(self, mnemonic: str, number: str) -> Optional[int]:
+        """
+        Index of a course in the sorted course columns, or None
+        """
+        target = (mnemonic, number)
+        low, high = 0, self.n_courses
+        while low < high:
+            middle = (low + high) // 2
+            key = (self.string(self._courses['mnemonic'][middle]), self.string(self._courses['number'][middle]))
+            if key < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.n_courses and (
+            self.string(self._courses['mnemonic'][low]), self.string(self._courses['number'][low])
+        ) == target:
+            return low
+        return None
+
+    def section(self, index: int) -> Dict:
+        """
+        Section dict in the shape scrape_louslist produces, plus the
+        precompiled meeting_mask
+        """
+        section = {column: self.string(self._sections[column][index]) for column in SECTION_COLUMNS}
+        for column in ENROLLMENT_COLUMNS:
+            value = self._enrollment[column][index]
+            section[column] = None if value < 0 else value
+        section['meeting_mask'] = self.section_mask(index)
+        return section
+
+    def section_mask(self, index: int) -> int:
+        """
+        Precompiled weekly meeting bitmask of a section
+        """
+        return int.from_bytes(self._masks[index * WEEK_MASK_BYTES:(index + 1) * WEEK_MASK_BYTES], 'little')
+
+    def section_range(self, course: int) -> range:
+        first = self._courses['first_section'][course]
+        return range(first, first + self._courses['section_count'][course])
+
+    def sections(self, mnemonic: str, number: str, topic: Optional[str] = None) -> List[Dict]:
+        """
+        Sections of a course, optionally filtered by topic like scrape_louslist
+        """
+        course = self.find_course(mnemonic, number)
+        if course is None:
+            return []
+        sections = [self.section(index) for index in self.section_range(course)]
+        if topic is None:
+            return sections
+        topic = topic.lower()
+        return [section for section in sections if section['topic'] and topic in section['topic'].lower()]
+
+    def rows(self) -> Dict[str, Dict]:
+        """
+        Every section as an export row of the columns the snapshot keeps,
+        keyed by ClassNumber like catalog_diff.read_export
+        """
+        rows = {}
+        for course in range(self.n_courses):
+            course_fields = {
+                'Mnemonic': self.string(self._courses['mnemonic'][course]),
+                'Number': self.string(self._courses['number'][course]),
+                'Title': self.string(self._courses['title'][course]),
+            }
+            for index in self.section_range(course):
+                section = self.section(index)
+                row = dict(course_fields)
+                for column, field in EXPORT_FIELDS.items():
+                    value = section[column]
+                    row[field] = '' if value is None else str(value)
+                rows[row['ClassNumber']] = row
+        return rows
+
+    def course_code(self, course: int) -> str:
+        return f"{self.string(self._courses['mnemonic'][course])} {self.string(self._courses['number'][course])}"
+
+    def prerequisites(self) -> Dict[str, tuple]:
+        """
+        Compiled requirement of every course that has one, by course code,
+        for PrerequisiteGraph.add
+        """
+        return {
+            self.course_code(course): parse_clauses(self.string(self._courses['prerequisites'][course]))
+            for course in range(self.n_courses)
+            if self._courses['prerequisites'][course] != NO_STRING
+        }
+
+    def units(self) -> Dict[str, float]:
+        """
+        Credits of every course, from its largest section
+        """
+        return {
+            self.course_code(course): float(self.string(self._courses['units'][course]))
+            for course in range(self.n_courses)
+            if self._courses['units'][course] != NO_STRING
+        }
+
+    def courses_with_topic(self, topic: str) -> List[tuple]:
+        """
+        Course keys offering sections with exactly this topic
+        """
+        topic = topic.lower()
+        low, high = 0, self.n_topics
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(self._topics[2 * middle]) < topic:
+                low = middle + 1
+            else:
+                high = middle
+        courses = []
+        while low < self.n_topics and self.string(self._topics[2 * low]) == topic:
+            course = self._topics[2 * low + 1]
+            courses.append((self.string(self._courses['mnemonic'][course]), self.string(self._courses['number'][course])))
+            low += 1
+        return courses
+
+    def louslist_data(self, mnemonic: str, number: str, topic: Optional[str] = None) -> Optional[Dict]:
+        """
+        Course data in the shape returned by scrape_louslist, or None if the
+        course is not in the catalog
+        """
+        course = self.find_course(mnemonic, number)
+        if course is None:
+            return None
+        return {
+            'course_info': {
+                'number': f"{mnemonic} {number}",
+                'name': self.string(self._courses['title'][course]),
+            },
+            'sections': self.sections(mnemonic, number, topic)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a Lou's List CSV export into a catalog snapshot")
+    parser.add_argument('csv_path', help="e.g. ../../scripts/searchDataFall2025.csv")
+    parser.add_argument('snapshot_path', nargs='?', default='catalog.snap')
+    args = parser.parse_args()
+
+    build_snapshot(load_catalog_csv(args.csv_path), args.snapshot_path)
+    snapshot = SnapshotCatalog(args.snapshot_path)
+    print(f"Wrote {snapshot.n_courses} courses and {snapshot.n_sections} sections to {args.snapshot_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+
+
+class TTLCache:
+    """
+    LRU cache whose entries are split into halves with their own TTLs
+
+    get_comprehensive_course_info caches thecourseforum ratings and Lou's
+    List sections under the same course key, but ratings change about once
+    a semester while enrollment changes by the minute, so each half expires
+    on its own schedule.
+
+    With a stale window for a half, an expired value younger than
+    ttl + stale window is returned immediately and refreshed on a
+    background thread (stale-while-revalidate). Older values are
+    re-fetched before returning.
+
+    Misses are single-flight: while one caller loads a (key, half), other
+    callers asking for it wait for that load instead of starting their own.
+    """
+
+    def __init__(self, ttls, stale_windows=None, max_entries=512, refresh_workers=2):
+        """
+        Args:
+            ttls (Dict[str, float]): Seconds each half stays fresh, e.g. {'ratings': 604800}
+            stale_windows (Dict[str, float], optional): Seconds past expiry a half may be served stale
+            max_entries (int): Keys kept before the least recently used is evicted
+            refresh_workers (int): Threads used for background refreshes
+        """
+        self.ttls = ttls
+        self.stale_windows = stale_windows or {}
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._loading = {}
+        self._lock = Lock()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers)
+        self.counters = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'shared_loads': 0,
+            'refreshes': 0, 'refresh_failures': 0, 'evictions': 0
+        }
+
+    def get(self, key, half, loader):
+        """
+        Return the cached value of one half of a key, loading it on a miss
+
+        Args:
+            key (tuple): Cache key
+            half (str): Which half of the entry to read, e.g. 'ratings'
+            loader (Callable[[], Any]): Fetches the value; None results are not cached
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and half in entry:
+                value, fetched_at = entry[half]
+                age = now - fetched_at
+                self._entries.move_to_end(key)
+                if age < self.ttls[half]:
+                    self.counters['hits'] += 1
+                    return value
+                if age < self.ttls[half] + self.stale_windows.get(half, 0):
+                    self.counters['stale_hits'] += 1
+                    if (key, half) not in self._refreshing:
+                        self._refreshing.add((key, half))
+                        self._refresh_pool.submit(self._refresh, key, half, loader)
+                    return value
+            loading = self._loading.get((key, half))
+            if loading is None:
+                self.counters['misses'] += 1
+                loading = self._loading[(key, half)] = Future()
+                owner = True
+            else:
+                self.counters['shared_loads'] += 1
+                owner = False
+
+        if not owner:
+            return loading.result()
+        try:
+            value = loader()
+            self.put(key, half, value)
+            loading.set_result(value)
+            return value
+        except BaseException as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[(key, half)]
+
+    def cached(self, key, half):
+        """
+        Whether get would answer from the cache without calling the loader
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or half not in entry:
+                return False
+            age = time.monotonic() - entry[half][1]
+            return age < self.ttls[half] + self.stale_windows.get(half, 0)
+
+    def put(self, key, half, value):
+        """
+        Store one half of a key, evicting the least recently used key if full
+        """
+        if value is None:
+            return
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[half] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def _refresh(self, key, half, loader):
+        # A failed refresh keeps serving the stale value until its stale
+        # window runs out, so say so instead of failing silently
+        try:
+            value = loader()
+            if value is None:
+                raise ValueError("loader returned nothing")
+            self.put(key, half, value)
+            with self._lock:
+                self.counters['refreshes'] += 1
+        except Exception as e:
+            with self._lock:
+                self.counters['refresh_failures'] += 1
+            print(f"Error refreshing {half} of {key}, serving the stale value: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard((key, half))
+
+    def invalidate(self, key, half=None):
+        """
+        Drop a key, or only one half of it
+        """
+        with self._lock:
+            if half is None:
+                self._entries.pop(key, None)
+            elif key in self._entries:
+                self._entries[key].pop(half, None)
+
+    def invalidate_where(self, predicate, half=None):
+        """
+        Drop every key for which predicate(key) is true, or only one half of
+        it, and return how many keys were affected
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                if half is None:
+                    del self._entries[key]
+                else:
+                    self._entries[key].pop(half, None)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Hit/miss counters plus the size and the oldest and mean age of each half
+        """
+        now = time.monotonic()
+        with self._lock:
+            ages = {}
+            for entry in self._entries.values():
+                for half, (_, fetched_at) in entry.items():
+                    ages.setdefault(half, []).append(now - fetched_at)
+            return {
+                **self.counters,
+                'entries': len(self._entries),
+                'ages': {
+                    half: {
+                        'count': len(values),
+                        'max_seconds': round(max(values), 1),
+                        'mean_seconds': round(sum(values) / len(values), 1)
+                    }
+                    for half, values in ages.items()
+                }
+            }
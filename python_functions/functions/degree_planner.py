@@ -0,0 +1,332 @@
+"""
+Multi-semester degree planning on top of the prerequisite graph
+
+A plan assigns every required course to a semester so that each course's
+prerequisites are completed in earlier semesters and no semester exceeds
+the credit cap. Whether a semester's courses fit in one weekly timetable
+is left to a feasibility oracle (main.timetable_oracle runs the CSP on
+catalog sections); its answers are memoized per course set, and per term
+too unless the oracle ignores the term, since the nested search asks about
+the same sets many times.
+
+The search fills semesters in order, trying larger course sets and courses
+on longer prerequisite chains first. Iterative deepening on the number of
+semesters makes the first plan found one with the fewest semesters. A course
+with as many semesters of dependent courses after it as are left must be
+taken now, and a (semester, placed courses) state that failed once is not
+searched again.
+
+    python degree_planner.py                     # plan the BSCS core with calculus placement
+    python degree_planner.py --completed CS 1110 APMA 1110 --max-credits 15
+"""
+import argparse
+import math
+import re
+from itertools import combinations
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional
+
+from catalog import get_catalog
+from prerequisites import PrerequisiteGraph, course_code, describe_missing
+
+DEFAULT_MAX_CREDITS = 17
+# Credits assumed for courses the catalog export does not list
+DEFAULT_UNITS = 3
+TERMS = ('Fall', 'Spring')
+
+# Named courses of the BSCS from scripts/UVA_BSCS.txt and the example
+# schedule; electives and choices other than the first listed are left to
+# the caller
+BSCS_CORE = [
+    'APMA 1110', 'APMA 2120', 'CHEM 1410', 'CHEM 1411', 'PHYS 1425', 'PHYS 1429',
+    'ENGR 1010', 'ENGR 1020', 'ECE 2200', 'STS 2600', 'STS 4500', 'STS 4600',
+    'CS 1110', 'CS 2100', 'CS 2120', 'CS 2130', 'CS 3100', 'CS 3120', 'CS 3130',
+    'CS 3140', 'CS 3240', 'CS 4980', 'APMA 3100',
+]
+# APMA 1110 requires APMA 1090 or MATH 1310, which BSCS students place out
+# of with calculus credit; the CLI assumes it unless --placement says otherwise
+DEFAULT_PLACEMENT = ['MATH 1310']
+
+
+_units = None
+_units_catalog = None
+_units_lock = Lock()
+
+
+def get_units() -> Dict[str, float]:
+    """
+    Return the process-wide course credits from the catalog, built on first
+    use and again whenever another catalog is swapped in; empty when no
+    catalog is available
+    """
+    global _units, _units_catalog
+    catalog = get_catalog()
+    with _units_lock:
+        if catalog is None:
+            return {}
+        if catalog is not _units_catalog:
+            _units = catalog.units()
+            _units_catalog = catalog
+        return _units
+
+
+class DegreePlanner:
+    """
+    Assigns required courses to semesters
+
+    Args:
+        graph (PrerequisiteGraph): Prerequisites between courses
+        units (Dict[str, float]): Credits per course
+        feasible (Callable[[str, frozenset], bool], optional): Whether a set
+            of courses fits one term's timetable; every set does when omitted
+        max_credits (float): Credit cap per semester
+        terms (Tuple[str, ...]): Terms semesters cycle through
+        term_independent (bool): The oracle ignores the term, so one answer
+            per course set serves every term
+    """
+
+    def __init__(self, graph: PrerequisiteGraph, units: Dict[str, float],
+                 feasible: Optional[Callable[[str, frozenset], bool]] = None,
+                 max_credits: float = DEFAULT_MAX_CREDITS, terms=TERMS, term_independent: bool = False):
+        self.graph = graph
+        self.units = units
+        self.oracle = feasible
+        self.term_independent = term_independent
+        self.max_credits = max_credits
+        self.terms = terms
+        self.feasibility = {}
+        self.stats = {'nodes': 0, 'oracle_calls': 0, 'oracle_hits': 0, 'dead_state_hits': 0}
+
+    def credits(self, course: str) -> float:
+        return self.units.get(course, DEFAULT_UNITS)
+
+    def feasible(self, term: str, courses: frozenset) -> bool:
+        """The oracle's answer for a term's course set, memoized"""
+        if self.oracle is None:
+            return True
+        key = courses if self.term_independent else (term, courses)
+        if key in self.feasibility:
+            self.stats['oracle_hits'] += 1
+            return self.feasibility[key]
+        # Courses that cannot share a timetable make every set holding both infeasible
+        pairs = combinations(sorted(courses), 2)
+        if len(courses) > 2 and not all(self.feasible(term, frozenset(pair)) for pair in pairs):
+            self.feasibility[key] = False
+            return False
+        self.stats['oracle_calls'] += 1
+        result = self.feasibility[key] = bool(self.oracle(term, courses))
+        return result
+
+    def check(self, required: List[str], completed: Iterable[str]):
+        """
+        Raise ValueError for a course no plan can place: one over the credit
+        cap, or one whose prerequisites neither the completed nor the
+        required courses meet
+        """
+        for course in required:
+            if self.credits(course) > self.max_credits:
+                raise ValueError(f"{course} alone exceeds {self.max_credits} credits")
+        reachable = self.graph.mask(list(completed) + required)
+        for course in required:
+            missing = self.graph.missing(course, reachable)
+            if missing:
+                raise ValueError(f"{course} needs {describe_missing(missing)}, which is neither completed nor planned")
+
+    def plan(self, required: Iterable[str], completed: Iterable[str] = (), semesters: int = 8,
+             start_term: str = TERMS[0]) -> Optional[List[Dict]]:
+        """
+        Plan the required courses over at most `semesters` semesters
+
+        Args:
+            required (Iterable[str]): Courses the plan must contain
+            completed (Iterable[str]): Courses already taken
+            semesters (int): Most semesters the plan may take
+            start_term (str): Term of the first semester
+
+        Returns:
+            List of {'semester', 'term', 'courses', 'credits'} with the fewest
+            semesters, or None when none fits
+
+        Raises:
+            ValueError: A required course cannot be placed in any plan
+        """
+        completed = [course_code(course) for course in completed]
+        required = list(dict.fromkeys(
+            course for course in map(course_code, required) if course not in completed
+        ))
+        self.check(required, completed)
+        if not required:
+            return []
+
+        self.required = required
+        self.completed_mask = self.graph.mask(completed)
+        self.course_masks = [self.graph.mask([course]) for course in required]
+        self.below = self.required_below(required, set(completed))
+        self.tails = self.chain_tails()
+        self.first_term = self.terms.index(start_term)
+        self.dead = {}
+        # Courses with the longest chains after them first, then the heavier ones
+        self.priority = sorted(
+            range(len(required)),
+            key=lambda i: (-self.tails[i], -self.credits(required[i]), required[i])
+        )
+        # Every course after the courses below it
+        self.order = sorted(range(len(required)), key=lambda i: bin(self.below[i]).count('1'))
+
+        all_placed = (1 << len(required)) - 1
+        for limit in range(self.lower_bound(all_placed), semesters + 1):
+            plan = self.search(0, 0, limit)
+            if plan is not None:
+                return [
+                    {
+                        'semester': k + 1,
+                        'term': self.term(k),
+                        'courses': sorted(required[i] for i in chosen),
+                        'credits': sum(self.credits(required[i]) for i in chosen),
+                    }
+                    for k, chosen in enumerate(plan)
+                ]
+        return None
+
+    def required_below(self, required: List[str], completed: set) -> List[int]:
+        """
+        Per course, a mask over required of the courses it needs, transitively,
+        that are still to be taken
+        """
+        index = {course: i for i, course in enumerate(required)}
+        return [
+            sum(
+                1 << index[prerequisite] for prerequisite in self.graph.required_closure(course)
+                if prerequisite in index and prerequisite not in completed and prerequisite != course
+            )
+            for course in required
+        ]
+
+    def chain_tails(self) -> List[int]:
+        """
+        Per course, the most semesters that must follow it: the longest chain
+        of required courses that need it
+        """
+        n = len(self.required)
+        tails = [0] * n
+        # Courses needing more of the others come later in any chain
+        for i in sorted(range(n), key=lambda i: -bin(self.below[i]).count('1')):
+            for j in range(n):
+                if self.below[i] >> j & 1:
+                    tails[j] = max(tails[j], tails[i] + 1)
+        return tails
+
+    def term(self, k: int) -> str:
+        return self.terms[(self.first_term + k) % len(self.terms)]
+
+    def lower_bound(self, remaining: int) -> int:
+        """
+        Semesters still needed for the remaining courses, at the least: the
+        longest chain among them, or their credits over the cap
+        """
+        heights = {}
+        credits = 0
+        for i in self.order:
+            if remaining >> i & 1:
+                below = self.below[i] & remaining
+                heights[i] = 1 + max((heights[j] for j in heights if below >> j & 1), default=0)
+                credits += self.credits(self.required[i])
+        if not heights:
+            return 0
+        return max(max(heights.values()), math.ceil(credits / self.max_credits))
+
+    def done_mask(self, placed: int) -> int:
+        mask = self.completed_mask
+        for i, course_mask in enumerate(self.course_masks):
+            if placed >> i & 1:
+                mask |= course_mask
+        return mask
+
+    def candidates(self, k: int, placed: int, limit: int):
+        """
+        Course sets for semester k, largest first. Courses with as many
+        semesters of chain after them as are left after this one must be in
+        the set, and a set another available course could still be added to
+        is skipped.
+        """
+        done = self.done_mask(placed)
+        available = [
+            i for i in self.priority
+            if not placed >> i & 1 and self.graph.can_take(self.required[i], done)
+        ]
+        forced = [i for i in available if k + self.tails[i] + 1 >= limit]
+        optional = [i for i in available if i not in forced]
+        term = self.term(k)
+        forced_credits = sum(self.credits(self.required[i]) for i in forced)
+        if forced_credits > self.max_credits:
+            return
+        for size in range(len(optional), -1, -1):
+            for extra in combinations(optional, size):
+                chosen = tuple(forced) + extra
+                credits = forced_credits + sum(self.credits(self.required[i]) for i in extra)
+                if not chosen or credits > self.max_credits:
+                    continue
+                courses = frozenset(self.required[i] for i in chosen)
+                if not self.feasible(term, courses):
+                    continue
+                if any(
+                    credits + self.credits(self.required[i]) <= self.max_credits
+                    and self.feasible(term, courses | {self.required[i]})
+                    for i in optional if i not in extra
+                ):
+                    continue
+                yield chosen
+
+    def search(self, k: int, placed: int, limit: int) -> Optional[List[tuple]]:
+        remaining = ((1 << len(self.required)) - 1) & ~placed
+        if not remaining:
+            return []
+        if k + self.lower_bound(remaining) > limit:
+            return None
+        # A state that failed with as many semesters left fails again
+        if self.dead.get((k, placed), -1) >= limit:
+            self.stats['dead_state_hits'] += 1
+            return None
+        self.stats['nodes'] += 1
+        for chosen in self.candidates(k, placed, limit):
+            rest = self.search(k + 1, placed | sum(1 << i for i in chosen), limit)
+            if rest is not None:
+                return [chosen] + rest
+        self.dead[(k, placed)] = limit
+        return None
+
+
+def main(argv=None):
+    import main as functions
+
+    parser = argparse.ArgumentParser(description="Plan required courses over several semesters")
+    parser.add_argument('--required', nargs='*', default=BSCS_CORE, help="Courses like 'CS 2100' (default: the BSCS core)")
+    parser.add_argument('--completed', nargs='*', default=[], help="Courses already taken")
+    parser.add_argument('--placement', nargs='*', default=DEFAULT_PLACEMENT,
+                        help=f"Courses placed out of (default: {' '.join(DEFAULT_PLACEMENT)})")
+    parser.add_argument('--semesters', type=int, default=8)
+    parser.add_argument('--max-credits', type=float, default=DEFAULT_MAX_CREDITS)
+    parser.add_argument('--start-term', choices=TERMS, default=TERMS[0])
+    parser.add_argument('--no-timetable', action='store_true', help="Skip the timetable feasibility check")
+    args = parser.parse_args(argv)
+
+    # Course arguments may be split on the space ('CS 2100' -> 'CS', '2100')
+    def courses(values):
+        return re.findall(r'[A-Z]{2,4}\s*\d{4}', ' '.join(values).upper())
+
+    planner = functions.degree_planner(args.max_credits, timetable=not args.no_timetable)
+    try:
+        completed = courses(args.placement + args.completed)
+        plan = planner.plan(courses(args.required), completed, args.semesters, args.start_term)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    if plan is None:
+        print(f"No plan fits in {args.semesters} semesters")
+    else:
+        for semester in plan:
+            print(f"{semester['semester']}. {semester['term']:<6} {semester['credits']:>4g} credits  {', '.join(semester['courses'])}")
+    print(planner.stats)
+
+
+if __name__ == '__main__':
+    main()
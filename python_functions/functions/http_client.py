@@ -0,0 +1,98 @@
+"""
+Shared HTTP client for the scrapers
+
+One requests.Session is kept per process, so a warm container reuses
+keep-alive connections to louslist.org and thecourseforum.com across
+requests. Failed requests are retried with exponential backoff, every
+request has a timeout, and at most MAX_REQUESTS_PER_HOST requests run
+concurrently against a single host.
+"""
+from threading import BoundedSemaphore, Lock
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds
+TIMEOUT = (5, 10)
+MAX_REQUESTS_PER_HOST = 4
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_host_semaphores = {}
+_lock = Lock()
+
+
+def configure(timeout=None, max_requests_per_host=None, retries=None, backoff_factor=None):
+    """
+    Change the client settings; the pooled session is rebuilt on next use
+    """
+    global TIMEOUT, MAX_REQUESTS_PER_HOST, RETRIES, BACKOFF_FACTOR, _session
+    with _lock:
+        if timeout is not None:
+            TIMEOUT = timeout
+        if max_requests_per_host is not None:
+            MAX_REQUESTS_PER_HOST = max_requests_per_host
+            _host_semaphores.clear()
+        if retries is not None:
+            RETRIES = retries
+        if backoff_factor is not None:
+            BACKOFF_FACTOR = backoff_factor
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_session():
+    """
+    Return the process-wide session, creating it on first use
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset(['GET', 'HEAD']),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=MAX_REQUESTS_PER_HOST,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _host_semaphore(url):
+    host = urlparse(url).netloc
+    with _lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = _host_semaphores[host] = BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+        return semaphore
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    """
+    GET a URL through the pooled session
+
+    Args:
+        url (str): URL to fetch
+        params (dict, optional): Query string parameters
+        timeout (optional): Overrides TIMEOUT for this request
+
+    Returns:
+        requests.Response
+    """
+    session = get_session()
+    with _host_semaphore(url):
+        return session.get(url, params=params, timeout=timeout or TIMEOUT, **kwargs)
@@ -0,0 +1,163 @@
+"""
+Instructor name resolution across Lou's List, thecourseforum and RateMyProfessor
+
+The sources spell the same person differently: Lou's List lists every
+instructor of a section in one cell ("Robert Vinson, Naseemah Mohamed"),
+thecourseforum and RateMyProfessor use one name each, with or without
+middle names and initials, accents or suffixes. name_key reduces a name to
+its first and last name, accent-insensitive; InstructorIndex
+maps every variant it has seen to one canonical ID by that key and, when
+resolving a query, falls back to a fuzzy match for misspellings, through a
+trigram index built as names are added so a lookup only compares against
+names sharing trigrams with it. Adding a name never matches fuzzily, so
+two people with similar names ("John Miller", "John Dillery") stay apart.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set
+
+# Placeholders Lou's List shows instead of an instructor
+UNANNOUNCED = {'to be announced', 'staff', 'tba'}
+
+# Name parts that do not tell instructors apart
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'phd', 'md'}
+
+# A fuzzy candidate must share this share of trigrams with the name, and
+# then match it this closely character by character
+TRIGRAM_THRESHOLD = 0.3
+FUZZY_THRESHOLD = 0.85
+
+
+def normalize_instructor(name: str) -> str:
+    """
+    Lowercase a name and drop accents, periods and repeated whitespace, so
+    "Tomás  García" and "tomas garcia" compare equal
+    """
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', name.replace('.', ' ')).strip().casefold()
+
+
+def split_instructors(cell: str) -> List[str]:
+    """
+    Normalized names of every announced instructor in a Lou's List cell
+    """
+    names = (normalize_instructor(name) for name in (cell or '').split(','))
+    return [name for name in names if name and name not in UNANNOUNCED]
+
+
+def name_key(name: str) -> str:
+    """
+    First and last name of an instructor, without initials or suffixes
+
+    "Mark R. Sherriff" and "Mark Sherriff Jr." both give "mark sherriff".
+    Token order is kept, so "Lee Kim" and "Kim Lee" stay two people. Keys
+    are their own keys.
+    """
+    tokens = [
+        token for token in normalize_instructor(name).split()
+        if len(token) > 1 and token not in SUFFIXES
+    ]
+    if not tokens:
+        return ''
+    return ' '.join(dict.fromkeys((tokens[0], tokens[-1])))
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InstructorIndex:
+    """
+    Canonical instructor IDs for the name variants of every source
+
+    Every name_key is its own canonical ID; variants sharing a key (with
+    or without initials or suffixes) are recorded against it per source.
+    Fuzzy matching only applies to resolve().
+    """
+
+    def __init__(self):
+        self._ids = {}          # name_key -> canonical ID
+        self._trigrams = {}     # trigram -> canonical IDs containing it
+        self._sizes = {}        # canonical ID -> number of trigrams
+        self._fuzzy_ids = {}    # name_key -> fuzzy match, cleared when an ID is added
+        self.variants = {}      # canonical ID -> {source: set of names}
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def add(self, name: str, source: str = 'louslist') -> Optional[str]:
+        """
+        Record a name and return its canonical ID, registering a new
+        instructor when no name with the same key was added before
+
+        Returns:
+            str: Canonical ID, or None for a blank or placeholder name
+        """
+        key = name_key(name)
+        if not key or normalize_instructor(name) in UNANNOUNCED:
+            return None
+        instructor_id = self._ids.get(key)
+        if instructor_id is None:
+            instructor_id = self._ids[key] = key
+            grams = trigrams(key)
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(instructor_id)
+            self._sizes[instructor_id] = len(grams)
+            self._fuzzy_ids.clear()
+        self.variants.setdefault(instructor_id, {}).setdefault(source, set()).add(name)
+        return instructor_id
+
+    def add_cell(self, cell: str, source: str = 'louslist') -> List[str]:
+        """
+        Record every instructor of a Lou's List cell and return their IDs
+        """
+        ids = (self.add(name.strip(), source) for name in (cell or '').split(','))
+        return [instructor_id for instructor_id in ids if instructor_id is not None]
+
+    def resolve(self, name: str, fuzzy: bool = True) -> Optional[str]:
+        """
+        Canonical ID of a name, matching misspellings fuzzily unless fuzzy is False
+
+        Returns:
+            str: Canonical ID, or None when no known instructor is close enough
+        """
+        key = name_key(name)
+        if not key or normalize_instructor(name) in UNANNOUNCED:
+            return None
+        instructor_id = self._ids.get(key)
+        if instructor_id is not None or not fuzzy:
+            return instructor_id
+        if key not in self._fuzzy_ids:
+            self._fuzzy_ids[key] = self._fuzzy(key)
+        return self._fuzzy_ids[key]
+
+    def resolve_cell(self, cell: str) -> List[str]:
+        """
+        Canonical IDs of the known instructors of a Lou's List cell
+        """
+        ids = (self.resolve(name) for name in split_instructors(cell))
+        return [instructor_id for instructor_id in ids if instructor_id is not None]
+
+    def names(self, instructor_id: str, source: str) -> Set[str]:
+        """
+        Names an instructor was added under from one source
+        """
+        return self.variants.get(instructor_id, {}).get(source, set())
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        grams = trigrams(key)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for instructor_id in self._trigrams.get(gram, ()):
+                shared[instructor_id] = shared.get(instructor_id, 0) + 1
+        best, best_ratio = None, 0.0
+        for instructor_id, count in shared.items():
+            if count / (len(grams) + self._sizes[instructor_id] - count) < TRIGRAM_THRESHOLD:
+                continue
+            ratio = SequenceMatcher(None, key, instructor_id).ratio()
+            if ratio >= FUZZY_THRESHOLD and ratio > best_ratio:
+                best, best_ratio = instructor_id, ratio
+        return best
@@ -0,0 +1,130 @@
+"""
+Instructor rating lookups for schedule sections
+
+thecourseforum rates instructors per course, and Lou's List names a
+section's instructors in one cell ("Robert Vinson, Naseemah Mohamed",
+"To Be Announced"). Each course's rated instructors are indexed once in
+an InstructorIndex, and a section's instructors resolve through it like
+every other name, fuzzy matches included, so a section's stats are a
+lookup per instructor instead of a scan over every course's ratings.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from instructor_names import InstructorIndex, name_key
+
+STAT_FIELDS = ('rating', 'difficulty', 'gpa')
+
+
+def stat_value(value) -> Optional[float]:
+    # thecourseforum reports missing values as "N/A"
+    if value is None or value == "N/A":
+        return None
+    return round(float(value), 2)
+
+
+def ratings_index(ratings: Dict[str, Dict]) -> Dict[str, Tuple]:
+    """
+    Index thecourseforum ratings of one course by instructor name_key
+
+    Args:
+        ratings (Dict[str, Dict]): Instructor name -> dict with rating, difficulty and gpa
+
+    Returns:
+        Dict[str, Tuple]: Name key -> (rating, difficulty, gpa), None where missing
+    """
+    return {
+        name_key(name): tuple(stat_value(info.get(field)) for field in STAT_FIELDS)
+        for name, info in ratings.items()
+    }
+
+
+def build_stats_index(data: Dict[str, Dict]) -> Dict[str, Tuple[InstructorIndex, Dict[str, Tuple]]]:
+    """
+    Index the ratings of every requested course by canonical instructor ID
+
+    Uses the index get_comprehensive_course_info cached with each course's
+    ratings when present, and builds it from course_ratings otherwise.
+
+    Args:
+        data (Dict[str, Dict]): Course data by course, as fetch_course_data returns it
+
+    Returns:
+        Dict: Course -> (InstructorIndex of its rated instructors, canonical ID -> stats)
+    """
+    index = {}
+    for course, course_data in data.items():
+        stats = course_data.get('instructor_stats')
+        if stats is None:
+            stats = ratings_index(course_data.get('course_ratings', {}))
+        instructors = InstructorIndex()
+        by_id = {}
+        for name, values in stats.items():
+            instructor_id = instructors.add(name, 'thecourseforum')
+            if instructor_id is not None:
+                by_id.setdefault(instructor_id, []).append(values)
+        index[course] = (instructors, {instructor_id: combine_stats(found) for instructor_id, found in by_id.items()})
+    return index
+
+
+def resolve_stats(instructors: InstructorIndex, stats: Dict[str, Tuple]) -> Dict[str, Tuple]:
+    """
+    Re-key stats by the canonical ID each name resolves to in instructors
+
+    A name matching an ID exactly takes precedence over names matching it
+    fuzzily; names matching one ID equally well are combined, so none of
+    them silently replaces another.
+
+    Args:
+        instructors (InstructorIndex): Index the names resolve against
+        stats (Dict[str, Tuple]): Name -> (rating, difficulty, gpa)
+
+    Returns:
+        Dict[str, Tuple]: Canonical ID -> (rating, difficulty, gpa)
+    """
+    matched = {}  # canonical ID -> (exact, stats of the names matching it)
+    for name, values in stats.items():
+        instructor_id = instructors.resolve(name, fuzzy=False)
+        exact = instructor_id is not None
+        if not exact:
+            instructor_id = instructors.resolve(name)
+        if instructor_id is None:
+            continue
+        current = matched.get(instructor_id)
+        if current is None or exact > current[0]:
+            matched[instructor_id] = (exact, [values])
+        elif exact == current[0]:
+            current[1].append(values)
+    return {instructor_id: combine_stats(found) for instructor_id, (_, found) in matched.items()}
+
+
+def average(values: Iterable[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def combine_stats(found: List[Tuple]) -> Tuple:
+    """Stats of one instructor, or each field averaged over several that have it"""
+    if len(found) == 1:
+        return found[0]
+    return tuple(average(stats[i] for stats in found) for i in range(len(STAT_FIELDS)))
+
+
+def section_stats(index: Dict[str, Tuple[InstructorIndex, Dict[str, Tuple]]], course: str,
+                  instructor: str) -> Optional[List]:
+    """
+    Rating, difficulty and gpa of a section of course taught by instructor
+
+    Sections with several rated instructors get each field averaged over
+    the instructors that have it.
+
+    Returns:
+        [rating, difficulty, gpa], or None when no instructor of the section is rated
+    """
+    if course not in index:
+        return None
+    instructors, stats = index[course]
+    ids = dict.fromkeys(instructors.resolve_cell(instructor))
+    found = [stats[instructor_id] for instructor_id in ids if instructor_id in stats]
+    if not found:
+        return None
+    return list(combine_stats(found))
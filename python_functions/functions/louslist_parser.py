@@ -0,0 +1,291 @@
+"""
+Parser for Lou's List search result pages
+
+Each backend walks the <tr> elements of a page once and reduces every row
+to a small tuple; extract_courses turns those tuples into the course dicts
+scrape_louslist returns. Backends differ only in the HTML parser used:
+
+    selectolax   lexbor-based C parser with CSS selectors (pinned in
+                 requirements.txt, so the default in production)
+    lxml         lxml.html, walking the element tree without BeautifulSoup
+    html.parser  BeautifulSoup on the pure-Python parser, building only the
+                 <tr> subtrees through a SoupStrainer (reference)
+
+The HTML5 parsers close unterminated <td> and <tr> tags where html.parser
+nests them, and drop rows outside a <table>, so their results only match
+the reference on well-formed tables. Pages that are not are parsed with
+html.parser whatever the default backend.
+
+Set LOUSLIST_PARSER to force a backend.
+"""
+import os
+import re
+from typing import Dict, Iterator, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - optional dependency
+    lxml = None
+
+TOPIC_ROW_CLASSES = ('SectionTopicOdd', 'SectionTopicEven')
+# Only table rows are built into the html.parser tree
+ROW_STRAINER = SoupStrainer('tr')
+TAG_PATTERNS = {tag: (re.compile(rf'<{tag}[\s>]', re.I), re.compile(rf'</{tag}\s*>', re.I)) for tag in ('table', 'tr', 'td')}
+
+
+def is_instructor_tip(onclick):
+    return onclick and 'InstructorTip' in onclick
+
+
+def soup_rows(soup) -> Iterator[tuple]:
+    for row in soup.find_all('tr'):
+        # Course header rows
+        course_num_cell = row.find('td', class_='CourseNum')
+        if course_num_cell:
+            course_name_cell = row.find('td', class_='CourseName')
+            yield ('course', course_num_cell.text.strip(), course_name_cell.text.strip() if course_name_cell else None)
+            continue
+
+        # Topic rows; the topic is in the td with colspan="8"
+        row_classes = row.get('class', [])
+        if row_classes and any(topic_class in row_classes for topic_class in TOPIC_ROW_CLASSES):
+            topic_cell = row.find('td', attrs={'colspan': '8'})
+            yield ('topic', topic_cell.text.strip() if topic_cell else '')
+            continue
+
+        cells = row.find_all('td')
+        if len(cells) == 8:
+            if not cells[4].find('a'):
+                continue
+            instructor_span = cells[5].find('span', onclick=is_instructor_tip)
+            yield (
+                'section',
+                [cell.text.strip() for cell in cells],
+                instructor_span.text.strip() if instructor_span else None
+            )
+        elif len(cells) == 4:
+            yield ('continuation', [cell.text.strip() for cell in cells])
+
+
+def html_parser_rows(html: str) -> Iterator[tuple]:
+    return soup_rows(BeautifulSoup(html, 'html.parser', parse_only=ROW_STRAINER))
+
+
+def has_class(element, name):
+    return name in (element.get('class') or '').split()
+
+
+def lxml_rows(html: str) -> Iterator[tuple]:
+    if not html.strip():
+        return
+    for row in lxml.html.fromstring(html).iter('tr'):
+        cells = list(row.iter('td'))
+        course_num_cell = next((cell for cell in cells if has_class(cell, 'CourseNum')), None)
+        if course_num_cell is not None:
+            course_name_cell = next((cell for cell in cells if has_class(cell, 'CourseName')), None)
+            yield (
+                'course',
+                course_num_cell.text_content().strip(),
+                course_name_cell.text_content().strip() if course_name_cell is not None else None
+            )
+            continue
+
+        if any(has_class(row, topic_class) for topic_class in TOPIC_ROW_CLASSES):
+            topic_cell = next((cell for cell in cells if cell.get('colspan') == '8'), None)
+            yield ('topic', topic_cell.text_content().strip() if topic_cell is not None else '')
+            continue
+
+        if len(cells) == 8:
+            if next(cells[4].iter('a'), None) is None:
+                continue
+            instructor_span = next(
+                (span for span in cells[5].iter('span') if is_instructor_tip(span.get('onclick'))), None
+            )
+            yield (
+                'section',
+                [cell.text_content().strip() for cell in cells],
+                instructor_span.text_content().strip() if instructor_span is not None else None
+            )
+        elif len(cells) == 4:
+            yield ('continuation', [cell.text_content().strip() for cell in cells])
+
+
+def selectolax_rows(html: str) -> Iterator[tuple]:
+    for row in HTMLParser(html).css('tr'):
+        course_num_cell = row.css_first('td.CourseNum')
+        if course_num_cell is not None:
+            course_name_cell = row.css_first('td.CourseName')
+            yield (
+                'course',
+                course_num_cell.text().strip(),
+                course_name_cell.text().strip() if course_name_cell is not None else None
+            )
+            continue
+
+        row_classes = (row.attributes.get('class') or '').split()
+        if any(topic_class in row_classes for topic_class in TOPIC_ROW_CLASSES):
+            topic_cell = row.css_first('td[colspan="8"]')
+            yield ('topic', topic_cell.text().strip() if topic_cell is not None else '')
+            continue
+
+        cells = row.css('td')
+        if len(cells) == 8:
+            if cells[4].css_first('a') is None:
+                continue
+            instructor_span = cells[5].css_first('span[onclick*="InstructorTip"]')
+            yield (
+                'section',
+                [cell.text().strip() for cell in cells],
+                instructor_span.text().strip() if instructor_span is not None else None
+            )
+        elif len(cells) == 4:
+            yield ('continuation', [cell.text().strip() for cell in cells])
+
+
+BACKENDS = {
+    'selectolax': selectolax_rows,
+    'lxml': lxml_rows,
+    'html.parser': html_parser_rows,
+}
+
+
+def available_backends():
+    """
+    Installed backends, fastest first
+    """
+    installed = {'selectolax': HTMLParser is not None, 'lxml': lxml is not None, 'html.parser': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def default_backend() -> str:
+    backend = os.environ.get('LOUSLIST_PARSER')
+    if backend:
+        if backend not in available_backends():
+            raise ValueError(f"Lou's List parser backend {backend!r} is not available")
+        return backend
+    return available_backends()[0]
+
+
+def well_formed_tables(html: str) -> bool:
+    """
+    Whether every <table>, <tr> and <td> of a page is closed, so the HTML5
+    backends build the same rows as html.parser
+    """
+    for opening, closing in TAG_PATTERNS.values():
+        if len(opening.findall(html)) != len(closing.findall(html)):
+            return False
+    return bool(TAG_PATTERNS['table'][0].search(html)) or not TAG_PATTERNS['tr'][0].search(html)
+
+
+def extract_courses(rows, topic_name: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Build the course dicts of a page from its classified rows
+
+    Sections are attached to the most recent course header and tagged with
+    the most recent topic; with topic_name, only sections whose topic
+    contains it (case-insensitively) are kept. Continuation rows add extra
+    meetings of the previous section.
+    """
+    courses_dict = {}
+    current_course_number = None
+    last_section_num = None
+    current_topic = None
+    topic_filter = topic_name.lower() if topic_name is not None else None
+
+    for row in rows:
+        kind = row[0]
+        if kind == 'course':
+            _, course_number, course_name = row
+            if course_number not in courses_dict:
+                courses_dict[course_number] = {
+                    'course_info': {
+                        'number': course_number,
+                        'name': course_name,
+                    },
+                    'sections': []
+                }
+            current_course_number = course_number
+            continue
+
+        if kind == 'topic':
+            if row[1]:
+                current_topic = row[1]
+            continue
+
+        if not current_course_number:
+            continue
+        topic_matches = topic_filter is None or (current_topic and topic_filter in current_topic.lower())
+
+        if kind == 'section':
+            _, cells, instructor = row
+            if topic_matches:
+                enrollment = cells[4].split('/')
+                enrollment_current = int(enrollment[0]) if len(enrollment) > 0 else None
+                enrollment_max = int(enrollment[1]) if len(enrollment) > 1 else None
+
+                courses_dict[current_course_number]['sections'].append({
+                    'section_number': cells[1],
+                    'type': cells[2],
+                    'status': cells[3],
+                    'enrollment_current': enrollment_current,
+                    'enrollment_max': enrollment_max,
+                    'instructor': instructor if instructor is not None else cells[5],
+                    'schedule': cells[6],
+                    'location': cells[7],
+                    'topic': current_topic
+                })
+                last_section_num = cells[1]
+
+        elif kind == 'continuation' and last_section_num and topic_matches:
+            cells = row[1]
+            courses_dict[current_course_number]['sections'].append({
+                'section_number': last_section_num,
+                'instructor': cells[1],
+                'schedule': cells[2],
+                'location': cells[3],
+                'topic': current_topic
+            })
+
+    return courses_dict
+
+
+def filter_topic(course_data: Dict, topic_name: Optional[str]) -> Dict:
+    """
+    Keep only the sections of a parsed course whose topic contains
+    topic_name, as parsing with topic_name would have
+    """
+    if topic_name is None:
+        return course_data
+    topic_filter = topic_name.lower()
+    return {
+        **course_data,
+        'sections': [
+            section for section in course_data['sections']
+            if section['topic'] and topic_filter in section['topic'].lower()
+        ]
+    }
+
+
+def parse_louslist_page(html: str, topic_name: Optional[str] = None, backend: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Parse a Lou's List search result page
+
+    Args:
+        html (str): Page source
+        topic_name (str, optional): Keep only sections whose topic contains this
+        backend (str, optional): One of BACKENDS; defaults to default_backend(),
+            or html.parser for pages with unclosed table tags
+
+    Returns:
+        Dict mapping "MNEMONIC NUMBER" to {'course_info': ..., 'sections': [...]}
+    """
+    if backend is None:
+        backend = default_backend() if well_formed_tables(html) else 'html.parser'
+    return extract_courses(BACKENDS[backend](html), topic_name)
@@ -1,58 +1,92 @@
 from firebase_functions import https_fn
 from firebase_admin import initialize_app
+import base64
+import hmac
 import json
-import requests
+import os
+import tempfile
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode
 from typing import Dict, Optional
-from datetime import datetime as dt
-import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from threading import Event
+import time
+import heapq
+import itertools
+import http_client
+from catalog import Catalog, get_catalog, load_catalog_csv, set_catalog
+from catalog_snapshot import SnapshotCatalog, rebuild_snapshot, snapshot_row
+from catalog_diff import CatalogDiff, apply_to_catalog, diff_exports, invalidate_course_cache, read_export
+from course_cache import TTLCache
+from degree_planner import DEFAULT_MAX_CREDITS, DegreePlanner, get_units
+from instructor_names import InstructorIndex
+from instructor_stats import build_stats_index, ratings_index, resolve_stats, section_stats
+from louslist_parser import filter_topic, parse_louslist_page
+from prerequisites import PrerequisiteGraph, describe_missing, get_prerequisite_graph
+from schedule_parser import (
+    SLOT_MINUTES, SLOTS_PER_DAY, DAY_INDEX, FULL_DAY_MASK,
+    parse_time, parse_schedule_string, parse_many, parse_cache_info, time_to_minutes, meeting_to_mask,
+    split_meetings
+)
+from tracing import RequestTrace
 
 # Initialize Firebase Admin
 initialize_app()
 
+# Weights applied to the section fields averaged by calculate_solution_stats
+# when searching for the best schedule; use a negative weight to prefer
+# lower values (e.g. {'rating': 1.0, 'difficulty': -0.5, 'gpa': 0.5})
+DEFAULT_OBJECTIVE = {'rating': 1.0}
+OBJECTIVE_FIELDS = ('rating', 'difficulty', 'gpa')
+
 class CSP:
-    def __init__(self, variables, domains, time_constraints=None):
+    def __init__(self, variables, domains, time_constraints=None, section_masks=None):
         """
         Initialize CSP with lab section processing
+        
+        section_masks optionally maps course -> section -> precompiled weekly
+        meeting mask (e.g. from the catalog snapshot); only sections missing
+        from it have their meetings parsed.
         """
         self.variables = variables
         self.domains = domains
         self.final_schedule = {}
+        self.final_score = None
+        self.search_stats = {}
         self.time_constraints = time_constraints
         
         # Process and separate lab sections
         self.add_classes_with_labs()
         
+        # Parse every section's meetings once and compile them and the time
+        # constraints into weekly bitmasks, so the search only does bitwise ANDs
+        self.blocked_mask = self.compile_time_constraints()
+        self.section_masks = {}
+        for course, sections in self.domains.items():
+            # Lab variables take the masks of the course they were split from
+            known = (section_masks or {}).get(course.removesuffix('_lab'), {})
+            self.section_masks[course] = {}
+            for section, section_data in sections.items():
+                if section in known:
+                    self.section_masks[course][section] = known[section]
+                    continue
+                self.section_masks[course][section] = self.section_mask(section_data)
+        
+        # Index each domain and precompute which sections are compatible
+        # with each other, so forward checking is a bitwise AND per course
+        self.section_order = {
+            course: list(sections.keys()) for course, sections in self.domains.items()
+        }
+        self.live_domains = self.compile_live_domains()
+        self.compatible = self.compile_conflict_table()
+        
     def parse_schedule(self, schedule_string):
         """
         Parse a schedule string into a structured format
         
-        Robust parsing handles various schedule formats
+        Results come from the shared parse cache and must not be modified
         """
-        # Flexible regex to handle different schedule formats
-        schedule_pattern = r'^(\w+)\s+(\d{1,2}:\d{2}(?:am|pm))\s*-\s*(\d{1,2}:\d{2}(?:am|pm))$'
-        
-        try:
-            # Attempt to match the schedule
-            match = re.match(schedule_pattern, schedule_string)
-            
-            if not match:
-                raise ValueError(f"Cannot parse schedule format: {schedule_string}")
-            
-            # Extract components
-            days = [match .group(1)[i:i+2] for i in range(0, len(match.group(1)), 2)]
-            start_time = self.format_time(match.group(2).strip())
-            end_time = self.format_time(match.group(3).strip())
-            
-            return {
-                'days': days,
-                'start_time': start_time,
-                'end_time': end_time
-            }
-        
-        except Exception as e:
-            raise ValueError(f"Detailed parsing error for '{schedule_string}': {str(e)}")
+        return parse_schedule_string(schedule_string)
     
     def format_time(self, time_string):
         """
@@ -60,19 +94,7 @@ class CSP:
         
         Handles multiple time input formats
         """
-        # Remove any whitespace
-        time_string = time_string.replace(' ', '')
-        
-        try:
-            # Primary parsing strategy
-            return dt.strptime(time_string, "%I:%M%p").time()
-        except ValueError:
-            # Fallback parsing strategies
-            try:
-                # Try without colon
-                return dt.strptime(time_string, "%I%M%p").time()
-            except ValueError:
-                raise ValueError(f"Cannot parse time: {time_string}")
+        return parse_time(time_string)
     
     def has_time_conflict(self, schedule1, schedule2):
         """
@@ -92,6 +114,82 @@ class CSP:
         
         return False
     
+    def time_to_minutes(self, time_value):
+        """
+        Convert a datetime time object to minutes since midnight
+        """
+        return time_to_minutes(time_value)
+    
+    def parse_meetings(self, section_data):
+        """
+        Normalize a section's schedule into a list of parsed meetings
+        
+        Every meeting string is parsed, so sections that meet at different
+        times on different days are fully represented. Meetings that cannot
+        be parsed (e.g. 'TBA') are left out.
+        """
+        return [parsed for parsed in parse_many(section_data.get('schedule') or []) if parsed is not None]
+    
+    def parsed_meeting_mask(self, parsed):
+        """
+        Convert a parsed meeting into a weekly bitmask
+        
+        Start times round down and end times round up to the nearest slot,
+        so two meetings that overlap always share at least one bit. Lou's
+        List times are all multiples of SLOT_MINUTES, where this is exact;
+        off-grid meetings less than a slot apart are treated as conflicting.
+        """
+        return meeting_to_mask(parsed)
+    
+    def meeting_mask(self, schedule_string):
+        """
+        Convert a single meeting string into a weekly bitmask
+        
+        Meetings that cannot be parsed (e.g. 'TBA') occupy no slots.
+        """
+        try:
+            parsed = self.parse_schedule(schedule_string)
+        except ValueError:
+            return 0
+        return self.parsed_meeting_mask(parsed)
+    
+    def section_mask(self, section_data, meetings=None):
+        """
+        Compile the weekly bitmask for a section from all of its meetings
+        """
+        if meetings is None:
+            meetings = self.parse_meetings(section_data)
+        mask = 0
+        for parsed in meetings:
+            mask |= self.parsed_meeting_mask(parsed)
+        return mask
+    
+    def compile_time_constraints(self):
+        """
+        Compile the time constraints into a mask of blocked slots
+        
+        For every constrained day, all slots outside the allowed
+        (start, end) window are blocked. The window's start rounds up and
+        its end rounds down, so for meetings on the SLOT_MINUTES grid a
+        boundary like 9:03am allows exactly the meetings the plain
+        start/end comparison does.
+        """
+        blocked = 0
+        if not self.time_constraints:
+            return blocked
+        
+        for day, (constraint_start, constraint_end) in self.time_constraints.items():
+            if day not in DAY_INDEX:
+                continue
+            start_slot = -(-self.time_to_minutes(constraint_start) // SLOT_MINUTES)
+            end_slot = self.time_to_minutes(constraint_end) // SLOT_MINUTES
+            allowed = 0
+            if end_slot > start_slot:
+                allowed = ((1 << (end_slot - start_slot)) - 1) << start_slot
+            blocked |= (FULL_DAY_MASK & ~allowed) << (DAY_INDEX[day] * SLOTS_PER_DAY)
+        
+        return blocked
+    
     def add_classes_with_labs(self):
         """
         Process and separate lab sections from lecture sections
@@ -131,49 +229,145 @@ class CSP:
                 # Add lab sections to domains
                 self.domains[lab_course_key] = lab_sections
     
-    def check_for_conflicts(self, new_class, current_schedule):
+    def compile_live_domains(self):
         """
-        Check if a new class conflicts with existing schedule
+        Build the initial domain of every course as a bitset over its sections
         
-        Handles different possible schedule structures
+        Bit i is set when the i-th section has a schedule and does not fall
+        outside the time constraints.
         """
-        # If new class doesn't have a schedule, skip
-        if 'schedule' not in new_class or not new_class['schedule']:
-            return False
-        
-        # Parse the new class schedule
-        parsed_new_class = self.parse_schedule(new_class['schedule'][0])
-        
-        # Check against existing schedule
-        for course, assigned_class in current_schedule.items():
-            # Iterate through sections in the assigned course
-            for section, section_data in assigned_class.items():
-                # Check if section has a schedule
+        live_domains = {}
+        for course, section_codes in self.section_order.items():
+            live = 0
+            for i, section_code in enumerate(section_codes):
+                section_data = self.domains[course][section_code]
                 if 'schedule' not in section_data or not section_data['schedule']:
                     continue
-                
-                # Parse the assigned class schedule
-                parsed_assigned = self.parse_schedule(section_data['schedule'][0])
-                
-                # Check for time conflict
-                if self.has_time_conflict(parsed_new_class, parsed_assigned):
-                    return True
-        
-        # Check against time constraints if specified
-        print(self.time_constraints.keys())
-        print(parsed_new_class['days'])
-        if set(self.time_constraints.keys()) & set(parsed_new_class['days']):
-            for day in parsed_new_class['days']:
-                parsed_start = parsed_new_class['start_time']
-                parsed_end = parsed_new_class['end_time']
-                constaint_start = self.time_constraints[day][0]
-                constaint_end = self.time_constraints[day][1]
-                
-                if (parsed_start < constaint_start or 
-                    parsed_end > constaint_end):
-                    return True
+                if self.section_masks[course][section_code] & self.blocked_mask:
+                    continue
+                live |= 1 << i
+            live_domains[course] = live
+        return live_domains
+    
+    def compile_conflict_table(self):
+        """
+        Precompute the pairwise section compatibility table
         
-        return False
+        compatible[course][i][other] is a bitset over the sections of other
+        that do not conflict with the i-th section of course.
+        """
+        compatible = {}
+        for course, section_codes in self.section_order.items():
+            compatible[course] = []
+            for section_code in section_codes:
+                mask = self.section_masks[course][section_code]
+                row = {}
+                for other, other_codes in self.section_order.items():
+                    if other == course:
+                        continue
+                    bits = 0
+                    for j, other_code in enumerate(other_codes):
+                        if not mask & self.section_masks[other][other_code]:
+                            bits |= 1 << j
+                    row[other] = bits
+                compatible[course].append(row)
+        return compatible
+    
+    def forward_check(self, live, var, section_index):
+        """
+        Shrink the live domains of the unassigned courses after assigning a section
+        
+        Returns the pruned domains, or None as soon as any domain becomes empty.
+        """
+        compatible = self.compatible[var][section_index]
+        pruned = {}
+        for other, other_live in live.items():
+            if other == var:
+                continue
+            remaining = other_live & compatible[other]
+            if not remaining:
+                return None
+            pruned[other] = remaining
+        return pruned
+    
+    def initial_live_domains(self, schedule):
+        """
+        Live domains of the courses left unassigned by a partial schedule
+        
+        Returns None if the partial schedule already empties a domain.
+        """
+        live = {var: self.live_domains[var] for var in self.variables}
+        for var, assigned_class in schedule.items():
+            for section_code in assigned_class:
+                live = self.forward_check(live, var, self.section_order[var].index(section_code))
+                if live is None:
+                    return None
+        if not all(live.values()):
+            return None
+        return live
+    
+    def iter_live_sections(self, live_bits):
+        """
+        Yield the section indices set in a live domain bitset, lowest first
+        """
+        while live_bits:
+            lowest = live_bits & -live_bits
+            yield lowest.bit_length() - 1
+            live_bits ^= lowest
+    
+    def section_score(self, section_data, objective, defaults=None):
+        """
+        Score a section as the weighted sum of its rating, difficulty and gpa
+        
+        Fields that are missing or None count as their value in defaults, so
+        an unrated section is neither rewarded nor penalised against rated
+        ones; without a default they contribute nothing.
+        """
+        defaults = defaults or {}
+        score = 0
+        for field, weight in objective.items():
+            value = section_data.get(field)
+            if value is None:
+                value = defaults.get(field)
+            if value is not None:
+                score += weight * value
+        return score
+    
+    def field_means(self, objective):
+        """
+        Mean of every objective field over each course's sections
+        
+        Courses with no section carrying a field get the mean over all
+        sections instead, like calculate_solution_stats averages only the
+        values that are present.
+        
+        Returns:
+        - Dict of course -> {field: mean}
+        """
+        values = {field: [] for field in objective}
+        course_means = {}
+        for course, sections in self.domains.items():
+            course_means[course] = {}
+            for field in objective:
+                present = [data[field] for data in sections.values() if data.get(field) is not None]
+                if present:
+                    course_means[course][field] = sum(present) / len(present)
+                    values[field].extend(present)
+        overall = {field: sum(present) / len(present) for field, present in values.items() if present}
+        return {course: {**overall, **means} for course, means in course_means.items()}
+    
+    def compile_scores(self, objective):
+        """
+        Score every section once, indexed like section_order
+        """
+        means = self.field_means(objective)
+        return {
+            course: [
+                self.section_score(self.domains[course][code], objective, means[course])
+                for code in section_codes
+            ]
+            for course, section_codes in self.section_order.items()
+        }
     
     def backtracking_search(self, schedule=None, optimize_ratings=False):
         """
@@ -191,254 +385,406 @@ class CSP:
         Returns:
         - Optimized schedule or None if no valid schedule found
         """
-        if schedule is None:
-            schedule = {}
+        return next(self.iter_solutions(schedule, optimize_ratings), None)
+    
+    def value_order(self, var, optimize_ratings=False):
+        """
+        Order in which the sections of a course are tried, as section indices
+        
+        If optimizing ratings, rated sections come first in descending order
+        of rating, followed by unrated sections in their original order.
+        """
+        order = list(range(len(self.section_order[var])))
+        if optimize_ratings:
+            ratings = [self.domains[var][code].get('rating') for code in self.section_order[var]]
+            order.sort(key=lambda i: (ratings[i] is None, -(ratings[i] or 0)))
+        return order
+    
+    def iter_solutions(self, schedule=None, optimize_ratings=False, after=None):
+        """
+        Lazily yield every conflict-free schedule in search order
         
-        # Check if all variables are assigned
-        if len(schedule) == len(self.variables):
-            return schedule
+        A single assignment is extended and undone in place instead of being
+        copied at every level. Each yielded schedule is a shallow copy, so
+        callers can keep it, page through results with itertools.islice,
+        count them or stop early without the rest being searched.
         
-        # Select an unassigned variable (course)
-        var = self.select_unassigned_variable(schedule)
+        Passing a previously yielded schedule as after resumes the search
+        right behind it: the search walks down that schedule's branch,
+        skipping the sections tried before it at each level, instead of
+        enumerating every earlier schedule again.
         
-        # If optimizing ratings, sort sections by rating in descending order
-        sections = self.domains[var].items()
-        if optimize_ratings:
-            # Filter out sections without ratings, then sort
-            rated_sections = [
-                (section_code, section_data) 
-                for section_code, section_data in sections 
-                if section_data.get('rating') is not None
-            ]
+        Args:
+        - schedule: Partial schedule to extend
+        - optimize_ratings: Flag to enable rating-based section selection
+        - after: Dict of course -> section code of a schedule to resume behind
+        
+        Raises:
+        - ValueError: after names a course or section this CSP does not have
+        """
+        schedule = dict(schedule or {})
+        self.search_stats = {'nodes_expanded': 0, 'conflicts': 0}
+        live = self.initial_live_domains(schedule)
+        if live is None:
+            return
+        
+        order = {var: self.value_order(var, optimize_ratings) for var in self.variables}
+        stats = self.search_stats
+        
+        def extend(live, resume):
+            stats['nodes_expanded'] += 1
             
-            # Sort by rating in descending order, fallback to original order
-            sections = sorted(
-                rated_sections, 
-                key=lambda x: x[1].get('rating', 0), 
-                reverse=True
-            )
+            # Check if all variables are assigned
+            if len(schedule) == len(self.variables):
+                # The schedule being resumed behind was already yielded
+                if not resume:
+                    yield schedule.copy()
+                return
             
-            # Add unrated sections at the end
-            unrated_sections = [
-                (section_code, section_data) 
-                for section_code, section_data in self.domains[var].items() 
-                if section_data.get('rating') is None
-            ]
-            sections.extend(unrated_sections)
-        
-        # Try each section of the course
-        for section_code, section_data in sections:
-            # Skip if no schedule or section already in schedule
-            if 'schedule' not in section_data or not section_data['schedule']:
-                continue
+            # Select an unassigned variable (course)
+            var = self.select_unassigned_variable(schedule, live)
+            section_codes = self.section_order[var]
             
-            # Check for conflicts
-            if self.check_for_conflicts(section_data, schedule):
-                continue
+            # Sections ordered before the resumed one were searched already
+            start = 0
+            if resume:
+                if var not in after or after[var] not in section_codes:
+                    raise ValueError(f"Cursor does not match the requested courses: {var}")
+                start = order[var].index(section_codes.index(after[var]))
             
-            # Create a copy of the current schedule to avoid modifying the original
-            new_schedule = schedule.copy()
+            for position in range(start, len(order[var])):
+                i = order[var][position]
+                # Skip sections pruned by the time constraints or forward checking
+                if not live[var] >> i & 1:
+                    continue
+                
+                # Prune the remaining domains, backtracking if any becomes empty
+                remaining = self.forward_check(live, var, i)
+                if remaining is None:
+                    stats['conflicts'] += 1
+                    continue
+                
+                # Assign the section, search below it, then undo the assignment
+                schedule[var] = {section_codes[i]: self.domains[var][section_codes[i]]}
+                yield from extend(remaining, resume and position == start)
+                del schedule[var]
+        
+        yield from extend(live, after is not None)
+    
+    def branch_and_bound(self, objective=None):
+        """
+        Find the conflict-free schedule with the highest objective score
+        
+        Returns:
+        - (schedule, score), or (None, None) if no valid schedule exists
+        """
+        results = self.solve_top_k(1, objective)
+        if not results:
+            return None, None
+        return results[0]
+    
+    def solve_top_k(self, k, objective=None):
+        """
+        Find the k conflict-free schedules with the highest objective score
+        
+        The score of a schedule is the sum of its section scores. The best
+        complete schedules are kept in a bounded min-heap, and a subtree is
+        pruned once the heap is full and the score so far plus the best live
+        section of every unassigned course cannot beat its k-th score. That
+        bound never underestimates, so the results are optimal.
+        
+        Args:
+        - k: Number of schedules to return
+        - objective: Field weights for section_score, defaults to DEFAULT_OBJECTIVE
+        
+        Returns:
+        - List of (schedule, score), best first
+        """
+        objective = objective or DEFAULT_OBJECTIVE
+        scores = self.compile_scores(objective)
+        self.search_stats = {'nodes_expanded': 0, 'nodes_pruned': 0, 'conflicts': 0}
+        # Heap entries are (score, sequence, schedule); the sequence breaks
+        # ties so schedules found earlier rank first and dicts are never compared
+        heap = []
+        
+        live = self.initial_live_domains({})
+        if k <= 0 or live is None:
+            return []
+        
+        schedule = {}
+        
+        def search(live, score):
+            self.search_stats['nodes_expanded'] += 1
             
-            # Assign the section
-            new_schedule[var] = {section_code: section_data}
+            if len(schedule) == len(self.variables):
+                entry = (score, -self.search_stats['nodes_expanded'], schedule.copy())
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+                return
             
-            # Recursive search
-            result = self.backtracking_search(new_schedule, optimize_ratings)
+            # Admissible bound: every unassigned course gets its best live section
+            if len(heap) == k:
+                bound = score + sum(
+                    max(scores[var][i] for i in self.iter_live_sections(bits))
+                    for var, bits in live.items()
+                )
+                if bound <= heap[0][0]:
+                    self.search_stats['nodes_pruned'] += 1
+                    return
             
-            if result is not None:
-                return result
+            var = self.select_unassigned_variable(schedule, live)
+            section_codes = self.section_order[var]
+            
+            # Try the best sections first so good incumbents are found early
+            candidates = sorted(self.iter_live_sections(live[var]), key=lambda i: scores[var][i], reverse=True)
+            for i in candidates:
+                remaining = self.forward_check(live, var, i)
+                if remaining is None:
+                    self.search_stats['conflicts'] += 1
+                    continue
+                schedule[var] = {section_codes[i]: self.domains[var][section_codes[i]]}
+                search(remaining, score + scores[var][i])
+                del schedule[var]
         
-        return None
+        search(live, 0)
+        return [(entry[2], entry[0]) for entry in sorted(heap, reverse=True)]
     
-    def select_unassigned_variable(self, schedule):
+    def select_unassigned_variable(self, schedule, live=None):
         """
         Select the most constrained unassigned variable
         
-        Prioritizes courses with fewer possible sections
+        Prioritizes courses with fewer possible sections, counting only the
+        sections that survive forward checking when live domains are given
         """
         unassigned = [var for var in self.variables if var not in schedule]
-        return min(unassigned, key=lambda var: len(self.domains[var]))
+        if live is None:
+            return min(unassigned, key=lambda var: len(self.domains[var]))
+        return min(unassigned, key=lambda var: live[var].bit_count())
     
-    def solve(self, optimize_ratings=False):
+    def solve(self, optimize_ratings=False, objective=None):
         """
         Solve the constraint satisfaction problem
         
-        Adds optional rating optimization to the search process
+        Without optimization the first valid schedule is returned. With
+        optimize_ratings or an explicit objective, branch-and-bound returns
+        the best-scoring schedule and records its score in final_score and
+        the node counts in search_stats.
         
         Args:
-        - optimize_ratings: Flag to enable rating-based section selection
+        - optimize_ratings: Flag to search for the best-rated schedule
+        - objective: Field weights for section_score, implies optimization
         
         Returns:
         - Optimized final schedule
         """
-        self.final_schedule = self.backtracking_search(optimize_ratings=optimize_ratings)
+        if optimize_ratings or objective is not None:
+            self.final_schedule, self.final_score = self.branch_and_bound(objective)
+        else:
+            self.final_schedule = self.backtracking_search()
         return self.final_schedule
 
-def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str = "", topic: str = None) -> Dict:
+# Scraping limits: concurrent course fetches and the time each course may
+# take once it starts, or wait for a worker (per-host limits live in http_client)
+MAX_SCRAPE_WORKERS = 8
+COURSE_TIMEOUT_SECONDS = 20
+
+# Lou's List semester code scraped for sections
+SEMESTER = "1258"
+
+# Requesting at least this many courses of one mnemonic fetches the whole
+# department page once instead of one search per course
+BULK_SCRAPE_MIN_COURSES = 2
+
+# Scraped course info is cached per (mnemonic, number, instructor, topic,
+# semester). Ratings change about once a semester; sections carry live
+# enrollment. Each half may be served stale for a while past its TTL while
+# it is refreshed in the background.
+COURSE_INFO_CACHE = TTLCache(
+    ttls={'ratings': 7 * 24 * 3600, 'sections': 10 * 60},
+    stale_windows={'ratings': 7 * 24 * 3600, 'sections': 5 * 60},
+    max_entries=512
+)
+
+# Leaf scrapes run here so the two sources of a course are fetched in parallel;
+# tasks on this pool never wait on other tasks on it
+SCRAPE_POOL = ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS * 2)
+# Per-course fetches of every request share this pool, so a scrape that
+# outlives its timeout holds one of a fixed set of threads instead of a new
+# one per request. They wait on SCRAPE_POOL tasks, so they cannot run there.
+COURSE_POOL = ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS)
+
+def louslist_url(mnemonic: str, number: str = "", instructor: str = "") -> str:
+    """
+    Lou's List search URL for a course, or for a whole department when
+    number is empty
+    """
+    params = {
+        "Type": "Search",
+        "Semester": SEMESTER,
+        "iMnemonic": mnemonic,
+        "iNumber": number,
+        "iInstructor": instructor,
+        "Submit": "Search for Classes"
+    }
+
+    # Remove empty parameters
+    params = {k: v for k, v in params.items() if v}
+    return f"https://louslist.org/pagex.php?{urlencode(params)}"
+
+def scrape_department(mnemonic: str, courses) -> int:
+    """
+    Fetch a department's Lou's List page once and cache each requested course
+
+    Every (number, topic) in courses is stored in COURSE_INFO_CACHE under the
+    key get_comprehensive_course_info reads, with topic-filtered sections for
+    courses like EGMT 1510. Courses missing from the page are left uncached
+    so they fall back to a per-course search.
+
+    Args:
+        mnemonic (str): Department mnemonic, e.g. 'CS'
+        courses (Iterable[Tuple[str, Optional[str]]]): (number, topic) pairs to cache
+
+    Returns:
+        int: Number of courses cached
+    """
+    try:
+        response = http_client.get(louslist_url(mnemonic))
+        response.raise_for_status()
+        page = parse_louslist_page(response.text)
+    except Exception as e:
+        print(f"Error fetching {mnemonic} from Lou's List: {e}")
+        return 0
+
+    cached = 0
+    for number, topic in courses:
+        course_data = page.get(f"{mnemonic} {number}")
+        if course_data is None:
+            continue
+        COURSE_INFO_CACHE.put((mnemonic, number, "", topic, SEMESTER), 'sections', filter_topic(course_data, topic))
+        cached += 1
+    return cached
+
+def parse_courseforum_page(html: str) -> Dict:
+    """Parses a thecourseforum course page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    course_info = {}
+    
+    # Get course title and number
+    title_div = soup.select_one("div.d-md-flex.align-items-baseline")
+    if title_div:
+        course_info['course_code'] = title_div.h1.text.strip()
+        course_info['course_name'] = title_div.h2.text.strip()
+    
+    # Get course description
+    desc_card = soup.select_one("div.card div.card-body")
+    if desc_card:
+        course_info['description'] = desc_card.select_one("p.card-text").text.strip()
+        
+        # Get prerequisites if they exist
+        prereq_div = desc_card.find('div', text=lambda t: t and 'Pre-Requisite(s):' in t)
+        if prereq_div:
+            course_info['prerequisites'] = prereq_div.text.replace('Pre-Requisite(s):', '').strip()
+    
+    # Get instructor information
+    instructors = []
+    instructor_cards = soup.select("div.rating-card")
+    
+    for card in instructor_cards:
+        instructor = {}
+        instructor['name'] = card.select_one("#title").text.strip()
+        for param in ['gpa', 'rating', 'difficulty', 'times']:
+            try: # Some instructors may not have a these fields
+                instructor[param] = float(card.select_one(f"#{param}").text.strip())
+            except:
+                instructor[param] = "N/A"
+        instructor['last_taught'] = card.select_one("#recency").text.strip()
+        instructors.append(instructor)
+        
+    course_info['instructors'] = instructors
+    return course_info
+
+def scrape_courseforum(mnemonic: str, number: str) -> Dict:
+    """Scrapes course information from thecourseforum"""
+    url = f"https://thecourseforum.com/course/{mnemonic}/{number}/"
+    
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()
+        return parse_courseforum_page(response.text)
+        
+    except Exception as e:
+        print(f"Error fetching data from thecourseforum: {e}")
+        return None
+
+def scrape_louslist(mnemonic: str, number: str, instructor: str = "", topic_name: Optional[str] = None) -> Dict:
+    """Scrapes course information from Lou's List, optionally filtering by topic name."""
+    try:
+        url = louslist_url(mnemonic, number, instructor)
+        response = http_client.get(url)
+        response.raise_for_status()
+
+        courses_dict = parse_louslist_page(response.text, topic_name)
+        return courses_dict.get(f"{mnemonic} {number}")
+
+    except Exception as e:
+        print(f"Error fetching data from Lou's List: {e}")
+        return None
+
+def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str = "", topic: str = None,
+                                  catalog: Optional[Catalog] = None, offline: bool = False) -> Dict:
     """
     Fetches and combines course information from both thecourseforum and louslist.
     
+    Scraped results are served from COURSE_INFO_CACHE when fresh enough and
+    are shared between requests, so callers must not modify them.
+    
     Args:
         mnemonic (str): Course mnemonic (e.g., 'CS', 'APMA')
         number (str): Course number (e.g., '1110', '3080')
         instructor (str, optional): Instructor name to filter by
+        topic (str, optional): Topic to filter sections by (e.g. for EGMT courses)
+        catalog (Catalog, optional): Offline section index used instead of Lou's List
+        offline (bool, optional): Never scrape; only the catalog and cached data are used
         
     Returns:
         Dict containing combined course information from both sources
     """
     
-    def scrape_courseforum(mnemonic: str, number: str) -> Dict:
-        """Scrapes course information from thecourseforum"""
-        url = f"https://thecourseforum.com/course/{mnemonic}/{number}/"
-        
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            course_info = {}
-            
-            # Get course title and number
-            title_div = soup.select_one("div.d-md-flex.align-items-baseline")
-            if title_div:
-                course_info['course_code'] = title_div.h1.text.strip()
-                course_info['course_name'] = title_div.h2.text.strip()
-            
-            # Get course description
-            desc_card = soup.select_one("div.card div.card-body")
-            if desc_card:
-                course_info['description'] = desc_card.select_one("p.card-text").text.strip()
-                
-                # Get prerequisites if they exist
-                prereq_div = desc_card.find('div', text=lambda t: t and 'Pre-Requisite(s):' in t)
-                if prereq_div:
-                    course_info['prerequisites'] = prereq_div.text.replace('Pre-Requisite(s):', '').strip()
-            
-            # Get instructor information
-            instructors = []
-            instructor_cards = soup.select("div.rating-card")
-            
-            for card in instructor_cards:
-                instructor = {}
-                instructor['name'] = card.select_one("#title").text.strip()
-                for param in ['gpa', 'rating', 'difficulty', 'times']:
-                    try: # Some instructors may not have a these fields
-                        instructor[param] = float(card.select_one(f"#{param}").text.strip())
-                    except:
-                        instructor[param] = "N/A"
-                instructor['last_taught'] = card.select_one("#recency").text.strip()
-                instructors.append(instructor)
-                
-            course_info['instructors'] = instructors
-            return course_info
-            
-        except Exception as e:
-            print(f"Error fetching data from thecourseforum: {e}")
-            return None
-
-
-    def scrape_louslist(mnemonic: str, number: str, instructor: str = "", topic_name: Optional[str] = None) -> Dict:
-        """Scrapes course information from Lou's List, optionally filtering by topic name."""
-        try:
-            base_url = "https://louslist.org/pagex.php"
-
-            params = {
-                "Type": "Search",
-                "Semester": "1258",
-                "iMnemonic": mnemonic,
-                "iNumber": number,
-                "iInstructor": instructor,
-                "Submit": "Search for Classes"
-            }
-
-            # Remove empty parameters
-            params = {k: v for k, v in params.items() if v}
-            url = f"{base_url}?{urlencode(params)}"
-
-            response = requests.get(url)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            courses_dict = {}
-            current_course_number = None
-            last_section_num = None
-            current_topic = None  # Track the current topic
-
-            for row in soup.find_all('tr'):
-                # Check for course number
-                course_num_cell = row.find('td', class_='CourseNum')
-                if course_num_cell:
-                    course_number = course_num_cell.text.strip()
-                    course_name_cell = row.find('td', class_='CourseName')
-                    course_name = course_name_cell.text.strip() if course_name_cell else None
-
-                    if course_number not in courses_dict:
-                        courses_dict[course_number] = {
-                            'course_info': {
-                                'number': course_number,
-                                'name': course_name,
-                            },
-                            'sections': []
-                        }
-                    current_course_number = course_number
-                    continue
-
-                # Check for topic rows - using the full class structure
-                row_classes = row.get('class', [])
-                if row_classes and ('SectionTopicOdd' in row_classes or 'SectionTopicEven' in row_classes):
-                    # Find the td with colspan="8" which contains the topic
-                    topic_cell = row.find('td', attrs={'colspan': '8'})
-                    if topic_cell and topic_cell.text.strip():
-                        current_topic = topic_cell.text.strip()
-                    continue
+    def load_from_catalog() -> Optional[Dict]:
+        """Looks the sections up in the offline catalog instead of Lou's List"""
+        catalog_data = catalog.louslist_data(mnemonic, number, topic)
+        if catalog_data and instructor:
+            catalog_data['sections'] = [
+                section for section in catalog_data['sections']
+                if instructor.lower() in section['instructor'].lower()
+            ]
+        return catalog_data
 
-                # Check for section rows
-                cells = row.find_all('td')
-                if len(cells) == 8 and cells[4].find('a') and current_course_number:
-                    # Only process section if topic matches or no topic filter specified
-                    if topic_name is None or (current_topic and topic_name.lower() in current_topic.lower()):
-                        enrollment = cells[4].text.strip().split('/')
-                        enrollment_current = int(enrollment[0]) if len(enrollment) > 0 else None
-                        enrollment_max = int(enrollment[1]) if len(enrollment) > 1 else None
-
-                        instructor_span = cells[5].find('span', onclick=lambda x: x and 'InstructorTip' in x)
-                        instructor = instructor_span.text.strip() if instructor_span else cells[5].text.strip()
-
-                        section_data = {
-                            'section_number': cells[1].text.strip(),
-                            'type': cells[2].text.strip(),
-                            'status': cells[3].text.strip(),
-                            'enrollment_current': enrollment_current,
-                            'enrollment_max': enrollment_max,
-                            'instructor': instructor,
-                            'schedule': cells[6].text.strip(),
-                            'location': cells[7].text.strip(),
-                            'topic': current_topic
-                        }
-                        courses_dict[current_course_number]['sections'].append(section_data)
-                        last_section_num = cells[1].text.strip()
-
-                elif len(cells) == 4 and current_course_number and last_section_num:
-                    # Handle additional rows for sections, only if they belong to a matching topic
-                    if topic_name is None or (current_topic and topic_name.lower() in current_topic.lower()):
-                        section_data = {
-                            'section_number': last_section_num,
-                            'instructor': cells[1].text.strip(),
-                            'schedule': cells[2].text.strip(),
-                            'location': cells[3].text.strip(),
-                            'topic': current_topic
-                        }
-                        courses_dict[current_course_number]['sections'].append(section_data)
-
-            return courses_dict.get(f"{mnemonic} {number}")
+    def load_ratings() -> Optional[Dict]:
+        """Scrapes thecourseforum and indexes the ratings once for every request that reads them"""
+        courseforum_data = scrape_courseforum(mnemonic, number)
+        if courseforum_data is not None:
+            courseforum_data['instructor_stats'] = ratings_index({
+                instructor['name']: instructor for instructor in courseforum_data.get('instructors', [])
+            })
+        return courseforum_data
 
-        except Exception as e:
-            print(f"Error fetching data from Lou's List: {e}")
-            return None
-
-    # Get data from both sources
-    louslist_data = scrape_louslist(mnemonic, number, instructor, topic_name=topic)
-    courseforum_data = scrape_courseforum(mnemonic, number)
+    # Get data from both sources concurrently, through the course info cache
+    cache_key = (mnemonic, number, instructor, topic, SEMESTER)
+    courseforum_future = SCRAPE_POOL.submit(
+        COURSE_INFO_CACHE.get, cache_key, 'ratings',
+        (lambda: None) if offline else load_ratings
+    )
+    louslist_data = load_from_catalog() if catalog is not None else None
+    if louslist_data is None:
+        louslist_data = COURSE_INFO_CACHE.get(
+            cache_key, 'sections',
+            (lambda: None) if offline else (lambda: scrape_louslist(mnemonic, number, instructor, topic_name=topic))
+        )
+    courseforum_data = courseforum_future.result()
 
     # Combine the data
     combined_data = {
@@ -447,13 +793,17 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
         'description': None,
         'prerequisites': None,
         'course_ratings': {},
+        'instructor_stats': {},
         'current_sections': []
     }
 
     # Add courseforum data
     if courseforum_data and louslist_data:
-        # Get unique instructors from louslist sections
-        louslist_instructors = {section['instructor'] for section in louslist_data['sections']}
+        # Index the instructors of the louslist sections, so thecourseforum's
+        # spelling of each resolves to the one the sections use
+        louslist_instructors = InstructorIndex()
+        for section in louslist_data['sections']:
+            louslist_instructors.add_cell(section['instructor'])
 
         combined_data.update({
             'course_code': courseforum_data.get('course_code'),
@@ -468,8 +818,9 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
                     'last_taught': instructor['last_taught']
                 }
                 for instructor in courseforum_data.get('instructors', [])
-                if instructor['name'] in louslist_instructors
-            }
+                if louslist_instructors.resolve(instructor['name'])
+            },
+            'instructor_stats': resolve_stats(louslist_instructors, courseforum_data.get('instructor_stats', {}))
         })
 
     # Add louslist data
@@ -525,22 +876,262 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
     # Return formatted output
     return format_output(combined_data), combined_data
 
-def find_stats_for_section(instructor, course_data):
+def fetch_course_data(input_classes, catalog=None, offline=False):
     """
-    Find the rating for a given instructor in the course data
+    Scrape every requested course concurrently
+    
+    Courses are fetched on COURSE_POOL and assembled in input order. A
+    course that raises, has no sections, waits COURSE_TIMEOUT_SECONDS for a
+    worker or is still running COURSE_TIMEOUT_SECONDS after it started is
+    reported as failed instead of failing the whole request.
+    
+    When BULK_SCRAPE_MIN_COURSES or more courses of one mnemonic need Lou's
+    List, the department page is scraped once into the course info cache
+    and those courses wait for it instead of searching one by one.
+    
+    Args:
+        input_classes (List[str]): Courses like 'CS 2100' or 'EGMT 1510 | Topic'
+        catalog (Catalog, optional): Offline section index used instead of Lou's List
+        offline (bool, optional): Never scrape; only the catalog and cached data are used
+    
+    Returns:
+        Tuple of (data, failures): course data by course, and failure reasons by course
     """
-    for course, course_info in course_data.items():
-        for instructor_name, info in course_info.get('course_ratings', []).items():
-            if instructor_name == instructor:
-                info = [info['rating'], info['difficulty'], info['gpa']]
-                for i, entry in enumerate(info):
-                    if entry == "N/A":
-                        info[i] = None
-                    else:
-                        info[i] = round(float(entry), 2)
-                return info 
-                
-    return None  # Default stats if not founds
+    def parse_course(course):
+        mnemonic, number = course.split()[:2]
+        topic = course.split("|")[1].strip() if "|" in course else None
+        return mnemonic, number, topic
+    
+    def fetch(course):
+        start_times[course] = time.monotonic()
+        started[course].set()
+        mnemonic, number, topic = parse_course(course)
+        department_future = department_futures.get(mnemonic)
+        if department_future is not None:
+            department_future.result()
+        _, course_data = get_comprehensive_course_info(
+            mnemonic, number, topic=topic, catalog=catalog, offline=offline
+        )
+        return course_data
+    
+    courses = list(dict.fromkeys(input_classes))
+    if not courses:
+        return {}, {}
+    
+    # Group the courses that would be searched on Lou's List by mnemonic
+    departments = {}
+    if not offline:
+        for course in courses:
+            mnemonic, number, topic = parse_course(course)
+            if catalog is not None and catalog.louslist_data(mnemonic, number) is not None:
+                continue
+            if COURSE_INFO_CACHE.cached((mnemonic, number, "", topic, SEMESTER), 'sections'):
+                continue
+            departments.setdefault(mnemonic, []).append((number, topic))
+    department_futures = {
+        mnemonic: SCRAPE_POOL.submit(scrape_department, mnemonic, department_courses)
+        for mnemonic, department_courses in departments.items()
+        if len(department_courses) >= BULK_SCRAPE_MIN_COURSES
+    }
+    
+    started = {course: Event() for course in courses}
+    start_times = {}
+    futures = {course: COURSE_POOL.submit(fetch, course) for course in courses}
+    
+    data = {}
+    failures = {}
+    for course, future in futures.items():
+        # Each course's timeout runs from when a worker picks it up
+        if not started[course].wait(COURSE_TIMEOUT_SECONDS) and future.cancel():
+            failures[course] = f"No scrape worker free after {COURSE_TIMEOUT_SECONDS}s"
+            continue
+        deadline = start_times.get(course, time.monotonic()) + COURSE_TIMEOUT_SECONDS
+        try:
+            course_data = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeout:
+            failures[course] = f"Timed out after {COURSE_TIMEOUT_SECONDS}s"
+            continue
+        except Exception as e:
+            failures[course] = str(e)
+            continue
+        if not course_data['current_sections']:
+            failures[course] = "No sections found"
+            continue
+        data[course] = course_data
+    
+    return data, failures
+
+def refresh_catalog(path: str) -> CatalogDiff:
+    """
+    Apply a newer export of the semester to the loaded catalog
+
+    A catalog loaded from CSV is copied, only the sections that changed
+    are applied to the copy, and the copy is swapped in. A snapshot is
+    read-only: it is diffed on the columns it keeps and, when anything
+    changed, rebuilt from the export and swapped in. Either way readers
+    never see a half-applied catalog, and the prerequisite graph and
+    credits derived from it are rebuilt for the new one. With no catalog loaded the export becomes the catalog.
+    Either way only the changed courses' cached Lou's List sections are
+    dropped from COURSE_INFO_CACHE.
+
+    Args:
+        path (str): Lou's List CSV export to refresh from
+
+    Returns:
+        CatalogDiff: The sections that changed
+    """
+    catalog = get_catalog()
+    new_rows = read_export(path)
+    if isinstance(catalog, Catalog):
+        diff = diff_exports(catalog.rows, new_rows)
+        updated = catalog.copy()
+        apply_to_catalog(updated, diff)
+        if updated.set_descriptions(new_rows.values()) or diff:
+            # Prerequisites and credits are rebuilt for the new catalog on next use
+            set_catalog(updated)
+    elif isinstance(catalog, SnapshotCatalog):
+        diff = diff_exports(catalog.rows(), {
+            class_number: snapshot_row(row) for class_number, row in new_rows.items()
+        })
+        if diff:
+            set_catalog(rebuild_snapshot(path))
+            # Readers still holding the old snapshot keep their mapping
+            if catalog.temporary:
+                os.unlink(catalog.path)
+    else:
+        diff = diff_exports({}, new_rows)
+        set_catalog(load_catalog_csv(path))
+    invalidate_course_cache(COURSE_INFO_CACHE, diff)
+    return diff
+
+def build_domains(data):
+    """
+    CSP variables and domains from course data as fetch_course_data returns it
+
+    Each course's sections are keyed by section number, with continuation
+    rows' meetings added to the section they follow, and the instructor's
+    ratings attached where thecourseforum has them. Catalog sections carry
+    a precompiled meeting_mask; those are collected so the CSP does not
+    parse their meetings again.
+
+    Returns:
+        Tuple of (variables, domains, section_masks) as passed to CSP, where
+        section_masks holds the sections whose every row had a meeting_mask
+    """
+    variables = []
+    domains = {}
+    section_masks = {}
+    unmasked = set()
+    stats_index = build_stats_index(data)
+    for course, course_data in data.items():
+        variables.append(course)
+        # Initialize the domain for the course
+        if course not in domains:
+            domains[course] = {}
+            section_masks[course] = {}
+        # Process each section
+        for section in course_data['current_sections']:
+            section_number = section['section_number']
+            # Split the schedule into meetings and filter out date ranges
+            schedules = split_meetings(section['schedule'])
+            if section.get('meeting_mask') is None:
+                unmasked.add((course, section_number))
+            else:
+                section_masks[course][section_number] = (
+                    section_masks[course].get(section_number, 0) | section['meeting_mask']
+                )
+            # Continuation rows only add meetings to the section they follow;
+            # the first row's instructor and stats stand
+            if section_number in domains[course]:
+                domains[course][section_number]["schedule"].extend(schedules)
+                continue
+            domains[course][section_number] = {"schedule": schedules}
+            # Add rating
+            instructor = section['instructor']
+            section_info = section_stats(stats_index, course, instructor)
+            if section_info:
+                domains[course][section_number]["rating"] = section_info[0]
+                domains[course][section_number]["difficulty"] = section_info[1]
+                domains[course][section_number]["gpa"] = section_info[2]
+                domains[course][section_number]["instructor"] = instructor
+                domains[course][section_number]["location"] = section['location']
+    for course, section_number in unmasked:
+        section_masks[course].pop(section_number, None)
+    return variables, domains, section_masks
+
+def timetable_oracle(catalog):
+    """
+    Feasibility oracle for DegreePlanner: whether a term's courses fit in
+    one weekly timetable of the catalog's sections
+
+    The catalog holds a single semester, so it stands in for every term
+    and the term is ignored (see DegreePlanner's term_independent).
+    Courses it does not list are not checked.
+    """
+    def feasible(term, courses):
+        data = {}
+        for course in sorted(courses):
+            mnemonic, number = course.split()
+            course_data = catalog.louslist_data(mnemonic, number)
+            if course_data and course_data['sections']:
+                data[course] = {'current_sections': course_data['sections']}
+        if not data:
+            return True
+        variables, domains, section_masks = build_domains(data)
+        return CSP(variables, domains, section_masks=section_masks).solve() is not None
+    return feasible
+
+def degree_planner(max_credits=DEFAULT_MAX_CREDITS, timetable=True) -> DegreePlanner:
+    """
+    DegreePlanner over the catalog's prerequisites and credits, checking
+    each semester against the catalog timetable unless timetable is False
+    """
+    catalog = get_catalog() if timetable else None
+    return DegreePlanner(
+        get_prerequisite_graph() or PrerequisiteGraph(),
+        get_units(),
+        timetable_oracle(catalog) if catalog is not None else None,
+        max_credits=max_credits,
+        term_independent=True
+    )
+
+def parse_objective(value) -> Optional[Dict[str, float]]:
+    """
+    Objective weights from a request body, or None when none were given
+
+    Raises:
+        ValueError: A field other than OBJECTIVE_FIELDS, or a weight that is not a number
+    """
+    if not value:
+        return None
+    if not isinstance(value, dict):
+        raise ValueError("objective must map fields to weights")
+    unknown = set(value) - set(OBJECTIVE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown objective fields: {', '.join(sorted(unknown))}")
+    return {field: float(weight) for field, weight in value.items()}
+
+def encode_cursor(schedule) -> str:
+    """
+    Opaque page cursor naming the section of every course in a schedule
+    """
+    sections = {course: next(iter(assigned)) for course, assigned in schedule.items()}
+    return base64.urlsafe_b64encode(json.dumps(sections, sort_keys=True).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Dict[str, str]:
+    """
+    Course -> section code of the schedule a cursor was made from
+
+    Raises:
+        ValueError: The cursor was not made by encode_cursor
+    """
+    try:
+        sections = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(sections, dict):
+        raise ValueError("Invalid cursor")
+    return sections
 
 def calculate_solution_stats(solution):
     """
@@ -553,7 +1144,7 @@ def calculate_solution_stats(solution):
     num_gpas = 0
     total_gpa = 0
     
-    for course, sections in solution.items():
+    for course, sections in (solution or {}).items():
         for section, section_data in sections.items():
             # Check if 'rating' exists and is not None
             if section_data.get('rating') is not None:
@@ -585,11 +1176,29 @@ def csp_build_schedule(req: https_fn.Request) -> https_fn.Response:
     1. input_classes (List[str]): List of classes to build a schedule for. 
         Should be in the format of 'CS 1110', 'APMA 3080', etc. 
     2. time_constraints (Optional[List[str]]): List of time constraints in the format of 'HH:MM AM/PM'.
+    3. optimize_ratings (Optional[bool]): Return the best-rated schedule instead of the first valid one.
+    4. top_k (Optional[int]): Also return the k best-rated schedules under 'alternatives'.
+    5. objective (Optional[Dict[str, float]]): Weights of 'rating', 'difficulty' and 'gpa'
+        to rank schedules by instead of the rating alone, for both optimize_ratings and top_k.
+    6. page_size (Optional[int]), cursor (Optional[str]): Return a page of valid schedules
+        in search order under 'schedules', with 'next_cursor' to pass back for the next
+        page. The cursor names the last schedule of the page, and the search resumes
+        right behind it instead of enumerating the earlier pages again.
+    7. trace (Optional[bool]): Emit one structured log record with solver counters and
+        timing spans for this request.
+    8. fresh_enrollment (Optional[bool]): Scrape sections from Lou's List instead of the
+        offline catalog.
+    9. offline (Optional[bool]): Never scrape; use only the catalog and cached ratings.
+    10. completed_courses (Optional[List[str]]): Courses already taken; requested courses
+        whose prerequisites these do not meet are left out of the schedule. Prerequisites
+        come from the catalog, and from thecourseforum for courses the catalog states none for.
+    
+    Courses that could not be fetched or whose prerequisites are missing are
+    left out of the schedule and listed with the reason under 'failed_courses'.
         """
-    print("Request received")
+    trace = RequestTrace('csp_build_schedule')
     try:
         if req.method == 'OPTIONS':
-            print("Options request")
             return https_fn.Response(
                 status=204,
                 headers={
@@ -602,76 +1211,103 @@ def csp_build_schedule(req: https_fn.Request) -> https_fn.Response:
 
         if not req.get_json():
             raise ValueError("Request body is required")
-        
-        print(f"Request JSON: {req.get_json()}")
     
         request_json = req.get_json()
+        trace.enabled = bool(request_json.get('trace', False))
         if 'input_classes' not in request_json:
             raise ValueError("Variables and domains are required")
+        trace.set(input_classes=request_json.get('input_classes'))
+        
+        # Sections come from the offline catalog when one is available, unless
+        # the request asks for live enrollment from Lou's List
+        offline = bool(request_json.get('offline', False))
+        catalog = None
+        if not request_json.get('fresh_enrollment', False):
+            with trace.span('load_catalog'):
+                catalog = get_catalog()
         
         # Get the course info for each input class
-        data = {}
-        for course in request_json.get('input_classes'):
-            mnemonic, number = course.split()[:2]
-            if "|" in course:
-                title = course.split("|")[1].strip()
-                _, data[course] = get_comprehensive_course_info(mnemonic, number, topic=title)
-            else:
-                _, data[course] = get_comprehensive_course_info(mnemonic, number)
+        with trace.span('scrape'):
+            data, failed_courses = fetch_course_data(request_json.get('input_classes'), catalog, offline)
+        
+        # Drop the courses the student cannot take yet before building domains
+        completed_courses = request_json.get('completed_courses')
+        if completed_courses is not None:
+            with trace.span('prerequisites'):
+                # thecourseforum's text covers courses the catalog states no
+                # requirement for, in a copy private to this request
+                graph = (get_prerequisite_graph() or PrerequisiteGraph()).supplemented({
+                    course: course_data['prerequisites']
+                    for course, course_data in data.items() if course_data.get('prerequisites')
+                })
+                for course, missing in graph.prune(data, completed_courses).items():
+                    failed_courses[course] = f"Missing prerequisites: {describe_missing(missing)}"
+                    del data[course]
+        trace.set(failed_courses=failed_courses)
         
         # Process the data into variables and domains
-        variables = []
-        domains = {}
-
-        for course, course_data in data.items():
-            variables.append(course)
-            # Initialize the domain for the course
-            if course not in domains:
-                domains[course] = {}
-            # Process each section
-            for section in course_data['current_sections']:
-                schedule = section['schedule']
-                section_number = section['section_number']
-                # Split the schedule and filter invalid entries
-                schedules = schedule.split(",")
-                schedules = [s.strip() for s in schedules if not s[0].isdigit()]
-                if section_number not in domains[course]:
-                    domains[course][section_number] = {}  # Ensure it's a dict, not a list
-                # Add schedule and rating
-                domains[course][section_number]["schedule"] = schedules
-                instructor = section['instructor']
-                section_info = find_stats_for_section(instructor, data)
-                if section_info:
-                    domains[course][section_number]["rating"] = section_info[0]
-                    domains[course][section_number]["difficulty"] = section_info[1]
-                    domains[course][section_number]["gpa"] = section_info[2]
-                    domains[course][section_number]["instructor"] = instructor
-                    domains[course][section_number]["location"] = section['location']
+        with trace.span('build_domains'):
+            variables, domains, section_masks = build_domains(data)
 
-        optimize_ratings = request_json.get('optimize_ratings', False)
-        time_constraints = request_json.get('time_constraints', None)
-        time_constraints_dt = {
-            day: tuple(dt.strptime(time, "%I:%M%p").time() 
-            for time in times) 
-            for day, times in time_constraints.items()
-        }
-        # Create the CSP instance
-        csp = CSP(variables, domains, time_constraints_dt)
+            time_constraints = request_json.get('time_constraints', None) or {}
+            time_constraints_dt = {
+                day: tuple(parse_time(time)
+                for time in times) 
+                for day, times in time_constraints.items()
+            }
+            # Create the CSP instance
+            csp = CSP(variables, domains, time_constraints_dt, section_masks)
 
-        # Solve and get the schedule
-        solution = csp.solve()
-        print(solution)
-        stats = calculate_solution_stats(solution)
-        print(f"\nNo optimization stats: {stats}")
+        optimize_ratings = request_json.get('optimize_ratings', False)
+        objective = parse_objective(request_json.get('objective'))
+        top_k = int(request_json.get('top_k', 0) or 0)
+        page_size = int(request_json.get('page_size', 0) or 0)
+        cursor = request_json.get('cursor') or None
 
+        # Solve and get the schedule, plus the best alternatives if requested
+        alternatives = []
+        page = []
+        next_cursor = None
+        with trace.span('solve'):
+            if page_size > 0:
+                # Fetch one extra schedule to know whether another page exists
+                after = decode_cursor(cursor) if cursor else None
+                page = list(itertools.islice(csp.iter_solutions(after=after), page_size + 1))
+                if len(page) > page_size:
+                    page = page[:page_size]
+                    next_cursor = encode_cursor(page[-1])
+                solution = page[0] if page else None
+            elif top_k > 0:
+                ranked = csp.solve_top_k(top_k, objective)
+                solution = ranked[0][0] if ranked else None
+                alternatives = [
+                    {'schedule': schedule, 'score': score, 'stats': calculate_solution_stats(schedule)}
+                    for schedule, score in ranked
+                ]
+            else:
+                solution = csp.solve(optimize_ratings=optimize_ratings, objective=objective)
 
         stats = calculate_solution_stats(solution)
-        print(f"Solution Stats: {stats}")
+        trace.add_counters(csp.search_stats)
+        trace.set(
+            found_schedule=solution is not None,
+            stats=stats,
+            parse_cache=parse_cache_info(),
+            course_info_cache=COURSE_INFO_CACHE.stats()
+        )
+        trace.emit()
 
         response_data = {
             'schedule': solution,
-            'stats': stats
+            'stats': stats,
+            'search_stats': csp.search_stats,
+            'failed_courses': failed_courses
         }
+        if page_size > 0:
+            response_data['schedules'] = page
+            response_data['next_cursor'] = next_cursor
+        elif top_k > 0:
+            response_data['alternatives'] = alternatives
         
         return https_fn.Response(
             json.dumps(response_data),
@@ -679,8 +1315,98 @@ def csp_build_schedule(req: https_fn.Request) -> https_fn.Response:
         )
 
     except Exception as e:
+        trace.set(error=str(e))
+        trace.emit()
         return https_fn.Response(
             json.dumps({'error': str(e)}),
             status=500,
             headers={'Access-Control-Allow-Origin': '*'}
         )
+
+@https_fn.on_request()
+def plan_degree(req: https_fn.Request) -> https_fn.Response:
+    """HTTP Cloud Function that spreads required courses over semesters
+
+    Args:
+    1. required_courses (List[str]): Courses the plan must contain, like 'CS 2100'.
+    2. completed_courses (Optional[List[str]]): Courses already taken.
+    3. semesters (Optional[int]): Most semesters the plan may take (default 8).
+    4. max_credits (Optional[float]): Credit cap per semester (default 17).
+    5. start_term (Optional[str]): 'Fall' or 'Spring', the term of the first semester.
+    6. timetable (Optional[bool]): Check that each semester's courses fit one
+        weekly timetable of the catalog's sections (default true).
+
+    Returns 'plan' as a list of {'semester', 'term', 'courses', 'credits'} with
+    the fewest semesters, or null when none fits.
+    """
+    try:
+        if req.method == 'OPTIONS':
+            return https_fn.Response(
+                status=204,
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type',
+                    'Access-Control-Max-Age': '3600'
+                }
+            )
+
+        request_json = req.get_json()
+        if not request_json or 'required_courses' not in request_json:
+            raise ValueError("required_courses is required")
+
+        planner = degree_planner(
+            float(request_json.get('max_credits', DEFAULT_MAX_CREDITS)),
+            timetable=bool(request_json.get('timetable', True))
+        )
+        plan = planner.plan(
+            request_json['required_courses'],
+            request_json.get('completed_courses') or [],
+            int(request_json.get('semesters', 8)),
+            request_json.get('start_term', 'Fall')
+        )
+        return https_fn.Response(
+            json.dumps({'plan': plan, 'search_stats': planner.stats}),
+            headers={'Access-Control-Allow-Origin': '*'}
+        )
+
+    except Exception as e:
+        return https_fn.Response(
+            json.dumps({'error': str(e)}),
+            status=500,
+            headers={'Access-Control-Allow-Origin': '*'}
+        )
+
+@https_fn.on_request()
+def refresh_catalog_export(req: https_fn.Request) -> https_fn.Response:
+    """HTTP Cloud Function that applies a newer Lou's List CSV export to the catalog
+
+    The export is the request body. The request must carry
+    'Authorization: Bearer <CATALOG_REFRESH_TOKEN>'; without that variable
+    set, refreshing is disabled. Only the instance serving the request is
+    refreshed; other instances keep their catalog until they restart with
+    the snapshot built at the next deploy.
+
+    Returns the diff summary: counts of added, removed, schedule-changed and
+    enrollment-changed sections and of affected courses.
+    """
+    try:
+        token = os.environ.get('CATALOG_REFRESH_TOKEN')
+        authorization = req.headers.get('Authorization', '')
+        if not token or not hmac.compare_digest(authorization, f"Bearer {token}"):
+            return https_fn.Response(json.dumps({'error': 'Forbidden'}), status=403)
+
+        export = req.get_data()
+        if not export:
+            raise ValueError("The CSV export is required as the request body")
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(export)
+            diff = refresh_catalog(path)
+        finally:
+            os.unlink(path)
+        return https_fn.Response(json.dumps(diff.summary()))
+
+    except Exception as e:
+        return https_fn.Response(json.dumps({'error': str(e)}), status=500)
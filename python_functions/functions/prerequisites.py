@@ -0,0 +1,542 @@
+"""
+Prerequisite graph compiled from catalog prerequisite text
+
+Course descriptions in the Lou's List export and thecourseforum pages state
+prerequisites in prose ("Prerequisite: CHEM 1421, 1621, or 1811",
+"MAE 2320 and APMA 2130; CS 3140 with a grade of C- or higher", "Students
+must have completed APMA 2120"). Each is
+parsed into an AND/OR expression over course codes and compiled to
+conjunctive normal form: a list of clauses, each a bitmask of courses of
+which at least one must be completed. Checking a course is then one AND
+per clause against a bitmask of completed courses.
+
+Requirements that cannot be checked from a transcript (instructor
+permission, class standing, a major, "or equivalent") are treated as
+satisfied, so an alternative like "CS 2100 or instructor permission" never
+blocks a course.
+
+The process-wide graph comes from the loaded catalog: a snapshot carries
+every course's requirements already compiled to clauses (catalog_snapshot
+compiles them from the export's descriptions at deploy), and a catalog
+loaded from CSV supplies the descriptions themselves. thecourseforum's
+prerequisite text, scraped with each requested course, fills in courses
+the catalog states no checkable requirement for; the catalog's text is the
+registrar's for the semester being scheduled, so it is not overridden.
+"""
+import re
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from catalog import get_catalog
+
+# An expression is True (no requirement), a course code like 'CS 2100', or
+# ('and' | 'or', tuple of expressions)
+Expression = Union[bool, str, tuple]
+
+# "Prerequisite:", or the completion wording some descriptions use instead:
+# "Students must have completed ...", or a sentence opening "Completed CS 2100"
+LABEL_RE = re.compile(
+    r'\bpre-?req(?:uisites?|uiste|s)?(?:\(s\))?\s*:?\s*'
+    r'|\bmust have (?:successfully )?completed\s*'
+    r'|(?:^|(?<=[.!?]\s))completed\s+(?=[A-Z]{2,4}\s*\d{4})',
+    re.IGNORECASE
+)
+# The requirement ends at the first sentence break or corequisite note
+END_RE = re.compile(r'\.(?:\s|$)|co-?requisite', re.IGNORECASE)
+GRADE_RE = re.compile(
+    r'\bwith (?:a |an )?(?:minimum )?(?:grade (?:of )?|score (?:of )?)?[A-F][+-]?(?: or (?:higher|better|above))?'
+    r'|\b[A-F][+-]? or (?:higher|better|above)\b',
+    re.IGNORECASE
+)
+COURSE_RE = re.compile(r'\b([A-Z]{2,4})\s*(\d{4})\b')
+TOKEN_RE = re.compile(
+    r'(?P<course>\b[A-Z]{2,4}\s*\d{4}\b)|(?P<number>\b\d{4}\b)|(?P<op>(?i:\band\b|\bor\b)|&)'
+    r'|(?P<punct>[,;()])|(?P<word>[^\s,;()/]+|/)'
+)
+
+
+def course_code(course: str) -> str:
+    """'CS2100', 'cs 2100' or 'EGMT 1510 | Topic' -> 'CS 2100'"""
+    match = COURSE_RE.search(course.upper())
+    return f"{match.group(1)} {match.group(2)}" if match else course.strip()
+
+
+def requirement_text(text: str) -> str:
+    """
+    The prerequisite sentence of a description, or the text itself when it
+    has no "Prerequisite:" label (as thecourseforum returns it)
+    """
+    label = LABEL_RE.search(text)
+    if label:
+        text = text[label.end():]
+    end = END_RE.search(text)
+    return text[:end.start()] if end else text
+
+
+def tokenize(text: str, mnemonic: Optional[str] = None) -> List[tuple]:
+    """
+    (kind, value) tokens of requirement text. Bare course numbers take the
+    mnemonic named before them: "CHEM 1421, 1621" names CHEM 1621.
+    """
+    tokens = []
+    for match in TOKEN_RE.finditer(text):
+        kind, value = match.lastgroup, match.group()
+        if kind == 'course':
+            mnemonic, value = course_code(value).split()
+            value = f"{mnemonic} {value}"
+        elif kind == 'number':
+            kind, value = ('course', f"{mnemonic} {value}") if mnemonic else ('word', value)
+        elif kind == 'op':
+            value = 'and' if value == '&' else value.lower()
+        tokens.append((kind, value))
+    return tokens
+
+
+def simplify(op: str, children: Iterable[Expression]) -> Expression:
+    flat = []
+    for child in children:
+        if child is True:
+            if op == 'or':
+                return True
+            continue
+        if isinstance(child, tuple) and child[0] == op:
+            flat.extend(grandchild for grandchild in child[1] if grandchild not in flat)
+        elif child not in flat:
+            flat.append(child)
+    if not flat:
+        return True
+    return flat[0] if len(flat) == 1 else (op, tuple(flat))
+
+
+class RequirementParser:
+    """
+    Recursive descent over requirement tokens
+
+        requirement := clause (';' clause)*          all clauses
+        clause      := segment (',' [op] segment)*   see clause()
+        segment     := term ('or' term)*
+        term        := primary ('and' primary)*
+        primary     := '(' clause ')' | words [ '(' 'or' clause ')' ]
+
+    A run of words is its courses, any of which will do ("CS 2100/2130"),
+    or True when it names none ("instructor permission").
+    """
+
+    def __init__(self, tokens: List[tuple]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> tuple:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else ('end', None)
+
+    def requirement(self) -> Expression:
+        clauses = [self.clause()]
+        while self.peek()[0] != 'end':
+            self.pos += 1  # ';', or a stray ')'
+            clauses.append(self.clause())
+        return simplify('and', clauses)
+
+    def first_op(self) -> Optional[str]:
+        depth = 0
+        for kind, value in self.tokens[self.pos:]:
+            if value == '(':
+                depth += 1
+            elif value == ')':
+                if depth == 0:
+                    return None
+                depth -= 1
+            elif depth == 0 and value in (',', ';'):
+                return None
+            elif depth == 0 and kind == 'op':
+                return value
+        return None
+
+    def clause(self) -> Expression:
+        """
+        A comma list decided by its last conjunction: "A, B, or C" is any
+        of them, "A, B, and C" all of them, and so is "A, B or C"
+        """
+        segments = []
+        op = None
+        while True:
+            if self.peek()[0] == 'op':
+                op = self.peek()[1]
+                self.pos += 1
+            elif segments:
+                op = self.first_op() or op
+            segments.append(self.segment())
+            if self.peek()[1] != ',':
+                break
+            self.pos += 1
+        return simplify(op or 'and', segments)
+
+    def segment(self) -> Expression:
+        terms = [self.term()]
+        while self.peek() == ('op', 'or'):
+            self.pos += 1
+            terms.append(self.term())
+        return simplify('or', terms)
+
+    def term(self) -> Expression:
+        primaries = [self.primary()]
+        while self.peek() == ('op', 'and'):
+            self.pos += 1
+            primaries.append(self.primary())
+        return simplify('and', primaries)
+
+    def primary(self) -> Expression:
+        if self.peek()[1] == '(':
+            self.pos += 1
+            expression = self.clause()
+            if self.peek()[1] == ')':
+                self.pos += 1
+            return expression
+        courses = []
+        while self.peek()[0] in ('course', 'word'):
+            kind, value = self.peek()
+            if kind == 'course':
+                courses.append(value)
+            self.pos += 1
+        expression = simplify('or', courses) if courses else True
+        # "BIOL 2100 (or BME 2104)"
+        if self.peek()[1] == '(' and self.peek(1) == ('op', 'or'):
+            self.pos += 2
+            expression = simplify('or', [expression, self.clause()])
+            if self.peek()[1] == ')':
+                self.pos += 1
+        return expression
+
+
+def parse_prerequisites(text: Optional[str], mnemonic: Optional[str] = None) -> Expression:
+    """
+    Parse prerequisite prose into an expression
+
+    Args:
+        text (str): A course description or thecourseforum prerequisite text
+        mnemonic (str, optional): Mnemonic for bare course numbers before any is named
+
+    Returns:
+        True when nothing checkable is required, a course code, or a nested
+        ('and' | 'or', children) tuple
+    """
+    if not text:
+        return True
+    text = GRADE_RE.sub('', requirement_text(text))
+    return RequirementParser(tokenize(text, mnemonic)).requirement()
+
+
+def compile_requirement(course: str, requirement: Union[str, Expression, None]) -> Expression:
+    """
+    A course's requirement as an expression, from prerequisite text or an
+    expression, without the course itself
+    """
+    if requirement is None or isinstance(requirement, str):
+        requirement = parse_prerequisites(requirement, course.split()[0])
+    return True if requirement == course else without(requirement, course)
+
+
+def without(expression: Expression, course: str) -> Expression:
+    """
+    An expression with a course removed; catalog text sometimes lists a
+    course among its own alternatives ("or place out test for CS 2100")
+    """
+    if expression is True or isinstance(expression, str):
+        return expression
+    op, children = expression
+    children = [without(child, course) for child in children if child != course]
+    return simplify(op, children) if children else True
+
+
+def to_cnf(expression: Expression) -> List[frozenset]:
+    """
+    Clauses of course codes, at least one of each to be completed
+    """
+    if expression is True:
+        return []
+    if isinstance(expression, str):
+        return [frozenset([expression])]
+    op, children = expression
+    if op == 'and':
+        clauses = [clause for child in children for clause in to_cnf(child)]
+    else:
+        clauses = [frozenset()]
+        for child in children:
+            clauses = [clause | other for clause in clauses for other in to_cnf(child)]
+    # A clause implied by a smaller one adds nothing
+    clauses = sorted(set(clauses), key=lambda clause: (len(clause), sorted(clause)))
+    return [clause for i, clause in enumerate(clauses) if not any(other < clause for other in clauses[:i])]
+
+
+def iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def union(masks: Iterable[int]) -> int:
+    result = 0
+    for mask in masks:
+        result |= mask
+    return result
+
+
+class CompiledGraph:
+    """
+    Bitmask form of a set of requirements, never changed once built
+
+    Every course named anywhere gets a bit, so a set of completed courses is
+    one integer. Also precomputes, per course, the courses listing it as a
+    prerequisite, and two transitive closures: every course that may appear
+    below it, and the courses needed under every choice of alternatives.
+    """
+
+    def __init__(self, expressions: Dict[str, Expression]):
+        cnfs = {course: to_cnf(expression) for course, expression in expressions.items()}
+        courses = sorted(set(cnfs) | {c for cnf in cnfs.values() for clause in cnf for c in clause})
+        self.courses = courses
+        self.bits = {course: i for i, course in enumerate(courses)}
+        self.clauses = {
+            course: tuple(sum(1 << self.bits[c] for c in clause) for clause in cnf)
+            for course, cnf in cnfs.items() if cnf
+        }
+        self.dependents = {}
+        for course, masks in self.clauses.items():
+            for bit in iter_bits(union(masks)):
+                self.dependents[courses[bit]] = self.dependents.get(courses[bit], 0) | (1 << self.bits[course])
+        self.closure = {}
+        self.required = {}
+        for course in self.clauses:
+            self._close(course, set())
+
+    def _close(self, course: str, visiting: Set[str]):
+        # Depth-first over prerequisites; an edge back into the current path
+        # (a cycle in the catalog text) is ignored
+        if course in self.closure:
+            return self.closure[course], self.required[course]
+        masks = self.clauses.get(course, ())
+        closure = union(masks)
+        required = union(mask for mask in masks if mask & (mask - 1) == 0)
+        visiting.add(course)
+        for bit in iter_bits(closure):
+            prerequisite = self.courses[bit]
+            if prerequisite in visiting:
+                continue
+            below, below_required = self._close(prerequisite, visiting)
+            closure |= below
+            if required >> bit & 1:
+                required |= below_required
+        visiting.discard(course)
+        self.closure[course] = closure
+        self.required[course] = required
+        return closure, required
+
+
+class PrerequisiteGraph:
+    """
+    Courses and the requirements between them, compiled to bitmasks
+
+    add() records requirements; the first query after a change compiles
+    them into a CompiledGraph, which replaces the previous one in a single
+    assignment. Each query reads that state once, so a query running while
+    another thread adds a course answers from one consistent numbering of
+    the courses.
+    """
+
+    def __init__(self):
+        self.expressions: Dict[str, Expression] = {}
+        self._lock = Lock()
+        self._state: Optional[CompiledGraph] = None
+
+    def __contains__(self, course):
+        return course_code(course) in self.expressions
+
+    def add(self, course: str, requirement: Union[str, Expression, None]):
+        """
+        Set a course's requirements from prerequisite text or an expression
+        """
+        course = course_code(course)
+        requirement = compile_requirement(course, requirement)
+        with self._lock:
+            self.expressions[course] = requirement
+            self._state = None
+
+    def supplemented(self, requirements: Dict[str, Union[str, Expression, None]]) -> 'PrerequisiteGraph':
+        """
+        This graph plus requirements from another source, for courses it
+        states no checkable requirement for
+
+        The graph itself is left unchanged, so one request's scraped text
+        never reaches another request. Returns the graph itself when nothing
+        is added, so its compiled state is reused.
+        """
+        added = {}
+        for course, requirement in requirements.items():
+            course = course_code(course)
+            requirement = compile_requirement(course, requirement)
+            if requirement is not True and self.expressions.get(course, True) is True:
+                added[course] = requirement
+        if not added:
+            return self
+        graph = PrerequisiteGraph()
+        with self._lock:
+            graph.expressions = {**self.expressions, **added}
+        return graph
+
+    def compile(self) -> CompiledGraph:
+        state = self._state
+        if state is not None:
+            return state
+        with self._lock:
+            if self._state is None:
+                self._state = CompiledGraph(self.expressions)
+            return self._state
+
+    def mask(self, courses: Iterable[str]) -> int:
+        """Bitmask of the courses the graph knows"""
+        return self._mask(self.compile(), courses)
+
+    @staticmethod
+    def _mask(state: CompiledGraph, courses: Iterable[str]) -> int:
+        mask = 0
+        for course in courses:
+            bit = state.bits.get(course_code(course))
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _as_mask(self, state: CompiledGraph, completed) -> int:
+        # Integer masks are only meaningful against the state they came from
+        return completed if isinstance(completed, int) else self._mask(state, completed)
+
+    @staticmethod
+    def _can_take(state: CompiledGraph, course: str, completed: int) -> bool:
+        return all(clause & completed for clause in state.clauses.get(course, ()))
+
+    def can_take(self, course: str, completed) -> bool:
+        """
+        Whether completed (course codes or a mask) satisfies a course's prerequisites
+        """
+        state = self.compile()
+        return self._can_take(state, course_code(course), self._as_mask(state, completed))
+
+    def missing(self, course: str, completed) -> List[List[str]]:
+        """
+        The unsatisfied requirements of a course, each a list of alternatives
+        """
+        state = self.compile()
+        return self._missing(state, course_code(course), self._as_mask(state, completed))
+
+    @staticmethod
+    def _missing(state: CompiledGraph, course: str, completed: int) -> List[List[str]]:
+        return [
+            [state.courses[bit] for bit in iter_bits(clause)]
+            for clause in state.clauses.get(course, ())
+            if not clause & completed
+        ]
+
+    def requirements(self, course: str) -> List[List[str]]:
+        """Every requirement of a course, each a list of alternatives"""
+        return self.missing(course, 0)
+
+    def unlocks(self, completed) -> Set[str]:
+        """
+        Courses not yet completed whose prerequisites completed now
+        satisfies, among those that list one of them as a prerequisite
+        """
+        state = self.compile()
+        completed = self._as_mask(state, completed)
+        candidates = 0
+        for bit in iter_bits(completed):
+            candidates |= state.dependents.get(state.courses[bit], 0)
+        return {
+            state.courses[bit] for bit in iter_bits(candidates & ~completed)
+            if self._can_take(state, state.courses[bit], completed)
+        }
+
+    def prerequisite_closure(self, course: str) -> Set[str]:
+        """Every course that appears, transitively, in a course's requirements"""
+        state = self.compile()
+        return {state.courses[bit] for bit in iter_bits(state.closure.get(course_code(course), 0))}
+
+    def required_closure(self, course: str) -> Set[str]:
+        """Courses needed, transitively, whichever alternatives are taken"""
+        state = self.compile()
+        return {state.courses[bit] for bit in iter_bits(state.required.get(course_code(course), 0))}
+
+    def prune(self, courses: Iterable[str], completed) -> Dict[str, List[List[str]]]:
+        """
+        The courses, of those requested, whose prerequisites completed does
+        not satisfy, with what each is missing
+
+        csp_build_schedule drops these before building the CSP domains.
+        Courses taken in the same semester never count towards each other.
+        """
+        state = self.compile()
+        completed = self._as_mask(state, completed)
+        return {
+            course: self._missing(state, course_code(course), completed)
+            for course in courses
+            if not self._can_take(state, course_code(course), completed)
+        }
+
+
+def describe_missing(missing: List[List[str]]) -> str:
+    """[['CS 2100'], ['MATH 3100', 'APMA 3100']] -> 'CS 2100 and (MATH 3100 or APMA 3100)'"""
+    return ' and '.join(
+        clause[0] if len(clause) == 1 else f"({' or '.join(clause)})"
+        for clause in missing
+    )
+
+
+def format_clauses(expression: Expression) -> Optional[str]:
+    """
+    Compact text of an expression's clauses for catalog snapshots:
+    ('and', (('or', ('CS 2100', 'CS 2130')), 'MATH 3100')) -> 'CS 2100|CS 2130;MATH 3100',
+    or None when nothing is required
+    """
+    clauses = to_cnf(expression)
+    return ';'.join('|'.join(sorted(clause)) for clause in clauses) if clauses else None
+
+
+def parse_clauses(text: Optional[str]) -> Expression:
+    """The expression format_clauses wrote, without parsing prose again"""
+    if not text:
+        return True
+    return simplify('and', [simplify('or', clause.split('|')) for clause in text.split(';')])
+
+
+def load_prerequisites_catalog(catalog) -> PrerequisiteGraph:
+    """
+    Build a PrerequisiteGraph from a catalog's prerequisites (descriptions
+    of a Catalog, compiled clauses of a SnapshotCatalog)
+    """
+    graph = PrerequisiteGraph()
+    for course, requirement in catalog.prerequisites().items():
+        graph.add(course, requirement)
+    graph.compile()
+    return graph
+
+
+_graph = None
+_graph_catalog = None
+_graph_lock = Lock()
+
+
+def get_prerequisite_graph() -> Optional[PrerequisiteGraph]:
+    """
+    Return the process-wide prerequisite graph, built from the catalog on
+    first use and again whenever another catalog is swapped in
+
+    Returns None when no catalog is available.
+    """
+    global _graph, _graph_catalog
+    catalog = get_catalog()
+    with _graph_lock:
+        if catalog is None:
+            return None
+        if catalog is not _graph_catalog:
+            _graph = load_prerequisites_catalog(catalog)
+            _graph_catalog = catalog
+        return _graph
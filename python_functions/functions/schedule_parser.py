@@ -0,0 +1,165 @@
+import re
+from datetime import datetime as dt
+
+# Weekly bitmask layout: each day is split into SLOT_MINUTES slots and day d
+# occupies bits [d * SLOTS_PER_DAY, (d + 1) * SLOTS_PER_DAY)
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_INDEX = {'Mo': 0, 'Tu': 1, 'We': 2, 'Th': 3, 'Fr': 4, 'Sa': 5, 'Su': 6}
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+WEEK_MASK_BYTES = (len(DAY_INDEX) * SLOTS_PER_DAY + 7) // 8
+
+# Flexible regex to handle different schedule formats
+SCHEDULE_PATTERN = re.compile(r'^(\w+)\s+(\d{1,2}:\d{2}(?:am|pm))\s*-\s*(\d{1,2}:\d{2}(?:am|pm))$')
+
+# Parsed schedules, times and day tuples live at module level so every CSP
+# built in a warm container shares them. Failed parses are cached as their
+# error message so bad strings (e.g. 'TBA') are not re-parsed either.
+PARSE_CACHE_MAX_SIZE = 50000
+SCHEDULE_CACHE = {}
+TIME_CACHE = {}
+DAYS_CACHE = {}
+PARSE_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+def parse_time(time_string):
+    """
+    Convert time string to an interned datetime time object
+    
+    Handles multiple time input formats
+    """
+    # Remove any whitespace
+    time_string = time_string.replace(' ', '')
+    
+    cached = TIME_CACHE.get(time_string)
+    if cached is not None:
+        return cached
+    
+    try:
+        # Primary parsing strategy
+        parsed = dt.strptime(time_string, "%I:%M%p").time()
+    except ValueError:
+        # Fallback parsing strategies
+        try:
+            # Try without colon
+            parsed = dt.strptime(time_string, "%I%M%p").time()
+        except ValueError:
+            raise ValueError(f"Cannot parse time: {time_string}")
+    
+    if len(TIME_CACHE) < PARSE_CACHE_MAX_SIZE:
+        TIME_CACHE[time_string] = parsed
+    return parsed
+
+def parse_schedule_string(schedule_string):
+    """
+    Parse a schedule string such as 'TuTh 12:30pm - 1:45pm' into its days and times
+    
+    Results are memoized and shared, so callers must treat them as read-only.
+    
+    Returns:
+    - Dict with 'days' (tuple of two-letter day codes), 'start_time' and 'end_time'
+    
+    Raises:
+    - ValueError if the string cannot be parsed
+    """
+    cached = SCHEDULE_CACHE.get(schedule_string)
+    if cached is not None:
+        PARSE_CACHE_STATS['hits'] += 1
+        if isinstance(cached, str):
+            raise ValueError(cached)
+        return cached
+    
+    PARSE_CACHE_STATS['misses'] += 1
+    try:
+        # Attempt to match the schedule
+        match = SCHEDULE_PATTERN.match(schedule_string)
+        
+        if not match:
+            raise ValueError(f"Cannot parse schedule format: {schedule_string}")
+        
+        # Extract components
+        day_string = match.group(1)
+        days = tuple(day_string[i:i+2] for i in range(0, len(day_string), 2))
+        parsed = {
+            'days': DAYS_CACHE.setdefault(days, days),
+            'start_time': parse_time(match.group(2).strip()),
+            'end_time': parse_time(match.group(3).strip())
+        }
+    except Exception as e:
+        parsed = f"Detailed parsing error for '{schedule_string}': {str(e)}"
+    
+    if len(SCHEDULE_CACHE) < PARSE_CACHE_MAX_SIZE:
+        SCHEDULE_CACHE[schedule_string] = parsed
+    if isinstance(parsed, str):
+        raise ValueError(parsed)
+    return parsed
+
+def parse_many(schedule_strings):
+    """
+    Parse a batch of schedule strings, parsing each distinct string once
+    
+    Returns:
+    - List aligned with schedule_strings, with None for unparseable strings
+    """
+    parsed = {}
+    for schedule_string in schedule_strings:
+        if schedule_string not in parsed:
+            try:
+                parsed[schedule_string] = parse_schedule_string(schedule_string)
+            except ValueError:
+                parsed[schedule_string] = None
+    return [parsed[schedule_string] for schedule_string in schedule_strings]
+
+def parse_cache_info():
+    """
+    Report the shared parse cache's hit and miss counters and size
+    """
+    return {
+        'hits': PARSE_CACHE_STATS['hits'],
+        'misses': PARSE_CACHE_STATS['misses'],
+        'schedules': len(SCHEDULE_CACHE),
+        'times': len(TIME_CACHE)
+    }
+
+def time_to_minutes(time_value):
+    """
+    Convert a datetime time object to minutes since midnight
+    """
+    return time_value.hour * 60 + time_value.minute
+
+def meeting_to_mask(parsed):
+    """
+    Convert a parsed meeting into a weekly bitmask
+    
+    Start times round down and end times round up to the nearest slot,
+    so two meetings that overlap always share at least one bit. This is
+    exact for times on the SLOT_MINUTES grid, as Lou's List times are;
+    off-grid meetings less than a slot apart are treated as conflicting.
+    """
+    start_slot = time_to_minutes(parsed['start_time']) // SLOT_MINUTES
+    end_slot = -(-time_to_minutes(parsed['end_time']) // SLOT_MINUTES)
+    if end_slot <= start_slot:
+        return 0
+    day_span = ((1 << (end_slot - start_slot)) - 1) << start_slot
+    
+    mask = 0
+    for day in parsed['days']:
+        if day in DAY_INDEX:
+            mask |= day_span << (DAY_INDEX[day] * SLOTS_PER_DAY)
+    return mask
+
+def split_meetings(schedule):
+    """
+    Meeting strings of a Lou's List schedule cell, without its date ranges
+    """
+    meetings = [meeting.strip() for meeting in (schedule or '').split(",")]
+    return [meeting for meeting in meetings if meeting and not meeting[0].isdigit()]
+
+def schedule_to_mask(schedule_strings):
+    """
+    Weekly bitmask of every parseable meeting in a list of schedule strings
+    """
+    mask = 0
+    for parsed in parse_many(schedule_strings):
+        if parsed is not None:
+            mask |= meeting_to_mask(parsed)
+    return mask
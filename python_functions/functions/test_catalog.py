@@ -0,0 +1,64 @@
+from catalog import load_catalog_csv
+from catalog_snapshot import SnapshotCatalog, build_snapshot
+from prerequisites import load_prerequisites_catalog
+from schedule_parser import schedule_to_mask
+
+HEADER = "ClassNumber,Mnemonic,Number,Section,Type,Units,Instructor(s),Days,Room,Title,Topic,Status,Enrollment,EnrollmentLimit,Waitlist,CombinedWith,Description\n"
+ROWS = [
+    '15765,CS,2100,001,Lecture,"4","Briana Morrison","MoWeFr 1:00pm - 1:50pm","Gilmer Hall 301","Data Structures and Algorithms 1","",Open,0,300,0,"","..."\n',
+    '15770,CS,2100,101,Laboratory,"0","To Be Announced","Mo 3:30pm - 5:15pm","Rice Hall 340","Data Structures and Algorithms 1","",Open,12,40,0,"","..."\n',
+    '16001,EGMT,1510,101,SEM,"3","Robert Vinson","MoWe 8:00am - 9:15am","Clark Hall 107","Engaging Aesthetics","The Art of Vulnerability",Open,5,18,0,"","..."\n',
+    '16002,EGMT,1510,102,SEM,"3","Naseemah Mohamed","TBA","","Engaging Aesthetics","Birds Aren\'t Real",Open,5,18,0,"","..."\n',
+]
+
+
+def test_catalog_matches_scraped_section_shape(tmp_path):
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    catalog = load_catalog_csv(str(path))
+
+    data = catalog.louslist_data('CS', '2100')
+    assert data['course_info'] == {'number': 'CS 2100', 'name': 'Data Structures and Algorithms 1'}
+    assert [section['section_number'] for section in data['sections']] == ['001', '101']
+    assert data['sections'][1]['enrollment_current'] == 12
+    assert data['sections'][1]['enrollment_max'] == 40
+    assert data['sections'][0]['topic'] is None
+
+    egmt = catalog.louslist_data('EGMT', '1510', 'art of vulnerability')
+    assert [section['instructor'] for section in egmt['sections']] == ['Robert Vinson']
+    assert catalog.courses_with_topic("Birds Aren't Real") == [('EGMT', '1510')]
+    assert catalog.louslist_data('CS', '9999') is None
+
+
+def test_snapshot_matches_catalog(tmp_path):
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    catalog = load_catalog_csv(str(path))
+    build_snapshot(catalog, str(tmp_path / 'catalog.snap'))
+    snapshot = SnapshotCatalog(str(tmp_path / 'catalog.snap'))
+
+    for mnemonic, number in catalog.courses:
+        assert snapshot.louslist_data(mnemonic, number) == catalog.louslist_data(mnemonic, number)
+    assert snapshot.louslist_data('EGMT', '1510', 'art of vulnerability') == \
+        catalog.louslist_data('EGMT', '1510', 'art of vulnerability')
+    assert snapshot.courses_with_topic("Birds Aren't Real") == [('EGMT', '1510')]
+    assert snapshot.louslist_data('CS', '9999') is None
+
+    lab = snapshot.section_range(snapshot.find_course('CS', '2100'))[1]
+    assert snapshot.section_mask(lab) == schedule_to_mask(['Mo 3:30pm - 5:15pm'])
+
+
+def test_snapshot_compiles_prerequisites_and_units(tmp_path):
+    rows = [ROWS[0].replace('"..."', '"Prerequisite: CS 1110 or CS 1111 with a grade of C- or better."'), *ROWS[1:]]
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(rows), encoding='utf-8')
+    catalog = load_catalog_csv(str(path))
+    build_snapshot(catalog, str(tmp_path / 'catalog.snap'))
+    snapshot = SnapshotCatalog(str(tmp_path / 'catalog.snap'))
+
+    assert snapshot.units() == catalog.units() == {'CS 2100': 4, 'EGMT 1510': 3}
+    assert snapshot.prerequisites() == {'CS 2100': ('or', ('CS 1110', 'CS 1111'))}
+    for source in (catalog, snapshot):
+        graph = load_prerequisites_catalog(source)
+        assert graph.requirements('CS 2100') == [['CS 1110', 'CS 1111']]
+        assert graph.requirements('EGMT 1510') == []
@@ -0,0 +1,164 @@
+import csv
+import io
+import os
+
+from catalog import load_catalog_csv
+from catalog_diff import apply_to_catalog, diff_exports, invalidate_course_cache
+from course_cache import TTLCache
+from test_catalog import HEADER, ROWS
+
+
+def export_rows(lines):
+    return {row['ClassNumber']: row for row in csv.DictReader(io.StringIO(HEADER + ''.join(lines)))}
+
+
+def test_diff_classifies_and_applies_only_changed_sections(tmp_path):
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    catalog = load_catalog_csv(str(path))
+
+    new_lines = [
+        ROWS[0].replace('Open,0,300', 'Closed,300,300'),
+        ROWS[1].replace('Mo 3:30pm - 5:15pm', 'Tu 3:30pm - 5:15pm'),
+        ROWS[2],
+        '16003,EGMT,1510,103,SEM,"3","Jane Doe","Fr 10:00am - 10:50am","Clark Hall 108","Engaging Aesthetics","Sound Worlds",Open,0,18,0,"","..."\n',
+    ]
+    diff = diff_exports(export_rows(ROWS), export_rows(new_lines))
+    assert list(diff.enrollment_changed) == ['15765']
+    assert list(diff.schedule_changed) == ['15770']
+    assert list(diff.added) == ['16003']
+    assert list(diff.removed) == ['16002']
+    assert diff.course_keys() == {('CS', '2100'), ('EGMT', '1510')}
+
+    apply_to_catalog(catalog, diff)
+    sections = {section['class_number']: section for section in catalog.sections('CS', '2100')}
+    assert sections['15765']['status'] == 'Closed'
+    assert sections['15765']['enrollment_current'] == 300
+    assert sections['15770']['schedule'] == 'Tu 3:30pm - 5:15pm'
+    assert catalog.courses_with_topic("Birds Aren't Real") == []
+    assert catalog.courses_with_topic('Sound Worlds') == [('EGMT', '1510')]
+
+    cache = TTLCache(ttls={'ratings': 60, 'sections': 60})
+    for key in [('CS', '2100', '', None, '1258'), ('CS', '3100', '', None, '1258')]:
+        cache.put(key, 'ratings', 'ratings')
+        cache.put(key, 'sections', 'sections')
+    assert invalidate_course_cache(cache, diff) == 1
+    assert cache.get(('CS', '2100', '', None, '1258'), 'sections', lambda: 'fresh') == 'fresh'
+    assert cache.get(('CS', '2100', '', None, '1258'), 'ratings', lambda: 'fresh') == 'ratings'
+    assert cache.get(('CS', '3100', '', None, '1258'), 'sections', lambda: 'fresh') == 'sections'
+
+
+def test_snapshot_catalog_is_rebuilt_on_refresh(tmp_path, monkeypatch):
+    import catalog as catalog_module
+    import main
+    from catalog_snapshot import SnapshotCatalog, build_snapshot, snapshot_row
+
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    build_snapshot(load_catalog_csv(str(path)), str(tmp_path / 'catalog.snap'))
+    snapshot = SnapshotCatalog(str(tmp_path / 'catalog.snap'))
+    assert not diff_exports(snapshot.rows(), {n: snapshot_row(row) for n, row in export_rows(ROWS).items()})
+
+    monkeypatch.setattr(catalog_module, '_catalog', snapshot)
+    monkeypatch.setattr(catalog_module, '_catalog_loaded', True)
+    main.COURSE_INFO_CACHE.put(('CS', '2100', '', None, main.SEMESTER), 'sections', 'sections')
+    new_path = tmp_path / 'new.csv'
+    new_path.write_text(HEADER + ''.join([ROWS[0].replace('Open,0,300', 'Closed,300,300')] + ROWS[1:]), encoding='utf-8')
+
+    diff = main.refresh_catalog(str(new_path))
+    assert list(diff.enrollment_changed) == ['15765']
+    assert not diff.schedule_changed and not diff.added and not diff.removed
+    refreshed = catalog_module.get_catalog()
+    assert isinstance(refreshed, SnapshotCatalog) and refreshed.temporary
+    assert refreshed.sections('CS', '2100')[0]['status'] == 'Closed'
+    assert not main.COURSE_INFO_CACHE.cached(('CS', '2100', '', None, main.SEMESTER), 'sections')
+
+    # A second refresh replaces the temporary snapshot and deletes its file
+    new_path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    main.refresh_catalog(str(new_path))
+    assert catalog_module.get_catalog().sections('CS', '2100')[0]['status'] == 'Open'
+    assert not os.path.exists(refreshed.path)
+    os.unlink(catalog_module.get_catalog().path)
+
+
+def test_enrollment_changes_merge_into_firestore():
+    from catalog_diff import CatalogDiff, apply_to_firestore
+
+    class Batch:
+        def __init__(self, writes):
+            self.writes = writes
+
+        def set(self, document, data, merge=False):
+            self.writes.append(('merge' if merge else 'set', document, data['ClassNumber']))
+
+        def update(self, document, data):
+            self.writes.append(('update', document, None))
+
+        def delete(self, document):
+            self.writes.append(('delete', document, None))
+
+        def commit(self):
+            pass
+
+    class Database:
+        def __init__(self):
+            self.writes = []
+
+        def collection(self, name):
+            return self
+
+        def document(self, class_number):
+            return class_number
+
+        def batch(self):
+            return Batch(self.writes)
+
+    rows = export_rows(ROWS)
+    diff = CatalogDiff()
+    diff.enrollment_changed['15765'] = rows['15765']
+    diff.schedule_changed['15770'] = rows['15770']
+    db = Database()
+    assert apply_to_firestore(db, diff) == 2
+    assert sorted(db.writes) == [('merge', '15765', '15765'), ('set', '15770', '15770')]
+
+
+def test_csv_catalog_is_copied_and_swapped_on_refresh(tmp_path, monkeypatch):
+    import catalog as catalog_module
+    import degree_planner
+    import main
+    import prerequisites
+
+    path = tmp_path / 'catalog.csv'
+    path.write_text(HEADER + ''.join(ROWS), encoding='utf-8')
+    catalog = load_catalog_csv(str(path))
+    monkeypatch.setattr(catalog_module, '_catalog', catalog)
+    monkeypatch.setattr(catalog_module, '_catalog_loaded', True)
+    assert degree_planner.get_units()['CS 2100'] == 4
+    assert prerequisites.get_prerequisite_graph().requirements('CS 2100') == []
+
+    new_path = tmp_path / 'new.csv'
+    new_path.write_text(HEADER + ''.join([
+        ROWS[0].replace('Open,0,300', 'Closed,300,300').replace('"4"', '"3"').replace('"..."', '"Prerequisite: CS 1110."'),
+        *ROWS[1:],
+    ]), encoding='utf-8')
+    diff = main.refresh_catalog(str(new_path))
+    assert list(diff.schedule_changed) == ['15765']
+
+    refreshed = catalog_module.get_catalog()
+    assert refreshed is not catalog
+    def section(catalog, class_number):
+        return next(section for section in catalog.sections('CS', '2100') if section['class_number'] == class_number)
+
+    assert section(refreshed, '15765')['status'] == 'Closed'
+    # Readers still holding the old catalog see it unchanged
+    assert section(catalog, '15765')['status'] == 'Open'
+    assert degree_planner.get_units()['CS 2100'] == 3
+    assert prerequisites.get_prerequisite_graph().requirements('CS 2100') == [['CS 1110']]
+
+    # An enrollment-only refresh leaves the sections the old catalog shares alone
+    new_path.write_text(HEADER + ''.join([ROWS[0].replace('"..."', '"Prerequisite: CS 1110."'), *ROWS[1:]])
+                        .replace('Open,12,40', 'Open,13,40'), encoding='utf-8')
+    diff = main.refresh_catalog(str(new_path))
+    assert list(diff.enrollment_changed) == ['15770'] and list(diff.schedule_changed) == ['15765']
+    assert section(catalog_module.get_catalog(), '15770')['enrollment_current'] == 13
+    assert section(refreshed, '15770')['enrollment_current'] == 12
@@ -0,0 +1,84 @@
+from course_cache import TTLCache
+
+
+def counting_loader():
+    calls = {'count': 0}
+
+    def load():
+        calls['count'] += 1
+        return calls['count']
+    return load, calls
+
+
+def test_fresh_halves_are_served_from_cache():
+    cache = TTLCache(ttls={'ratings': 60, 'sections': 0})
+    load, calls = counting_loader()
+    assert cache.get(('CS', '2100'), 'ratings', load) == 1
+    assert cache.get(('CS', '2100'), 'ratings', load) == 1
+    # An expired half is re-fetched without touching the other half
+    assert cache.get(('CS', '2100'), 'sections', load) == 2
+    assert cache.get(('CS', '2100'), 'sections', load) == 3
+    assert cache.get(('CS', '2100'), 'ratings', load) == 1
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 3
+
+
+def test_stale_while_revalidate_refreshes_in_background():
+    cache = TTLCache(ttls={'sections': 0}, stale_windows={'sections': 60})
+    load, calls = counting_loader()
+    assert cache.get(('CS', '2100'), 'sections', load) == 1
+    assert cache.get(('CS', '2100'), 'sections', load) == 1
+    cache._refresh_pool.shutdown(wait=True)
+    assert calls['count'] == 2
+    assert cache.stats()['stale_hits'] == 1
+    assert cache.stats()['refreshes'] == 1
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = TTLCache(ttls={'ratings': 60}, max_entries=2)
+    load, calls = counting_loader()
+    cache.get(('CS', '2100'), 'ratings', load)
+    cache.get(('CS', '2120'), 'ratings', load)
+    cache.get(('CS', '2100'), 'ratings', load)
+    cache.get(('CS', '3100'), 'ratings', load)
+    cache.get(('CS', '2100'), 'ratings', load)
+    assert calls['count'] == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_failed_loads_are_not_cached():
+    cache = TTLCache(ttls={'ratings': 60})
+    assert cache.get(('CS', '2100'), 'ratings', lambda: None) is None
+    assert cache.get(('CS', '2100'), 'ratings', lambda: 'ok') == 'ok'
+
+
+def test_concurrent_misses_share_one_load():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Event
+
+    cache = TTLCache(ttls={'ratings': 60})
+    release = Event()
+    calls = {'count': 0}
+
+    def load():
+        calls['count'] += 1
+        release.wait(5)
+        return 'ratings'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(cache.get, ('CS 2100',), 'ratings', load) for _ in range(4)]
+        while cache.stats()['misses'] + cache.stats()['shared_loads'] < 4:
+            release.wait(0.001)
+        release.set()
+        assert [future.result() for future in futures] == ['ratings'] * 4
+    assert calls['count'] == 1
+    assert cache.stats()['shared_loads'] == 3
+
+
+def test_failed_refreshes_are_counted_and_logged(capsys):
+    cache = TTLCache(ttls={'sections': 0}, stale_windows={'sections': 60})
+    cache.get(('CS', '2100'), 'sections', lambda: 'sections')
+    assert cache.get(('CS', '2100'), 'sections', lambda: None) == 'sections'
+    cache._refresh_pool.shutdown(wait=True)
+    assert cache.stats()['refresh_failures'] == 1
+    assert "serving the stale value" in capsys.readouterr().out
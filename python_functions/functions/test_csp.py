@@ -0,0 +1,297 @@
+from datetime import datetime as dt
+
+import pytest
+
+from main import CSP, build_domains, decode_cursor, encode_cursor, parse_cache_info, parse_many, parse_objective
+
+
+def to_time(value):
+    return dt.strptime(value, "%I:%M%p").time()
+
+
+def make_domains():
+    return {
+        'CS 2100': {
+            '001': {'schedule': ['MoWeFr 10:00am - 10:50am'], 'rating': 4.5, 'difficulty': 3.0, 'gpa': 3.2},
+            '002': {'schedule': ['TuTh 9:30am - 10:45am'], 'rating': 3.1, 'difficulty': 2.5, 'gpa': 3.4},
+            '100': {'schedule': ['Mo 2:00pm - 3:15pm'], 'rating': 4.0, 'difficulty': 2.0, 'gpa': 3.5},
+            '101': {'schedule': ['Tu 2:00pm - 3:15pm'], 'rating': 3.0, 'difficulty': 2.0, 'gpa': 3.5},
+        },
+        'CS 2120': {
+            '001': {'schedule': ['MoWeFr 10:00am - 10:50am'], 'rating': 4.9, 'difficulty': 3.5, 'gpa': 3.0},
+            '002': {'schedule': ['TuTh 2:00pm - 3:15pm'], 'rating': 2.0, 'difficulty': 2.0, 'gpa': 3.1},
+        },
+        'APMA 3080': {
+            '001': {'schedule': ['TuTh 9:30am - 10:45am'], 'rating': 3.8, 'difficulty': 3.0, 'gpa': 3.3},
+            '002': {'schedule': ['MoWe 2:00pm - 3:15pm'], 'rating': 4.2, 'difficulty': 3.0, 'gpa': 3.3},
+        },
+    }
+
+
+def has_conflicts(csp, solution):
+    sections = [data for assigned in solution.values() for data in assigned.values()]
+    for i, first in enumerate(sections):
+        for second in sections[i + 1:]:
+            if csp.has_time_conflict(csp.parse_schedule(first['schedule'][0]),
+                                     csp.parse_schedule(second['schedule'][0])):
+                return True
+    return False
+
+
+def test_meeting_masks_detect_overlap():
+    csp = CSP([], {})
+    assert csp.meeting_mask('MoWe 10:00am - 10:50am') & csp.meeting_mask('Mo 10:30am - 11:45am')
+    assert not csp.meeting_mask('MoWe 10:00am - 10:50am') & csp.meeting_mask('Mo 10:50am - 11:45am')
+    assert not csp.meeting_mask('MoWe 10:00am - 10:50am') & csp.meeting_mask('TuTh 10:00am - 10:50am')
+    assert csp.meeting_mask('TBA') == 0
+
+
+def test_solution_is_conflict_free():
+    csp = CSP(['CS 2100', 'CS 2120', 'APMA 3080'], make_domains())
+    solution = csp.solve()
+    assert set(solution) == {'CS 2100', 'CS 2100_lab', 'CS 2120', 'APMA 3080'}
+    assert not has_conflicts(csp, solution)
+
+
+def test_time_constraints_block_sections():
+    time_constraints = {day: (to_time('12:00pm'), to_time('5:00pm')) for day in ['Mo', 'Tu', 'We', 'Th', 'Fr']}
+    csp = CSP(['CS 2100', 'CS 2120'], make_domains(), time_constraints)
+    assert csp.solve() is None
+
+    domains = make_domains()
+    del domains['CS 2100']
+    csp = CSP(['CS 2120', 'APMA 3080'], domains, time_constraints)
+    solution = csp.solve()
+    assert solution == {
+        'CS 2120': {'002': make_domains()['CS 2120']['002']},
+        'APMA 3080': {'002': make_domains()['APMA 3080']['002']},
+    }
+
+
+def test_forward_checking_prunes_conflicting_sections():
+    domains = make_domains()
+    del domains['CS 2100']
+    domains['APMA 3080']['002']['schedule'] = ['MoWe 10:00am - 10:50am']
+    csp = CSP(['CS 2120', 'APMA 3080'], domains)
+    live = csp.initial_live_domains({})
+    assert live == {'CS 2120': 0b11, 'APMA 3080': 0b11}
+    assert csp.forward_check(live, 'CS 2120', 0) == {'APMA 3080': 0b01}
+    assert csp.forward_check({'APMA 3080': 0b10}, 'CS 2120', 0) is None
+
+
+def test_empty_domain_fails_before_search():
+    time_constraints = {'Tu': (to_time('11:00am'), to_time('5:00pm')), 'Mo': (to_time('11:00am'), to_time('5:00pm'))}
+    domains = make_domains()
+    del domains['CS 2100']
+    domains['APMA 3080']['002']['schedule'] = ['MoWe 10:00am - 10:50am']
+    csp = CSP(['CS 2120', 'APMA 3080'], domains, time_constraints)
+    assert csp.initial_live_domains({}) is None
+    assert csp.solve() is None
+
+
+def brute_force_best(csp, objective):
+    import itertools
+    best = None
+    courses = csp.variables
+    for combo in itertools.product(*(csp.domains[course].items() for course in courses)):
+        schedule = {course: {code: data} for course, (code, data) in zip(courses, combo)}
+        sections = list(schedule.values())
+        masks = [csp.section_masks[course][code] for course, (code, _) in zip(courses, combo)]
+        if any(mask & csp.blocked_mask for mask in masks):
+            continue
+        if any(a & b for i, a in enumerate(masks) for b in masks[i + 1:]):
+            continue
+        score = sum(csp.section_score(next(iter(a.values())), objective) for a in sections)
+        if best is None or score > best:
+            best = score
+    return best
+
+
+def test_branch_and_bound_finds_optimal_schedule():
+    objective = {'rating': 1.0, 'difficulty': -0.5, 'gpa': 0.5}
+    csp = CSP(['CS 2100', 'CS 2120', 'APMA 3080'], make_domains())
+    solution = csp.solve(objective=objective)
+    assert not has_conflicts(csp, solution)
+    assert csp.final_score == pytest.approx(brute_force_best(csp, objective))
+    assert csp.search_stats['nodes_expanded'] > 0
+
+    csp = CSP(['CS 2100', 'CS 2120', 'APMA 3080'], make_domains())
+    csp.solve(optimize_ratings=True)
+    assert csp.final_score == pytest.approx(brute_force_best(csp, {'rating': 1.0}))
+
+
+def test_unrated_sections_score_as_the_course_mean():
+    domains = {
+        'CS 3100': {
+            '001': {'schedule': ['MoWe 2:00pm - 3:15pm'], 'rating': 4.0, 'difficulty': 2.0},
+            '002': {'schedule': ['TuTh 2:00pm - 3:15pm'], 'rating': 3.0, 'difficulty': 4.0},
+            '003': {'schedule': ['TuTh 5:00pm - 6:15pm']},
+        },
+        'CS 3140': {
+            '001': {'schedule': ['MoWe 9:00am - 9:50am']},
+        },
+    }
+    csp = CSP(['CS 3100', 'CS 3140'], domains)
+    scores = csp.compile_scores({'rating': 1.0, 'difficulty': -1.0})
+    assert scores['CS 3100'] == [pytest.approx(2.0), pytest.approx(-1.0), pytest.approx(0.5)]
+    # A course with no rated section gets the mean over every section
+    assert scores['CS 3140'] == [pytest.approx(0.5)]
+    assert csp.solve(objective={'difficulty': -1.0})['CS 3100'] == {'001': domains['CS 3100']['001']}
+
+
+def test_solve_top_k_returns_best_schedules_in_order():
+    objective = {'rating': 1.0, 'difficulty': -0.5, 'gpa': 0.5}
+    csp = CSP(['CS 2100', 'CS 2120', 'APMA 3080'], make_domains())
+    ranked = csp.solve_top_k(5, objective)
+    scores = [score for _, score in ranked]
+    # Only two conflict-free schedules exist, so asking for more returns both
+    assert len(ranked) == 2
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] == pytest.approx(brute_force_best(csp, objective))
+    assert all(not has_conflicts(csp, schedule) for schedule, _ in ranked)
+    assert ranked[0][0] != ranked[1][0]
+
+    assert csp.solve_top_k(1, objective)[0][0] == csp.solve(objective=objective)
+
+
+def test_request_objective_is_validated():
+    assert parse_objective(None) is None
+    assert parse_objective({'rating': 1, 'difficulty': '-0.5'}) == {'rating': 1.0, 'difficulty': -0.5}
+    with pytest.raises(ValueError, match='enrollment'):
+        parse_objective({'rating': 1.0, 'enrollment': 1.0})
+
+
+def test_iter_solutions_streams_every_valid_schedule():
+    import itertools
+
+    csp = CSP(['CS 2100', 'CS 2120', 'APMA 3080'], make_domains())
+    solutions = list(csp.iter_solutions())
+    assert len(solutions) == 2
+    assert solutions[0] == csp.backtracking_search()
+    assert all(not has_conflicts(csp, solution) for solution in solutions)
+    assert list(itertools.islice(csp.iter_solutions(), 1, None)) == solutions[1:]
+
+
+def test_iter_solutions_resumes_behind_a_cursor():
+    days = ['Mo', 'Tu', 'We', 'Th', 'Fr']
+    domains = {
+        course: {
+            f'00{i}': {'schedule': [f'{days[i]} {hour}:00am - {hour}:50am']}
+            for i in range(4)
+        }
+        for course, hour in [('CS 2100', 8), ('CS 2120', 9), ('APMA 3080', 9)]
+    }
+    solutions = list(CSP(list(domains), domains).iter_solutions())
+    assert len(solutions) == 48
+
+    for i in (0, 17, 47):
+        csp = CSP(list(domains), domains)
+        after = decode_cursor(encode_cursor(solutions[i]))
+        assert list(csp.iter_solutions(after=after)) == solutions[i + 1:]
+
+    # Resuming walks one branch down instead of re-enumerating earlier schedules
+    csp = CSP(list(domains), domains)
+    next(csp.iter_solutions(after=decode_cursor(encode_cursor(solutions[40]))))
+    assert csp.search_stats['nodes_expanded'] < 10
+
+    with pytest.raises(ValueError):
+        list(CSP(list(domains), domains).iter_solutions(after={'CS 2100': '009'}))
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor')
+
+
+def test_every_meeting_of_a_section_is_checked():
+    domains = {
+        'CS 2130': {
+            '001': {'schedule': ['MoWe 9:00am - 9:50am', 'Fr 2:00pm - 3:15pm']},
+        },
+        'APMA 3100': {
+            '001': {'schedule': ['Fr 2:30pm - 3:45pm']},
+            '002': {'schedule': ['Fr 3:30pm - 4:45pm']},
+        },
+    }
+    csp = CSP(['CS 2130', 'APMA 3100'], domains)
+    assert csp.section_masks['CS 2130']['001'] == (
+        csp.meeting_mask('MoWe 9:00am - 9:50am') | csp.meeting_mask('Fr 2:00pm - 3:15pm'))
+    assert csp.solve() == {
+        'CS 2130': {'001': domains['CS 2130']['001']},
+        'APMA 3100': {'002': domains['APMA 3100']['002']},
+    }
+
+    time_constraints = {'Fr': (to_time('8:00am'), to_time('3:00pm'))}
+    assert CSP(['CS 2130'], {'CS 2130': domains['CS 2130']}, time_constraints).solve() is None
+
+
+@pytest.mark.parametrize('meeting', ['Mo 9:00am - 9:50am', 'Mo 9:05am - 9:55am', 'Mo 2:30pm - 3:45pm'])
+def test_off_grid_time_constraints_match_exact_comparison(meeting):
+    csp = CSP([], {})
+    parsed = csp.parse_schedule(meeting)
+    for start in range(8 * 60 + 50, 9 * 60 + 16):
+        for end in range(14 * 60 + 50, 16 * 60):
+            constraint = (to_time(f"{start // 60}:{start % 60:02d}am"),
+                          to_time(f"{end // 60 - 12}:{end % 60:02d}pm"))
+            csp.time_constraints = {'Mo': constraint}
+            violated = parsed['start_time'] < constraint[0] or parsed['end_time'] > constraint[1]
+            assert bool(csp.meeting_mask(meeting) & csp.compile_time_constraints()) == violated
+
+
+def test_off_grid_meetings_round_outward():
+    csp = CSP([], {})
+    # Back-to-back on the grid is fine; off the grid, a gap of less than a
+    # slot is treated as a conflict rather than risking a missed overlap
+    assert not csp.meeting_mask('Mo 9:00am - 9:50am') & csp.meeting_mask('Mo 9:50am - 10:40am')
+    assert csp.meeting_mask('Mo 9:00am - 9:52am') & csp.meeting_mask('Mo 9:53am - 10:40am')
+    assert csp.meeting_mask('Mo 9:00am - 9:52am') & csp.meeting_mask('Mo 9:51am - 10:40am')
+
+
+def test_continuation_rows_only_add_meetings():
+    def section(instructor, schedule):
+        return {'section_number': '001', 'instructor': instructor, 'schedule': schedule, 'location': 'Rice Hall 130'}
+
+    data = {'CS 2130': {
+        'current_sections': [
+            section('To Be Announced', 'MoWe 9:00am - 9:50am'),
+            section('Robert Vinson', 'Fr 2:00pm - 3:15pm'),
+        ],
+        'course_ratings': {'Robert Vinson': {'rating': 4.5, 'difficulty': 3.0, 'gpa': 3.1}},
+    }}
+    variables, domains, section_masks = build_domains(data)
+    assert variables == ['CS 2130']
+    assert domains['CS 2130']['001'] == {'schedule': ['MoWe 9:00am - 9:50am', 'Fr 2:00pm - 3:15pm']}
+    assert section_masks == {'CS 2130': {}}
+
+
+def test_precompiled_masks_skip_parsing(monkeypatch):
+    from schedule_parser import schedule_to_mask
+
+    def section(number, schedule):
+        return {'section_number': number, 'instructor': 'Robert Vinson', 'schedule': schedule,
+                'location': '', 'meeting_mask': schedule_to_mask([schedule])}
+
+    data = {
+        'CS 2130': {'current_sections': [section('001', 'MoWe 9:00am - 9:50am'), section('001', 'Fr 2:00pm - 3:15pm')]},
+        'APMA 3100': {'current_sections': [section('001', 'Fr 2:30pm - 3:45pm'), section('002', 'Fr 3:30pm - 4:45pm')]},
+    }
+    variables, domains, section_masks = build_domains(data)
+    assert section_masks['CS 2130']['001'] == schedule_to_mask(['MoWe 9:00am - 9:50am', 'Fr 2:00pm - 3:15pm'])
+    monkeypatch.setattr(CSP, 'parse_meetings', lambda self, section_data: pytest.fail("parsed a known section"))
+    csp = CSP(variables, domains, section_masks=section_masks)
+    assert csp.solve() == {
+        'CS 2130': {'001': domains['CS 2130']['001']},
+        'APMA 3100': {'002': domains['APMA 3100']['002']},
+    }
+
+
+def test_parse_cache_is_shared_across_instances():
+    before = parse_cache_info()
+    first = CSP([], {}).parse_schedule('MoWeFr 11:00am - 11:50am')
+    second = CSP([], {}).parse_schedule('MoWeFr 11:00am - 11:50am')
+    after = parse_cache_info()
+    assert first is second
+    assert first['days'] == ('Mo', 'We', 'Fr')
+    assert after['hits'] - before['hits'] >= 1
+
+    parsed = parse_many(['MoWeFr 11:00am - 11:50am', 'TBA', 'Th 11:00am - 12:15pm'])
+    assert parsed[0] is first
+    assert parsed[1] is None
+    assert parsed[2]['start_time'] is first['start_time']
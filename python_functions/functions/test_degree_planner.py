@@ -0,0 +1,101 @@
+import pytest
+
+from catalog import parse_units
+from degree_planner import DegreePlanner
+from prerequisites import PrerequisiteGraph
+
+
+def make_graph():
+    graph = PrerequisiteGraph()
+    graph.add('CS 2100', "Prerequisite: CS 1110")
+    graph.add('CS 2120', True)
+    graph.add('CS 3100', "Prerequisites: CS 2100 & CS 2120")
+    graph.add('CS 3140', "Prerequisite: CS 2100")
+    graph.add('CS 4750', "Prerequisite: CS 3140")
+    return graph
+
+
+UNITS = {'CS 1110': 3, 'CS 2100': 4, 'CS 2120': 3, 'CS 3100': 3, 'CS 3140': 3, 'CS 4750': 3, 'MATH 3350': 4}
+REQUIRED = ['CS 1110', 'CS 2100', 'CS 2120', 'CS 3100', 'CS 3140', 'CS 4750']
+
+
+def semester_of(plan):
+    return {course: semester['semester'] for semester in plan for course in semester['courses']}
+
+
+def test_plan_orders_prerequisites():
+    plan = DegreePlanner(make_graph(), UNITS).plan(REQUIRED)
+    semester = semester_of(plan)
+    assert len(plan) == 4
+    assert semester['CS 1110'] < semester['CS 2100'] < semester['CS 3140'] < semester['CS 4750']
+    assert semester['CS 3100'] > max(semester['CS 2100'], semester['CS 2120'])
+    assert [s['term'] for s in plan] == ['Fall', 'Spring', 'Fall', 'Spring']
+
+
+def test_plan_respects_credit_cap():
+    planner = DegreePlanner(make_graph(), UNITS, max_credits=7)
+    plan = planner.plan(REQUIRED + ['MATH 3350'], start_term='Spring')
+    assert all(s['credits'] <= 7 for s in plan)
+    assert sorted(c for s in plan for c in s['courses']) == sorted(REQUIRED + ['MATH 3350'])
+    assert plan[0]['term'] == 'Spring'
+    assert DegreePlanner(make_graph(), UNITS, max_credits=7).plan(REQUIRED + ['MATH 3350'], semesters=3) is None
+
+
+def test_completed_courses_are_not_planned():
+    plan = DegreePlanner(make_graph(), UNITS).plan(REQUIRED, completed=['CS 1110', 'CS 2100'])
+    assert len(plan) == 2
+    assert 'CS 1110' not in semester_of(plan)
+
+
+def test_oracle_answers_are_memoized():
+    calls = []
+
+    def feasible(term, courses):
+        calls.append((term, courses))
+        return not {'CS 2120', 'CS 2100'} <= courses
+
+    planner = DegreePlanner(make_graph(), UNITS, feasible)
+    plan = planner.plan(REQUIRED)
+    assert all(not {'CS 2120', 'CS 2100'} <= set(s['courses']) for s in plan)
+    assert len(calls) == len(set(calls)) == planner.stats['oracle_calls']
+
+
+def test_unmet_prerequisites_raise():
+    with pytest.raises(ValueError, match='CS 1110'):
+        DegreePlanner(make_graph(), UNITS).plan(['CS 2100'])
+    with pytest.raises(ValueError, match='exceeds'):
+        DegreePlanner(make_graph(), UNITS, max_credits=3).plan(['CS 2100'], completed=['CS 1110'])
+
+
+def test_parse_units():
+    assert parse_units('4') == 4
+    assert parse_units('1 - 3') == 1
+    assert parse_units('') is None
+
+
+def test_default_cli_plans_the_bscs_core(capsys):
+    from degree_planner import BSCS_CORE, main
+
+    main([])
+    output = capsys.readouterr().out
+    assert 'No plan fits' not in output
+    semesters = [line.split(' credits ', 1)[1] for line in output.splitlines() if ' credits ' in line]
+    assert sorted(course.strip() for line in semesters for course in line.split(',')) == sorted(BSCS_CORE)
+    semester = {course.strip(): i for i, line in enumerate(semesters) for course in line.split(',')}
+    assert semester['CS 1110'] < semester['CS 2100'] < semester['CS 3140']
+    assert semester['APMA 2120'] < semester['APMA 3100']
+
+
+def test_term_independent_oracle_is_asked_once_per_set():
+    calls = []
+
+    def feasible(term, courses):
+        calls.append(courses)
+        return not {'CS 2120', 'CS 2100'} <= courses
+
+    planner = DegreePlanner(make_graph(), UNITS, feasible, term_independent=True)
+    planner.plan(REQUIRED)
+    assert len(calls) == len(set(calls)) == planner.stats['oracle_calls']
+    per_term = DegreePlanner(make_graph(), UNITS, lambda term, courses: feasible(term, courses))
+    per_term.plan(REQUIRED)
+    assert per_term.stats['oracle_calls'] >= planner.stats['oracle_calls']
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+
+
+def course_data(sections=1):
+    return {'current_sections': [{'section_number': f'00{i}'} for i in range(sections)]}
+
+
+@pytest.fixture
+def stub_scraper(monkeypatch):
+    behaviours = {}
+
+    def get_comprehensive_course_info(mnemonic, number, **kwargs):
+        result = behaviours[f"{mnemonic} {number}"]()
+        return "", result
+    monkeypatch.setattr(main, 'get_comprehensive_course_info', get_comprehensive_course_info)
+    monkeypatch.setattr(main, 'COURSE_TIMEOUT_SECONDS', 0.25)
+    return behaviours
+
+
+def test_partial_failures_are_reported_per_course(stub_scraper):
+    def fail():
+        raise RuntimeError("connection reset")
+
+    def hang():
+        time.sleep(1)
+        return course_data()
+
+    stub_scraper.update({
+        'CS 2100': course_data,
+        'CS 2120': fail,
+        'CS 3100': hang,
+        'CS 3140': lambda: course_data(0),
+    })
+    data, failures = main.fetch_course_data(['CS 2100', 'CS 2120', 'CS 3100', 'CS 3140'], offline=True)
+    assert list(data) == ['CS 2100']
+    assert failures == {
+        'CS 2120': "connection reset",
+        'CS 3100': "Timed out after 0.25s",
+        'CS 3140': "No sections found",
+    }
+
+
+def test_timeout_runs_from_when_each_course_starts(stub_scraper, monkeypatch):
+    monkeypatch.setattr(main, 'COURSE_POOL', ThreadPoolExecutor(max_workers=1))
+
+    def slow():
+        time.sleep(0.15)
+        return course_data()
+
+    # One worker runs the courses back to back, 0.3s in all, each within its 0.25s
+    stub_scraper.update({'CS 2100': slow, 'CS 2120': slow})
+    data, failures = main.fetch_course_data(['CS 2100', 'CS 2120'], offline=True)
+    assert list(data) == ['CS 2100', 'CS 2120']
+    assert failures == {}
+
+
+def test_courses_waiting_for_a_worker_time_out(stub_scraper, monkeypatch):
+    monkeypatch.setattr(main, 'COURSE_POOL', ThreadPoolExecutor(max_workers=1))
+
+    def hang():
+        time.sleep(0.8)
+        return course_data()
+
+    stub_scraper.update({'CS 2100': hang, 'CS 2120': course_data})
+    data, failures = main.fetch_course_data(['CS 2100', 'CS 2120'], offline=True)
+    assert data == {}
+    assert failures == {
+        'CS 2100': "Timed out after 0.25s",
+        'CS 2120': "No scrape worker free after 0.25s",
+    }
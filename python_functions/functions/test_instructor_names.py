@@ -0,0 +1,49 @@
+from instructor_names import InstructorIndex, name_key, normalize_instructor, split_instructors
+
+
+def test_names_are_normalized_and_placeholders_dropped():
+    assert normalize_instructor('  Tomás   García ') == 'tomas garcia'
+    assert normalize_instructor('Mark R. Sherriff') == 'mark r sherriff'
+    assert split_instructors('Robert Vinson, Naseemah Mohamed') == ['robert vinson', 'naseemah mohamed']
+    assert split_instructors('To Be Announced') == []
+    assert split_instructors('') == []
+
+
+def test_name_key_ignores_initials_and_suffixes():
+    assert name_key('Mark R. Sherriff') == name_key('Mark Sherriff Jr.') == 'mark sherriff'
+    assert name_key('Lee Kim') != name_key('Kim Lee')
+    assert name_key('Mary Anne Smith') == name_key('Mary Smith')
+    assert name_key(name_key('Tomás García')) == name_key('Tomás García')
+    assert name_key('Jane Smith') != name_key('John Smith')
+
+
+def test_variants_resolve_to_one_id():
+    index = InstructorIndex()
+    ids = index.add_cell('Robert Vinson, Naseemah Mohamed')
+    assert len(ids) == 2 and len(index) == 2
+    assert index.resolve('Robert J. Vinson') == ids[0]
+    assert index.resolve_cell('Naseemah Mohamed, To Be Announced') == [ids[1]]
+    assert index.add('Robert Vinson Jr.', 'ratemyprofessor') == ids[0]
+    assert index.names(ids[0], 'ratemyprofessor') == {'Robert Vinson Jr.'}
+    assert index.resolve('To Be Announced') is None
+
+
+def test_misspellings_match_fuzzily_but_other_people_do_not():
+    index = InstructorIndex()
+    garcia = index.add('Tomás García')
+    index.add('Jane Smith')
+    assert index.resolve('Tomas Garica') == garcia
+    assert index.resolve('John Smith') is None
+    assert index.resolve('Someone Else') is None
+
+
+def test_adding_never_merges_similar_names():
+    index = InstructorIndex()
+    miller = index.add('John Miller')
+    dillery = index.add('John Dillery')
+    assert miller != dillery and len(index) == 2
+    assert index.resolve('John Dillery') == dillery
+    assert index.resolve('Jon Dillery') == dillery
+    # A fuzzy query does not make its spelling an alias of another instructor
+    assert index.add('Jon Dillery') == 'jon dillery'
+    assert index.names(dillery, 'louslist') == {'John Dillery'}
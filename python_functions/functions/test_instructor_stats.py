@@ -0,0 +1,47 @@
+from instructor_names import InstructorIndex
+from instructor_stats import build_stats_index, resolve_stats, section_stats
+
+
+def make_data():
+    return {
+        'CS 2100': {'course_ratings': {
+            'Robert Vinson': {'rating': 4.5, 'difficulty': 3.0, 'gpa': "N/A", 'last_taught': 'Fall 2025'},
+            'Naseemah Mohamed': {'rating': 3.5, 'difficulty': 2.0, 'gpa': 3.4, 'last_taught': 'Fall 2025'},
+        }},
+        'CS 2120': {'instructor_stats': {'tomas garcia': (4.9, 3.5, 3.0)}},
+        'CS 3100': {'course_ratings': {
+            'Robert Vinson': {'rating': 1.0, 'difficulty': 5.0, 'gpa': 2.0, 'last_taught': 'Fall 2024'},
+        }},
+    }
+
+
+def test_stats_are_looked_up_per_course():
+    index = build_stats_index(make_data())
+    assert section_stats(index, 'CS 2100', 'Robert Vinson') == [4.5, 3.0, None]
+    assert section_stats(index, 'CS 3100', 'Robert Vinson') == [1.0, 5.0, 2.0]
+    assert section_stats(index, 'CS 2120', 'Robert Vinson') is None
+    assert section_stats(index, 'CS 2120', 'Tomás García') == [4.9, 3.5, 3.0]
+    assert section_stats(index, 'CS 2100', 'To Be Announced') is None
+    assert section_stats(index, 'CS 2100', 'Robert J. Vinson') == [4.5, 3.0, None]
+
+
+def test_misspelled_instructors_keep_their_stats():
+    index = build_stats_index(make_data())
+    assert section_stats(index, 'CS 2120', 'Tomas Garica') == [4.9, 3.5, 3.0]
+    assert section_stats(index, 'CS 2100', 'Robert Vinsen, Naseemah Mohamed') == [4.0, 2.5, 3.4]
+    assert section_stats(index, 'CS 2100', 'Vinson Robert') is None
+
+
+def test_co_taught_sections_average_each_field():
+    index = build_stats_index(make_data())
+    assert section_stats(index, 'CS 2100', 'Robert Vinson, Naseemah Mohamed') == [4.0, 2.5, 3.4]
+    assert section_stats(index, 'CS 2100', 'Naseemah Mohamed, To Be Announced') == [3.5, 2.0, 3.4]
+
+
+def test_stats_resolving_to_one_instructor_are_not_overwritten():
+    instructors = InstructorIndex()
+    vinson = instructors.add('Robert Vinson')
+    stats = {'robert vinsen': (1.0, 1.0, 1.0), 'robert vinson': (4.0, 3.0, None), 'rob vinson': (2.0, 5.0, 3.0)}
+    assert resolve_stats(instructors, stats) == {vinson: (4.0, 3.0, None)}
+    stats = {'robert vinsen': (1.0, 1.0, None), 'robert vinsin': (3.0, 2.0, 3.0)}
+    assert resolve_stats(instructors, stats) == {vinson: (2.0, 1.5, 3.0)}
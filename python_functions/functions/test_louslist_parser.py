@@ -0,0 +1,182 @@
+import glob
+import os
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from louslist_parser import available_backends, parse_louslist_page, well_formed_tables
+
+# Lou's List pages saved by `python fixtures.py record` in the benchmarks
+RECORDED_PAGES = sorted(glob.glob(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'fixtures', 'recorded', 'louslist_*.html'
+)))
+
+
+def reference_parse(html, topic_name=None):
+    """The row loop scrape_louslist ran on html.parser before backends existed"""
+    soup = BeautifulSoup(html, 'html.parser')
+    courses_dict = {}
+    current_course_number = None
+    last_section_num = None
+    current_topic = None
+
+    for row in soup.find_all('tr'):
+        course_num_cell = row.find('td', class_='CourseNum')
+        if course_num_cell:
+            course_number = course_num_cell.text.strip()
+            course_name_cell = row.find('td', class_='CourseName')
+            course_name = course_name_cell.text.strip() if course_name_cell else None
+            if course_number not in courses_dict:
+                courses_dict[course_number] = {
+                    'course_info': {'number': course_number, 'name': course_name},
+                    'sections': []
+                }
+            current_course_number = course_number
+            continue
+
+        row_classes = row.get('class', [])
+        if row_classes and ('SectionTopicOdd' in row_classes or 'SectionTopicEven' in row_classes):
+            topic_cell = row.find('td', attrs={'colspan': '8'})
+            if topic_cell and topic_cell.text.strip():
+                current_topic = topic_cell.text.strip()
+            continue
+
+        cells = row.find_all('td')
+        if len(cells) == 8 and cells[4].find('a') and current_course_number:
+            if topic_name is None or (current_topic and topic_name.lower() in current_topic.lower()):
+                enrollment = cells[4].text.strip().split('/')
+                enrollment_current = int(enrollment[0]) if len(enrollment) > 0 else None
+                enrollment_max = int(enrollment[1]) if len(enrollment) > 1 else None
+                instructor_span = cells[5].find('span', onclick=lambda x: x and 'InstructorTip' in x)
+                instructor = instructor_span.text.strip() if instructor_span else cells[5].text.strip()
+                courses_dict[current_course_number]['sections'].append({
+                    'section_number': cells[1].text.strip(),
+                    'type': cells[2].text.strip(),
+                    'status': cells[3].text.strip(),
+                    'enrollment_current': enrollment_current,
+                    'enrollment_max': enrollment_max,
+                    'instructor': instructor,
+                    'schedule': cells[6].text.strip(),
+                    'location': cells[7].text.strip(),
+                    'topic': current_topic
+                })
+                last_section_num = cells[1].text.strip()
+        elif len(cells) == 4 and current_course_number and last_section_num:
+            if topic_name is None or (current_topic and topic_name.lower() in current_topic.lower()):
+                courses_dict[current_course_number]['sections'].append({
+                    'section_number': last_section_num,
+                    'instructor': cells[1].text.strip(),
+                    'schedule': cells[2].text.strip(),
+                    'location': cells[3].text.strip(),
+                    'topic': current_topic
+                })
+    return courses_dict
+
+
+def section_row(number, kind, status, enrollment, instructor, days, room, tip=True):
+    instructor_cell = (
+        f'<span onclick="InstructorTip(\'{instructor}\');">{instructor}</span> <img src="i.png">'
+        if tip else instructor
+    )
+    return (
+        f'<tr class="S"><td class="ClassNumber"><a href="#">{number}0</a></td><td>{number}</td>'
+        f'<td>{kind}</td><td><span class="Status">{status}</span></td>'
+        f'<td><a href="#" onclick="Enroll()">{enrollment}</a></td><td>{instructor_cell}</td>'
+        f'<td>{days}</td><td>{room}</td></tr>\n'
+    )
+
+
+def course_header(number, name):
+    return (
+        f'<tr class="CourseRow"><td class="CourseNum"><span>{number}</span></td>'
+        f'<td class="CourseName" colspan="7">{name}</td></tr>\n'
+    )
+
+
+def louslist_page(courses=3):
+    """A search result page in Lou's List markup"""
+    rows = ['<tr><th>ClassNbr</th><th>Section</th><th>Type</th><th>Status</th>'
+            '<th>Enrollment</th><th>Instructor</th><th>Days &amp; Times</th><th>Room</th></tr>\n']
+    for i in range(courses):
+        rows.append(course_header(f"CS {2100 + i}", f"Data Structures &amp; Algorithms {i}"))
+        rows.append('<tr class="SectionTopicOdd"><td></td><td colspan="8">  </td></tr>\n')
+        rows.append(section_row('001', 'Lecture', 'Open', '12/300', 'Briana Morrison', 'MoWeFr 1:00pm - 1:50pm', 'Gilmer Hall 301'))
+        rows.append('<tr><td></td><td>Nada Basit</td><td>Tu 5:00pm - 6:15pm</td><td>Rice Hall 130</td></tr>\n')
+        rows.append(section_row('101', 'Laboratory', 'Wait List', '40/40', 'To Be Announced', 'Mo 3:30pm - 5:15pm', 'Rice Hall 340', tip=False))
+        rows.append(f'<tr class="SectionTopicEven"><td></td><td colspan="8">Special Topics: Machine Learning {i}</td></tr>\n')
+        rows.append(section_row('200', 'Seminar', 'Closed', '18/18', 'Tom&aacute;s Garc&iacute;a', 'TBA', 'Web-Based Course'))
+        rows.append('<tr class="S"><td>Cancelled</td><td>300</td><td>Lecture</td><td>Cancelled</td>'
+                    '<td>0/0</td><td>Staff</td><td>TBA</td><td>TBA</td></tr>\n')
+    return (
+        '<html><head><title>Lou\'s List</title></head><body><div id="Results">'
+        '<table class="Courses">\n' + ''.join(rows) + '</table></div></body></html>'
+    )
+
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('topic_name', [None, 'machine learning', 'Machine Learning 1', 'no such topic'])
+def test_backends_match_reference_parser(backend, topic_name):
+    html = louslist_page()
+    assert parse_louslist_page(html, topic_name, backend=backend) == reference_parse(html, topic_name)
+
+
+@pytest.mark.parametrize('malform', [
+    lambda html: html.replace('</tr>', ''),
+    lambda html: re.sub(r'</?table[^>]*>', '', html),
+])
+def test_malformed_tables_fall_back_to_the_reference_parser(malform):
+    html = malform(louslist_page())
+    assert not well_formed_tables(html)
+    assert well_formed_tables(louslist_page())
+    assert parse_louslist_page(html) == reference_parse(html)
+
+
+@pytest.mark.skipif(not RECORDED_PAGES, reason="no recorded Lou's List pages")
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('path', RECORDED_PAGES, ids=os.path.basename)
+def test_backends_match_reference_parser_on_recorded_pages(path, backend):
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    if not well_formed_tables(html) and backend != 'html.parser':
+        pytest.skip("page has unclosed table tags; the default parse uses html.parser")
+    assert parse_louslist_page(html, backend=backend) == reference_parse(html)
+
+
+def test_page_contents():
+    courses = parse_louslist_page(louslist_page(courses=1), backend='html.parser')
+    sections = courses['CS 2100']['sections']
+    assert courses['CS 2100']['course_info'] == {'number': 'CS 2100', 'name': 'Data Structures & Algorithms 0'}
+    assert [section['section_number'] for section in sections] == ['001', '001', '101', '200']
+    assert sections[0]['enrollment_current'] == 12 and sections[0]['enrollment_max'] == 300
+    assert sections[1]['schedule'] == 'Tu 5:00pm - 6:15pm'
+    assert sections[3]['instructor'] == 'Tomás García'
+    assert sections[3]['topic'] == 'Special Topics: Machine Learning 0'
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_department_page_is_fetched_once(monkeypatch):
+    import main
+
+    urls = []
+
+    def fake_get(url, **kwargs):
+        urls.append(url)
+        return FakeResponse(louslist_page() if 'louslist' in url else '<html></html>')
+
+    monkeypatch.setattr(main.http_client, 'get', fake_get)
+    main.COURSE_INFO_CACHE.clear()
+    data, failures = main.fetch_course_data(['CS 2100', 'CS 2101', 'CS 2102 | Machine Learning 2'])
+    main.COURSE_INFO_CACHE.clear()
+
+    assert failures == {}
+    assert [url for url in urls if 'louslist' in url] == [main.louslist_url('CS')]
+    assert len(data['CS 2100']['current_sections']) == 4
+    assert [section['section_number'] for section in data['CS 2102 | Machine Learning 2']['current_sections']] == ['200']
@@ -0,0 +1,92 @@
+import pytest
+
+from prerequisites import PrerequisiteGraph, describe_missing, format_clauses, parse_clauses, parse_prerequisites
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Prereq: CS 2100 & CS 2120; APMA 1090 or MATH 1310 or equivalent. CS 3140 is recommended.",
+     ('and', ('CS 2100', 'CS 2120'))),
+    ("Prerequisite: CS 2150 or (CS 2120 and 3140) with a grade of C- or better",
+     ('or', ('CS 2150', ('and', ('CS 2120', 'CS 3140'))))),
+    ("Prerequisite: CHEM 1421, 1621, or 1811. CHEM 2410 must be taken concurrently",
+     ('or', ('CHEM 1421', 'CHEM 1621', 'CHEM 1811'))),
+    ("Prerequisite: APMA 2130, CHE 2215, 2216.", ('and', ('APMA 2130', 'CHE 2215', 'CHE 2216'))),
+    ("Prerequisites: BIOL 2100 (or BME 2104) and BIOL 2200.",
+     ('and', (('or', ('BIOL 2100', 'BME 2104')), 'BIOL 2200'))),
+    ("Prerequisite: CS 3140 with a grade of C- or higher, and BSCS major.", 'CS 3140'),
+    ("Prerequisite: MAE 6310 or instructor permission.", True),
+    ("Prerequisite: RELB 5000, 5010, 5480 or equivalent", True),
+    ("A survey of the field.", True),
+    ("The course covers testing and design patterns. Completed CS 2100 with a C- or better.", 'CS 2100'),
+    ("An introduction to probability. Students must have completed (APMA 2120 or MATH 2310 or MATH 2315) AND "
+     "(CS 1110 or CS 1111 or CS 1112 or CS 1113 or successfully completed the CS 1110 place out test).",
+     ('and', (('or', ('APMA 2120', 'MATH 2310', 'MATH 2315')), ('or', ('CS 1110', 'CS 1111', 'CS 1112', 'CS 1113'))))),
+    ("Students who completed the course may not repeat it.", True),
+    ("CS 2100", 'CS 2100'),
+])
+def test_parse_prerequisites(text, expected):
+    assert parse_prerequisites(text) == expected
+
+
+def make_graph():
+    graph = PrerequisiteGraph()
+    graph.add('CS 2100', "Prereq: CS 1110 or CS 1111 or place out test for CS 2100")
+    graph.add('CS 2120', True)
+    graph.add('CS 3100', "Prerequisites: CS 2100 & CS 2120")
+    graph.add('CS 3140', "Prerequisite: CS 2100")
+    graph.add('CS 4750', "Prerequisite: CS 2150 or (CS 2120 and 3140)")
+    return graph
+
+
+def test_can_take_and_missing():
+    graph = make_graph()
+    assert graph.can_take('CS 2100', ['CS 1111'])
+    assert not graph.can_take('CS 2100', [])
+    assert graph.can_take('CS 1110', [])
+    assert graph.missing('CS 3100', ['CS 2100']) == [['CS 2120']]
+    assert graph.missing('CS 4750', graph.mask(['CS 2120'])) == [['CS 2150', 'CS 3140']]
+    assert describe_missing(graph.missing('CS 4750', [])) == '(CS 2120 or CS 2150) and (CS 2150 or CS 3140)'
+
+
+def test_unlocks_and_closures():
+    graph = make_graph()
+    assert graph.unlocks(['CS 1110']) == {'CS 2100'}
+    assert graph.unlocks(['CS 1110', 'CS 2100', 'CS 2120']) == {'CS 3100', 'CS 3140'}
+    assert graph.required_closure('CS 3100') == {'CS 2100', 'CS 2120'}
+    assert graph.prerequisite_closure('CS 4750') == {'CS 1110', 'CS 1111', 'CS 2100', 'CS 2120', 'CS 2150', 'CS 3140'}
+    assert graph.required_closure('CS 4750') == set()
+
+
+def test_prune_requested_courses():
+    graph = make_graph()
+    pruned = graph.prune(['CS 3100', 'CS 3140', 'EGMT 1510 | Topic'], ['CS 1110', 'CS 2100'])
+    assert pruned == {'CS 3100': [['CS 2120']]}
+    graph.add('CS 3140', "Prerequisite: CS 2100 and CS 2120")
+    assert set(graph.prune(['CS 3100', 'CS 3140'], ['CS 1110', 'CS 2100'])) == {'CS 3100', 'CS 3140'}
+
+
+def test_scraped_text_only_supplements_a_copy():
+    graph = make_graph()
+    graph.compile()
+    assert graph.supplemented({'CS 3140': "CS 2100 and CS 2120", 'CS 4501': "Instructor permission"}) is graph
+    supplemented = graph.supplemented({
+        'CS 3140': "CS 2100 and CS 2120",
+        'CS 2120': "CS 1110",
+        'CS 4414 | Topic': "CS 3130 and CS 3140",
+    })
+    assert supplemented.requirements('CS 3140') == [['CS 2100']]
+    assert supplemented.missing('CS 2120', []) == [['CS 1110']]
+    assert supplemented.unlocks(['CS 1110', 'CS 2100', 'CS 3130', 'CS 3140']) == {'CS 2120', 'CS 4414'}
+    # The shared graph, and masks built against it, are untouched
+    assert graph.requirements('CS 2120') == [] and 'CS 4414' not in graph
+    assert graph.can_take('CS 3100', graph.mask(['CS 2100', 'CS 2120']))
+
+
+def test_clauses_round_trip():
+    expression = parse_prerequisites("Prerequisite: CS 2150 or (CS 2120 and 3140)")
+    text = format_clauses(expression)
+    assert text == 'CS 2120|CS 2150;CS 2150|CS 3140'
+    graph = PrerequisiteGraph()
+    graph.add('CS 4750', parse_clauses(text))
+    assert graph.missing('CS 4750', ['CS 2120']) == [['CS 2150', 'CS 3140']]
+    assert format_clauses(True) is None and parse_clauses(None) is True
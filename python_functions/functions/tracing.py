@@ -0,0 +1,76 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class RequestTrace:
+    """
+    Per-request counters and timing spans, emitted as one structured record
+
+    Tracing is off by default. A disabled trace records nothing and emits
+    nothing, so it can be threaded through hot code unconditionally.
+    """
+
+    def __init__(self, name, enabled=False):
+        self.name = name
+        self.enabled = enabled
+        self.counters = {}
+        self.spans = {}
+        self.fields = {}
+
+    def count(self, counter, amount=1):
+        """
+        Add amount to a named counter
+        """
+        if self.enabled:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def add_counters(self, counters):
+        """
+        Add every entry of a dict of counters, e.g. CSP.search_stats
+        """
+        if self.enabled:
+            for counter, amount in counters.items():
+                self.count(counter, amount)
+
+    def set(self, **fields):
+        """
+        Attach extra fields to the record
+        """
+        if self.enabled:
+            self.fields.update(fields)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block of code, accumulating milliseconds under name
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.spans[name] = round(self.spans.get(name, 0) + elapsed_ms, 3)
+
+    def record(self):
+        """
+        Build the structured record for this request
+        """
+        return {
+            'severity': 'INFO',
+            'message': f"{self.name} trace",
+            'counters': self.counters,
+            'spans_ms': self.spans,
+            **self.fields
+        }
+
+    def emit(self):
+        """
+        Write the record as a single JSON line, which Cloud Logging
+        ingests as one structured log entry
+        """
+        if self.enabled:
+            print(json.dumps(self.record(), default=str))
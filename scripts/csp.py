@@ -1,4 +1,8 @@
-import requests
+import os
+import sys
+# Share the pooled HTTP client with the Cloud Functions scrapers
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_functions', 'functions'))
+import http_client
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode
 from typing import Dict, Optional
@@ -24,7 +28,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
         url = f"https://thecourseforum.com/course/{mnemonic}/{number}/"
         
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -87,7 +91,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
             params = {k: v for k, v in params.items() if v}
             url = f"{base_url}?{urlencode(params)}"
 
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -3,8 +3,12 @@ from dotenv import find_dotenv, load_dotenv
 import time
 import logging
 import json
-import ratemyprofessor
-import requests
+import os
+import sys
+# Share the pooled HTTP client with the Cloud Functions scrapers
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_functions', 'functions'))
+import http_client
+from professor_ratings import ProfessorRatingCache
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode
 from typing import Dict, Optional
@@ -22,29 +26,17 @@ load_dotenv(find_dotenv())
 client = openai.OpenAI()
 model = "gpt-4o"
 
-# Cache the UVA school object
-UVA_SCHOOL = ratemyprofessor.get_school_by_name("University of Virginia")
+# RateMyProfessor results are read from the on-disk cache; warm it with
+# `python professor_ratings.py prefetch`
+PROFESSOR_RATINGS = ProfessorRatingCache()
 
 def get_professor_rating(professor_name: str) -> str:
     """Get professor rating information from RateMyProfessor."""
     try:
-        professor = ratemyprofessor.get_professor_by_school_and_name(UVA_SCHOOL, professor_name)
-        
-        if professor is None:
-            return json.dumps({
-                "error": "Professor not found",
-                "professor_name": professor_name
-            })
-        
-        return json.dumps({
-            "name": professor.name,
-            "department": professor.department,
-            "rating": professor.rating,
-            "difficulty": professor.difficulty,
-            "num_ratings": professor.num_ratings,
-            "would_take_again": professor.would_take_again,
-            "top_tags": professor.get_tags()[:3] if hasattr(professor, 'get_tags') else []
-        })
+        result = PROFESSOR_RATINGS.get(professor_name)
+        if "error" in result:
+            result["professor_name"] = professor_name
+        return json.dumps(result)
     except Exception as e:
         logging.error(f"Error retrieving professor information: {e}")
         return json.dumps({
@@ -70,7 +62,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
         url = f"https://thecourseforum.com/course/{mnemonic}/{number}/"
         
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -132,7 +124,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
             params = {k: v for k, v in params.items() if v}
             url = f"{base_url}?{urlencode(params)}"
 
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
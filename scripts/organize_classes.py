@@ -1,29 +1,62 @@
+import argparse
+import gzip
+
 import pandas as pd
 
-def organize_data():
-    unique_classes = {'Title': [], 'Mnemonic': [], 'Number': []}  # Initialize dictionary with lists
-    class_df = pd.read_csv('searchDataFall2025.csv')
-    class_data = class_df.loc[:, ['Mnemonic', 'Number', 'Title', 'Topic']]
-    
-    # Iterate through rows
-    for _, row in class_data.iterrows():  # Use `row` directly
-        print(row['Mnemonic'], row['Number'])
-        if row['Title'] not in unique_classes['Title']:
-            if row['Mnemonic'] != "EGMT":
-                unique_classes['Title'].append(row['Title'])  # Add unique Title
-                unique_classes['Mnemonic'].append(row['Mnemonic'])  # Add corresponding Mnemonic
-                unique_classes['Number'].append(row['Number'])  # Add corresponding Number
-            else:
-                print(row)
-                unique_classes['Title'].append(row['Topic'])  # Add unique Title
-                unique_classes['Mnemonic'].append(row['Mnemonic'])  # Add corresponding Mnemonic
-                unique_classes['Number'].append(row['Number'])  # Add corresponding Number
-
-    # Print the resulting dictionary
-    unique_classes_df = pd.DataFrame(unique_classes)
-    unique_classes_df.to_json('unique_classes_fall_2025.json', orient='records')
-
-organize_data()
+COLUMNS = ['Title', 'Mnemonic', 'Number']
+
+
+def csv_path_for(semester):
+    # fall_2025 -> searchDataFall2025.csv
+    return 'searchData' + ''.join(part.capitalize() for part in semester.split('_')) + '.csv'
+
+
+def organize_data(csv_path):
+    """
+    One row per distinct class title, keeping the first section's course
+
+    EGMT sections all share a generic title, so their topic is used as the
+    title instead, and they are kept once per topic and course number since
+    placeholder topics like "TBD" repeat across courses.
+    """
+    class_df = pd.read_csv(csv_path, usecols=['Mnemonic', 'Number', 'Title', 'Topic'], dtype=str)
+    is_egmt = class_df['Mnemonic'] == 'EGMT'
+    class_df['Title'] = class_df['Title'].mask(is_egmt & class_df['Topic'].notna(), class_df['Topic'])
+    class_df['egmt_number'] = class_df['Number'].where(is_egmt, '')
+    return class_df.drop_duplicates(['Title', 'egmt_number'])[COLUMNS].reset_index(drop=True)
+
+
+def write_outputs(unique_classes, semester):
+    """
+    Write unique_classes_<semester>.json, a gzipped copy, and a copy sorted
+    by "Mnemonic Number Title" so the frontend can binary-search it
+    """
+    path = f'unique_classes_{semester}.json'
+    records = unique_classes.to_json(orient='records')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(records)
+    with gzip.open(path + '.gz', 'wt', encoding='utf-8') as f:
+        f.write(records)
+
+    search_key = (unique_classes['Mnemonic'] + ' ' + unique_classes['Number'] + ' ' + unique_classes['Title']).str.lower()
+    sorted_classes = unique_classes.iloc[search_key.argsort(kind='stable')]
+    sorted_classes.to_json(f'unique_classes_{semester}_sorted.json', orient='records')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the unique classes of a semester from its Lou's List export")
+    parser.add_argument('semester', nargs='?', default='fall_2025', help="e.g. fall_2025")
+    parser.add_argument('--csv', help="Export to read (default: searchData<Semester>.csv)")
+    args = parser.parse_args()
+
+    unique_classes = organize_data(args.csv or csv_path_for(args.semester))
+    path = write_outputs(unique_classes, args.semester)
+    print(f"Wrote {len(unique_classes)} classes to {path}")
+
+
+if __name__ == '__main__':
+    main()
 
 
 # TODO
@@ -0,0 +1,228 @@
+"""
+RateMyProfessor ratings cached on local disk
+
+Every get_professor_rating tool call used to search RateMyProfessor, after
+a school lookup run at import time. Results, including "Professor not
+found", are now kept in a JSON file keyed by canonical instructor ID (see
+instructor_names), so name variants share one entry, and RateMyProfessor
+is only contacted for entries that are missing or past their TTL. The
+file is rewritten once SAVE_EVERY new entries have accumulated, at the end
+of a prefetch and at exit, not after every lookup.
+
+    python professor_ratings.py prefetch      # warm every instructor in the semester CSV
+    python professor_ratings.py show NAME     # print one cached or fetched rating
+"""
+import argparse
+import atexit
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Optional
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_functions', 'functions'))
+from instructor_names import InstructorIndex
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_CSV = os.path.join(SCRIPTS_DIR, 'searchDataFall2025.csv')
+CACHE_PATH = os.environ.get('RMP_CACHE_PATH', os.path.join(SCRIPTS_DIR, 'professor_ratings.json'))
+SCHOOL_NAME = "University of Virginia"
+
+# Ratings move slowly; a missing professor may be added to RateMyProfessor
+# at any time, so negative results expire sooner
+TTL_SECONDS = 30 * 24 * 3600
+NEGATIVE_TTL_SECONDS = 7 * 24 * 3600
+PREFETCH_WORKERS = 8
+# Fetched entries kept in memory before get() rewrites the cache file
+SAVE_EVERY = 25
+
+NOT_FOUND = {"error": "Professor not found"}
+
+
+def build_instructor_index(csv_path: str = CATALOG_CSV) -> InstructorIndex:
+    """Index every instructor named in a Lou's List export"""
+    index = InstructorIndex()
+    for cell in pd.read_csv(csv_path, usecols=['Instructor(s)'])['Instructor(s)'].dropna().unique():
+        index.add_cell(cell)
+    return index
+
+
+class ProfessorRatingCache:
+    """
+    Professor ratings by canonical instructor ID, persisted as JSON
+
+    Each entry is {'fetched_at': epoch seconds, 'result': rating dict or
+    None when RateMyProfessor has no such professor}. Failed lookups are
+    not cached.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, csv_path: str = CATALOG_CSV,
+                 ttl: float = TTL_SECONDS, negative_ttl: float = NEGATIVE_TTL_SECONDS):
+        self.path = path
+        self.csv_path = csv_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = Lock()
+        self._index = None
+        self._school = None
+        self._unsaved = 0
+        self.entries = self._load()
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self):
+        """Write the entries atomically, so a crash never leaves a torn file"""
+        with self._lock:
+            data = json.dumps(self.entries, indent=1, sort_keys=True)
+            self._unsaved = 0
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def flush(self):
+        """Save when entries were fetched since the last save"""
+        if self._unsaved:
+            self.save()
+
+    @property
+    def index(self) -> InstructorIndex:
+        if self._index is None:
+            self._index = build_instructor_index(self.csv_path)
+        return self._index
+
+    def school(self):
+        # Looked up on the first fetch instead of at import
+        if self._school is None:
+            import ratemyprofessor
+            self._school = ratemyprofessor.get_school_by_name(SCHOOL_NAME)
+        return self._school
+
+    def instructor_id(self, professor_name: str) -> Optional[str]:
+        with self._lock:
+            return self.index.resolve(professor_name) or self.index.add(professor_name, 'query')
+
+    def fresh(self, entry: Optional[Dict], now: float) -> bool:
+        if entry is None:
+            return False
+        ttl = self.ttl if entry['result'] is not None else self.negative_ttl
+        return now - entry['fetched_at'] < ttl
+
+    def fetch(self, instructor_id: str, professor_name: str) -> Optional[Dict]:
+        """
+        Search RateMyProfessor, under the spelling Lou's List uses when the
+        instructor teaches this semester
+
+        Returns:
+            Rating dict, or None when the professor is not found
+        """
+        import ratemyprofessor
+        search_name = min(self.index.names(instructor_id, 'louslist'), default=professor_name)
+        professor = ratemyprofessor.get_professor_by_school_and_name(self.school(), search_name)
+        if professor is None:
+            return None
+        return {
+            "name": professor.name,
+            "department": professor.department,
+            "rating": professor.rating,
+            "difficulty": professor.difficulty,
+            "num_ratings": professor.num_ratings,
+            "would_take_again": professor.would_take_again,
+            "top_tags": professor.get_tags()[:3] if hasattr(professor, 'get_tags') else []
+        }
+
+    def _refresh(self, instructor_id: str, professor_name: str) -> Optional[Dict]:
+        result = self.fetch(instructor_id, professor_name)
+        with self._lock:
+            self.entries[instructor_id] = {'fetched_at': time.time(), 'result': result}
+            self._unsaved += 1
+        return result
+
+    def get(self, professor_name: str, save: bool = True) -> Dict:
+        """
+        Rating of a professor, from disk when fresh
+
+        Args:
+            professor_name (str): Any spelling of the professor's name
+            save (bool): Write the cache file once SAVE_EVERY entries are unsaved
+
+        Returns:
+            Dict: The rating, or NOT_FOUND
+        """
+        instructor_id = self.instructor_id(professor_name)
+        if instructor_id is None:
+            return dict(NOT_FOUND)
+        entry = self.entries.get(instructor_id)
+        if self.fresh(entry, time.time()):
+            result = entry['result']
+        else:
+            result = self._refresh(instructor_id, professor_name)
+            if save and self._unsaved >= SAVE_EVERY:
+                self.save()
+        return dict(result) if result is not None else dict(NOT_FOUND)
+
+    def prefetch(self, workers: int = PREFETCH_WORKERS) -> Dict[str, int]:
+        """
+        Fetch every instructor of the semester CSV that is missing or stale
+
+        Returns:
+            Dict[str, int]: Counts of instructors already fresh, fetched,
+                not found on RateMyProfessor and failed
+        """
+        now = time.time()
+        stale = [
+            instructor_id for instructor_id in self.index.variants
+            if not self.fresh(self.entries.get(instructor_id), now)
+        ]
+        counts = {'fresh': len(self.index.variants) - len(stale), 'fetched': 0, 'not_found': 0, 'failed': 0}
+        if not stale:
+            return counts
+        self.school()
+
+        def refresh(instructor_id):
+            name = min(self.index.names(instructor_id, 'louslist'), default=instructor_id)
+            try:
+                return 'fetched' if self._refresh(instructor_id, name) is not None else 'not_found'
+            except Exception as e:
+                print(f"Error fetching {name}: {e}")
+                return 'failed'
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for outcome in pool.map(refresh, stale):
+                    counts[outcome] += 1
+        finally:
+            self.save()
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm or read the RateMyProfessor rating cache")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    prefetch_parser = subparsers.add_parser('prefetch', help="Fetch every instructor in the semester CSV")
+    prefetch_parser.add_argument('--csv', default=CATALOG_CSV)
+    prefetch_parser.add_argument('--workers', type=int, default=PREFETCH_WORKERS)
+    show_parser = subparsers.add_parser('show', help="Print one professor's rating")
+    show_parser.add_argument('name')
+    args = parser.parse_args()
+
+    if args.command == 'prefetch':
+        cache = ProfessorRatingCache(csv_path=args.csv)
+        start = time.perf_counter()
+        counts = cache.prefetch(args.workers)
+        print(f"{counts} in {time.perf_counter() - start:.1f}s -> {cache.path}")
+    else:
+        print(json.dumps(ProfessorRatingCache().get(args.name), indent=2))
+
+
+if __name__ == '__main__':
+    main()
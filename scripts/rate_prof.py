@@ -3,8 +3,13 @@ from dotenv import find_dotenv, load_dotenv
 import time
 import logging
 import json
-import ratemyprofessor
-import requests
+import os
+import sys
+# Share the pooled HTTP client with the Cloud Functions scrapers
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_functions', 'functions'))
+import http_client
+from prerequisites import get_prerequisite_graph
+from professor_ratings import ProfessorRatingCache
 from bs4 import BeautifulSoup
 from urllib.parse import urlencode
 from typing import Dict, Union, List
@@ -15,36 +20,19 @@ load_dotenv()
 client = openai.OpenAI()
 model = "gpt-4o-mini"
 
-# Cache the UVA school object to avoid repeated API calls
-UVA_SCHOOL = ratemyprofessor.get_school_by_name("University of Virginia")
+# RateMyProfessor results are read from the on-disk cache; warm it with
+# `python professor_ratings.py prefetch`
+PROFESSOR_RATINGS = ProfessorRatingCache()
 
 def get_course_prerequisites(course_id):
-    prereqs = {
-        "CS2100": ["CS1110", "CS1111", "CS1112", "CS1113"],
-        "CS2150": ["CS2100"],
-        "CS3140": ["CS2150"]
-    }
-    return json.dumps(prereqs.get(course_id, []))
+    """Prerequisites parsed from the catalog, each a list of courses any one of which satisfies it"""
+    graph = get_prerequisite_graph()
+    return json.dumps(graph.requirements(course_id) if graph else [])
 
 def get_professor_rating(professor_name):
     """Get professor rating information from RateMyProfessor"""
     try:
-        professor = ratemyprofessor.get_professor_by_school_and_name(UVA_SCHOOL, professor_name)
-        
-        if professor is None:
-            return json.dumps({
-                "error": "Professor not found"
-            })
-        
-        return json.dumps({
-            "name": professor.name,
-            "department": professor.department,
-            "rating": professor.rating,
-            "difficulty": professor.difficulty,
-            "num_ratings": professor.num_ratings,
-            "would_take_again": professor.would_take_again,
-            "top_tags": professor.get_tags()[:3] if hasattr(professor, 'get_tags') else []
-        })
+        return json.dumps(PROFESSOR_RATINGS.get(professor_name))
     except Exception as e:
         return json.dumps({
             "error": f"Error retrieving professor information: {str(e)}"
@@ -68,7 +56,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
         url = f"https://thecourseforum.com/course/{mnemonic}/{number}/"
         
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -129,7 +117,7 @@ def get_comprehensive_course_info(mnemonic: str, number: str, instructor: str =
             params = {k: v for k, v in params.items() if v}
             url = f"{base_url}?{urlencode(params)}"
 
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -281,7 +269,7 @@ ai_advisor = client.beta.assistants.create(
             "type": "function",
             "function": {
                 "name": "get_course_prerequisites",
-                "description": "Get prerequisites for a specific UVA CS course",
+                "description": "Get prerequisites for a specific UVA course as a list of requirements, each a list of courses any one of which satisfies it",
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -1,17 +1,116 @@
+import argparse
 import csv
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+# Hash rows the same way catalog_diff does when applying incremental refreshes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_functions', 'functions'))
+from catalog_diff import HASH_FIELD, MAX_BATCH_SIZE, content_hash
+
+CREDENTIALS_PATH = "gpt-advisor-firebase-adminsdk-ct285-8f45ca05e4.json"
+PROJECT_ID = "gpt-advisor"
+
+
+def connect(emulator_host=None):
+    """
+    Firestore client for the project, or for the local emulator when a host
+    such as localhost:8080 is given (or FIRESTORE_EMULATOR_HOST is set)
+    """
+    if emulator_host:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = emulator_host
+    if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        firebase_admin.initialize_app(options={"projectId": PROJECT_ID})
+    else:
+        firebase_admin.initialize_app(credentials.Certificate(CREDENTIALS_PATH))
+    return firestore.client()
+
+
+def existing_hashes(collection):
+    """
+    Content hash of every document already in the collection, fetched with
+    one projected query instead of a read per document
+    """
+    return {
+        snapshot.id: (snapshot.to_dict() or {}).get(HASH_FIELD)
+        for snapshot in collection.select([HASH_FIELD]).stream()
+    }
+
+
+def changed_rows(rows, hashes):
+    """
+    Rows whose content differs from the imported document, with the hash to store
+    """
+    changed = []
+    for row in rows:
+        digest = content_hash(row)
+        if hashes.get(row["ClassNumber"]) != digest:
+            changed.append({**row, HASH_FIELD: digest})
+    return changed
+
+
+def commit_batch(db, collection, rows):
+    batch = db.batch()
+    for row in rows:
+        batch.set(collection.document(row["ClassNumber"]), row)
+    batch.commit()
+    return len(rows)
+
+
+def upload(db, rows, collection_name="classes", batch_size=MAX_BATCH_SIZE, workers=8, force=False):
+    """
+    Write the changed rows in batched commits, several batches at a time
+
+    Returns:
+        Dict with the number of rows read, written and skipped, and the elapsed time
+    """
+    start = time.perf_counter()
+    collection = db.collection(collection_name)
+    batch_size = min(batch_size, MAX_BATCH_SIZE)
+    hashes = {} if force else existing_hashes(collection)
+    pending = changed_rows(rows, hashes)
+    chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(commit_batch, db, collection, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            written += future.result()
+            elapsed = time.perf_counter() - start
+            print(f"{written}/{len(pending)} written ({written / elapsed:.0f} docs/sec)")
+
+    return {
+        'rows': len(rows),
+        'written': written,
+        'skipped': len(rows) - len(pending),
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+
+
 def main():
-    cred = credentials.Certificate("gpt-advisor-firebase-adminsdk-ct285-8f45ca05e4.json")
-    firebase_admin.initialize_app(cred)
-    db = firestore.client()
-    
-    with open("searchData.csv", "r", newline='', encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            doc_ref = db.collection("classes").document(row["ClassNumber"])
-            doc_ref.set(row)
+    parser = argparse.ArgumentParser(description="Import a Lou's List CSV export into Firestore")
+    parser.add_argument("--csv", default="searchData.csv")
+    parser.add_argument("--collection", default="classes")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=8, help="Batches committed in parallel")
+    parser.add_argument("--emulator", metavar="HOST:PORT", help="Write to the Firestore emulator")
+    parser.add_argument("--force", action="store_true", help="Rewrite every row, even unchanged ones")
+    args = parser.parse_args()
+
+    with open(args.csv, "r", newline='', encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    db = connect(args.emulator)
+    result = upload(db, rows, args.collection, args.batch_size, args.workers, args.force)
+    print(
+        f"Wrote {result['written']} of {result['rows']} rows ({result['skipped']} unchanged) "
+        f"in {result['seconds']}s, {result['written'] / max(result['seconds'], 0.01):.0f} docs/sec"
+    )
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()